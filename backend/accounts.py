@@ -0,0 +1,156 @@
+"""
+표준 계정 매핑.
+
+회사마다 같은 계정을 다른 이름/ID로 공시하므로(예: '매출액', '영업수익', '수익(매출액)'),
+account_id(XBRL 표준 ID)를 우선으로, 없으면 공백을 제거한 계정명 키워드로 표준 계정에 맞춥니다.
+키워드는 앞쪽일수록 우선순위가 높고, 부분일치가 아닌 완전일치만 사용합니다. ('매출'이 '매출원가'에 걸리지 않도록)
+"""
+import numpy as np
+import pandas as pd
+
+# key -> 표시명, 재무제표 구분, account_id 목록, 계정명 키워드(공백 제거 후 완전일치)
+STANDARD_ACCOUNTS = {
+    "revenue": {
+        "label": "매출액", "sj_divs": ("IS", "CIS"),
+        "account_ids": ("ifrs-full_Revenue", "ifrs_Revenue"),
+        "keywords": ("매출액", "영업수익", "수익(매출액)", "매출", "총수익", "수익"),
+    },
+    "gross_profit": {
+        "label": "매출총이익", "sj_divs": ("IS", "CIS"),
+        "account_ids": ("ifrs-full_GrossProfit", "ifrs_GrossProfit"),
+        "keywords": ("매출총이익", "매출총이익(손실)"),
+    },
+    "operating_income": {
+        "label": "영업이익", "sj_divs": ("IS", "CIS"),
+        "account_ids": ("dart_OperatingIncomeLoss",),
+        "keywords": ("영업이익", "영업이익(손실)", "영업손익"),
+    },
+    "net_income": {
+        "label": "당기순이익", "sj_divs": ("IS", "CIS"),
+        "account_ids": ("ifrs-full_ProfitLoss", "ifrs_ProfitLoss"),
+        "keywords": ("당기순이익", "당기순이익(손실)", "당기순손익", "분기순이익", "반기순이익"),
+    },
+    "current_assets": {
+        "label": "유동자산", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_CurrentAssets", "ifrs_CurrentAssets"),
+        "keywords": ("유동자산",),
+    },
+    "cash": {
+        "label": "현금및현금성자산", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_CashAndCashEquivalents", "ifrs_CashAndCashEquivalents"),
+        "keywords": ("현금및현금성자산",),
+    },
+    "inventories": {
+        "label": "재고자산", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_Inventories", "ifrs_Inventories"),
+        "keywords": ("재고자산",),
+    },
+    "total_assets": {
+        "label": "자산총계", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_Assets", "ifrs_Assets"),
+        "keywords": ("자산총계",),
+    },
+    "current_liabilities": {
+        "label": "유동부채", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_CurrentLiabilities", "ifrs_CurrentLiabilities"),
+        "keywords": ("유동부채",),
+    },
+    "total_liabilities": {
+        "label": "부채총계", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_Liabilities", "ifrs_Liabilities"),
+        "keywords": ("부채총계",),
+    },
+    "total_equity": {
+        "label": "자본총계", "sj_divs": ("BS",),
+        "account_ids": ("ifrs-full_Equity", "ifrs_Equity"),
+        "keywords": ("자본총계",),
+    },
+    "operating_cf": {
+        "label": "영업활동현금흐름", "sj_divs": ("CF",),
+        "account_ids": ("ifrs-full_CashFlowsFromUsedInOperatingActivities", "ifrs_CashFlowsFromUsedInOperatingActivities"),
+        "keywords": ("영업활동현금흐름", "영업활동으로인한현금흐름", "영업활동으로인한순현금흐름"),
+    },
+    "investing_cf": {
+        "label": "투자활동현금흐름", "sj_divs": ("CF",),
+        "account_ids": ("ifrs-full_CashFlowsFromUsedInInvestingActivities", "ifrs_CashFlowsFromUsedInInvestingActivities"),
+        "keywords": ("투자활동현금흐름", "투자활동으로인한현금흐름", "투자활동으로인한순현금흐름"),
+    },
+    "financing_cf": {
+        "label": "재무활동현금흐름", "sj_divs": ("CF",),
+        "account_ids": ("ifrs-full_CashFlowsFromUsedInFinancingActivities", "ifrs_CashFlowsFromUsedInFinancingActivities"),
+        "keywords": ("재무활동현금흐름", "재무활동으로인한현금흐름", "재무활동으로인한순현금흐름"),
+    },
+    "capex": {
+        "label": "유형자산의취득", "sj_divs": ("CF",),
+        "account_ids": ("ifrs-full_PurchaseOfPropertyPlantAndEquipment", "ifrs_PurchaseOfPropertyPlantAndEquipment"),
+        "keywords": ("유형자산의취득",),
+    },
+}
+ACCOUNT_LABELS = {key: spec["label"] for key, spec in STANDARD_ACCOUNTS.items()}
+# DART 재무제표 응답의 기간별 금액 열
+PERIOD_COLUMNS = {"thstrm_amount": "당기", "frmtrm_amount": "전기", "bfefrmtrm_amount": "전전기"}
+
+
+def parse_amounts(values):
+    """'1,234,567' / '-1,234' / '' 형식 문자열 Series를 float Series로 변환 (빈 값은 NaN)"""
+    cleaned = values.fillna("").astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(cleaned, errors="coerce")
+
+
+def normalize_account_name(names):
+    """계정명 Series에서 공백을 제거합니다. ('영업활동으로 인한 현금흐름' -> '영업활동으로인한현금흐름')"""
+    return names.fillna("").astype(str).str.replace(r"\s+", "", regex=True)
+
+
+def match_accounts(df):
+    """
+    계정 행 DataFrame(sj_div, account_id, account_nm 필요)에 표준 계정 key와 매칭 우선순위를 붙여
+    표준 계정에 해당하는 행만 반환합니다. (account_key, match_rank 열 추가, rank가 낮을수록 우선)
+    """
+    names = normalize_account_name(df["account_nm"])
+    ids = df["account_id"].fillna("").astype(str)
+    matched = []
+    for key, spec in STANDARD_ACCOUNTS.items():
+        in_sj = df["sj_div"].isin(spec["sj_divs"]).to_numpy()
+        rank = np.where(ids.isin(spec["account_ids"]).to_numpy(), 0.0, np.nan)
+        for i, keyword in enumerate(spec["keywords"], start=1):
+            rank = np.where(np.isnan(rank) & (names == keyword).to_numpy(), float(i), rank)
+        hit = in_sj & ~np.isnan(rank)
+        if hit.any():
+            matched.append(df[hit].assign(account_key=key, match_rank=rank[hit]))
+    if not matched:
+        return df.iloc[0:0].assign(account_key=pd.Series(dtype=str), match_rank=pd.Series(dtype=float))
+    return pd.concat(matched, ignore_index=True)
+
+
+def standardize(df, index=("corp_code", "bsns_year", "reprt_code"), value_col="amount"):
+    """
+    (기업, 기간, 계정) 행 DataFrame -> index별 한 행, 표준 계정 key별 한 열의 넓은 DataFrame.
+    같은 표준 계정에 여러 행이 걸리면 우선순위가 가장 높은 행의 값을 사용합니다.
+    """
+    index = list(index)
+    matched = match_accounts(df)
+    if matched.empty:
+        return pd.DataFrame(columns=index + list(STANDARD_ACCOUNTS)).set_index(index)
+    matched = matched.sort_values("match_rank", kind="stable").drop_duplicates(index + ["account_key"], keep="first")
+    wide = matched.pivot(index=index, columns="account_key", values=value_col)
+    return wide.reindex(columns=list(STANDARD_ACCOUNTS)).astype(float)
+
+
+def standardize_statement(fs_data, columns=PERIOD_COLUMNS):
+    """
+    DART 재무제표 응답 하나 -> index가 기간(당기/전기/전전기), 열이 표준 계정 key인 표.
+    한 기업의 요약 화면에서 ratios.compute_ratios에 바로 넘길 수 있는 형태입니다.
+    """
+    periods = list(columns.values())
+    df = pd.DataFrame(fs_data.get("list", []) if isinstance(fs_data, dict) else [])
+    if df.empty or "account_nm" not in df.columns:
+        return pd.DataFrame(np.nan, index=periods, columns=list(STANDARD_ACCOUNTS))
+    if "account_id" not in df.columns:
+        df["account_id"] = ""
+    frames = [
+        df[["sj_div", "account_id", "account_nm"]].assign(period=label, amount=parse_amounts(df[col]))
+        for col, label in columns.items() if col in df.columns
+    ]
+    wide = standardize(pd.concat(frames, ignore_index=True), index=("period",))
+    return wide.reindex(periods)
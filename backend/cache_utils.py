@@ -0,0 +1,92 @@
+import threading
+import time
+from collections import OrderedDict
+
+
+class TTLCache:
+    """
+    만료 시간(TTL)과 최대 크기를 가진 스레드 안전 LRU 캐시.
+    - ttl=None이면 만료 없이 크기 기준(LRU)으로만 제거합니다.
+    - set() 호출 시 항목별 ttl을 따로 지정할 수 있습니다.
+    """
+
+    def __init__(self, maxsize=256, ttl=None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data = OrderedDict()  # key -> (expires_at, value)
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def _expired(self, expires_at, now):
+        return expires_at is not None and expires_at <= now
+
+    def get(self, key, default=None):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return default
+            expires_at, value = entry
+            if self._expired(expires_at, time.time()):
+                del self._data[key]
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key, value, ttl=None):
+        ttl = self.ttl if ttl is None else ttl
+        expires_at = time.time() + ttl if ttl else None
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+
+    def pop(self, key, default=None):
+        with self._lock:
+            entry = self._data.pop(key, None)
+            return entry[1] if entry else default
+
+    def pop_where(self, predicate):
+        """predicate(key)가 참인 항목을 모두 제거하고 제거된 개수를 반환"""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                del self._data[k]
+            return len(keys)
+
+    def items(self):
+        """만료되지 않은 (key, value) 목록의 스냅샷 (LRU 순서는 바꾸지 않음)"""
+        now = time.time()
+        with self._lock:
+            return [(k, v) for k, (exp, v) in self._data.items() if not self._expired(exp, now)]
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+    def stats(self):
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / total, 3) if total else 0.0,
+            }
+
+    def __contains__(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and not self._expired(entry[0], time.time())
+
+    def __len__(self):
+        with self._lock:
+            return len(self._data)
@@ -1,29 +1,120 @@
 import re
 from langchain.tools import tool
-from dart_api import DartAPI
 import pandas as pd
-import PyPDF2
 import yaml
 import os
+from backend.page_context_index import build_page_context_index
+from backend.screening import screener, format_metric, AMOUNT_METRICS, RATIO_METRICS
+from backend.accounts import standardize_statement
+from backend.ratios import compute_ratios, format_ratio
+from backend.quarterly import report_code_for, quarterly_statements, quarterly_summary
+from backend import dart_cache
+from backend.tool_cache import memoize_tool, normalize_tool_input, is_cacheable_result, tag_result
+from backend.entity_memory import current_entity_memory, expand_references, is_reference, use_entity_memory
+from backend.pdf_extract import open_pdf, parse_page_spec
+from backend.pdf_index import build_pdf_index
+from backend.pdf_tables import extract_tables
+from backend.csv_stats import analyze_csv
 
+# summarize_pdf_tool 기본 요약이 텍스트 있는 페이지를 찾아 읽는 최대 페이지 수
+PDF_SUMMARY_SCAN_PAGES = 10
 
 def parse_financial_query(query: str):
     """
     자연어에서 기업명, 연도, 보고서 종류를 파싱합니다.
     예시 입력: '삼성전자 2023 사업보고서'
-    반환: {'corp_name': '삼성전자', 'year': '2023', 'report_type': '사업보고서'}
+    반환: {'corp_name': '삼성전자', 'year': '2023', 'report_type': '사업보고서', 'reprt_code': '11011'}
+    세션 엔터티 메모리가 있으면 '그 회사', '작년' 같은 표현을 직전 대화의 기업/연도로 풀고,
+    연도가 없으면 직전 연도를 씁니다. (메모리의 포커스는 바꾸지 않음: observe_tool_calls 참고)
     """
+    memory = current_entity_memory()
+    if memory is not None:
+        query = memory.expand(query)
     year_match = re.search(r'(\d{4})', query)
-    year = year_match.group(1) if year_match else "2023"
-    report_types = ['사업보고서', '반기보고서', '분기보고서']
+    year = year_match.group(1) if year_match else (memory.year if memory is not None and memory.year else "2023")
+    report_types = ['사업보고서', '반기보고서', '1분기보고서', '3분기보고서', '분기보고서']
     report_type = next((rt for rt in report_types if rt in query), "사업보고서")
-    corp_name = query.split(str(year))[0].strip() if year else query
+    corp_name = query.split(str(year))[0] if str(year) in query else query
+    corp_name = corp_name.replace(report_type, "").strip()
+    if memory is not None and not corp_name and memory.corp_name:  # '2022 반기보고서'처럼 기업명 없이 이어지는 질문
+        corp_name = memory.corp_name
     return {
         'corp_name': corp_name,
         'year': year,
-        'report_type': report_type
+        'report_type': report_type,
+        'reprt_code': report_code_for(report_type)
     }
 
+# 입력의 기업/연도를 다음 질문의 포커스로 기록하는 툴
+FOCUS_TOOLS = {"get_financial_statements_tool", "plot_financials_tool", "get_quarterly_trend_tool",
+               "get_semiannual_reports_tool"}
+
+
+def observe_tool_calls(memory, intermediate_steps):
+    """
+    에이전트 실행이 끝난 뒤, 재무 툴 호출 입력을 요청 순서대로 메모리 포커스에 기록합니다.
+    (같은 단계의 툴은 동시에 실행되므로 툴 안에서 기록하면 먼저 끝난 호출이 포커스를 덮어씀)
+    입력은 실행 당시의 포커스로 모두 먼저 풀어 둔 뒤 기록합니다.
+    """
+    inputs = []
+    for action, _ in intermediate_steps:
+        if getattr(action, "tool", None) in FOCUS_TOOLS:
+            value = action.tool_input
+            if isinstance(value, dict):
+                value = next(iter(value.values()), "")
+            inputs.append(memory.expand(normalize_tool_input(value)))
+    with use_entity_memory(memory):
+        parsed = [parse_financial_query(query) for query in inputs]
+    for p in parsed:
+        memory.observe(p['corp_name'], p['year'], p['reprt_code'])
+
+def financial_query_key(query):
+    """
+    재무 툴 메모이제이션 키: 파싱한 (기업명, 연도, 보고서).
+    입력은 prepare=expand_references로 미리 풀어 두므로 '그 회사 작년'처럼 세션마다 대상이 다른 입력도 실제 대상 기준으로 캐시됩니다.
+    """
+    parsed = parse_financial_query(normalize_tool_input(query))
+    return f"{parsed['corp_name']} {parsed['year']} {parsed['reprt_code']}"
+
+def is_cacheable_financial_result(result):
+    """기업 매칭 실패는 dart_cache처럼 캐시하지 않음 (일시적인 LLM/네트워크 오류일 수 있음)"""
+    return is_cacheable_result(result) and not result.startswith("기업명을 찾을 수 없습니다")
+
+def dart_error(data):
+    """DART 응답이 오류(네트워크/한도 초과 등)면 '[ERROR] ...' 메시지, 정상/데이터 없음이면 None"""
+    status = data.get('status') if isinstance(data, dict) else None
+    if status in ("000", "013"):
+        return None
+    message = data.get('message', status) if isinstance(data, dict) else data
+    return f"[ERROR] DART 조회 실패: {message}"
+
+def resolve_corp_code(corp_name):
+    """
+    기업명 -> 8자리 corp_code (못 찾으면 None). dart_cache로 매칭 결과를 공유하고,
+    정확히 일치하는 기업이 없으면 유사 기업명 후보로 다시 찾습니다.
+    세션 엔터티 메모리에 있는 기업명(또는 '그 회사')이면 매칭 없이 기억해 둔 corp_code를 씁니다.
+    """
+    memory = current_entity_memory()
+    if memory is not None:
+        corp_code = memory.lookup(corp_name)
+        if corp_code:
+            return corp_code
+    if is_reference(corp_name):  # 앞 대화 없이 '그 회사'만 온 경우 엉뚱한 기업으로 퍼지 매칭하지 않음
+        return None
+    info = dart_cache.resolve_corp_code(corp_name)
+    corp_code = info.get('corp_code') if isinstance(info, dict) else None
+    if not corp_code and isinstance(info, dict):
+        for candidate in info.get('candidates', []):
+            retry = dart_cache.resolve_corp_code(candidate)
+            if isinstance(retry, dict) and retry.get('corp_code'):
+                corp_code = retry['corp_code']
+                break
+    if corp_code and str(corp_code).isdigit() and len(str(corp_code)) == 8:
+        if memory is not None:
+            memory.remember(corp_name, corp_code)
+        return str(corp_code)
+    return None
+
 def clean_corp_code(corp_code):
     corp_code = str(corp_code).strip()
     corp_code = corp_code.replace("'", "").replace('"', "")
@@ -32,6 +123,7 @@ def clean_corp_code(corp_code):
     return corp_code
 
 @tool
+@memoize_tool(ttl=dart_cache.COMPANY_INFO_TTL, normalize=clean_corp_code)
 def get_company_info_tool(corp_code: str) -> str:
     """
     corp_code(8자리 숫자)를 입력하면 DART API에서 기업 정보를 반환합니다.
@@ -41,8 +133,7 @@ def get_company_info_tool(corp_code: str) -> str:
     corp_code = clean_corp_code(corp_code)
     if not corp_code.isdigit() or len(corp_code) != 8:
         return f"[ERROR] corp_code(8자리 숫자)만 입력하세요. (입력값: {corp_code})"
-    dart = DartAPI()
-    info = dart.get_company_info(corp_code)
+    info = dart_cache.get_company_info(corp_code)
     if info.get('status') == '000':
         keys = ["corp_name", "stock_code", "ceo_nm", "corp_cls", "adres"]
         result = []
@@ -54,6 +145,7 @@ def get_company_info_tool(corp_code: str) -> str:
         return "입력하신 corp_code에 해당하는 기업 정보를 찾을 수 없습니다. corp_code를 다시 확인하세요."
 
 @tool
+@memoize_tool(normalize=financial_query_key, prepare=expand_references, cacheable=is_cacheable_financial_result)
 def get_financial_statements_tool(input: str) -> str:
     """
     기업명, 연도, 보고서 종류가 포함된 자연어 문장을 입력하면 DART API에서 재무제표를 반환합니다.
@@ -62,18 +154,13 @@ def get_financial_statements_tool(input: str) -> str:
     """
     query = input
     parsed = parse_financial_query(query)
-    dart = DartAPI()
-    corp_code_info = dart.find_corp_code(parsed['corp_name'])
-    corp_code = corp_code_info['corp_code'] if isinstance(corp_code_info, dict) else corp_code_info
     # 매칭 실패 시 candidates로 재시도
-    if not corp_code and isinstance(corp_code_info, dict):
-        for candidate in corp_code_info.get('candidates', []):
-            retry = dart.find_corp_code(candidate)
-            if isinstance(retry, dict) and retry.get('corp_code'):
-                corp_code = retry['corp_code']
-                break
-    if corp_code and isinstance(corp_code, str) and corp_code.isdigit() and 6 <= len(corp_code) <= 8:
-        data = dart.get_financial_statements(corp_code, bsns_year=parsed['year'])
+    corp_code = resolve_corp_code(parsed['corp_name'])
+    if corp_code:
+        tag_result((corp_code, parsed['year']))  # 신규 공시 동기화가 (corp_code, 연도) 단위로 툴 캐시를 지움
+        data = dart_cache.get_statements(corp_code, parsed['year'], reprt_code=parsed['reprt_code'])
+        if (error := dart_error(data)):
+            return error
         if not data.get('list'):
             return "재무 데이터가 없습니다. (최종 답변)"
         main_accounts = ["매출액", "영업이익", "당기순이익"]
@@ -81,7 +168,14 @@ def get_financial_statements_tool(input: str) -> str:
         for item in data['list']:
             if item.get('account_nm') in main_accounts:
                 result.append(f"{item['account_nm']}: {item['thstrm_amount']}")
-        return '\n'.join(result) if result else "주요 계정 데이터가 없습니다. (최종 답변)"
+        if not result:
+            return "주요 계정 데이터가 없습니다. (최종 답변)"
+        # 주요 비율 (당기 기준, 성장률은 전기 대비)
+        amounts = standardize_statement(data)
+        ratios = compute_ratios(amounts.loc[["당기"]], amounts.loc[["전기"]].set_axis(["당기"])).loc["당기"]
+        for name in ["영업이익률", "순이익률", "매출성장률", "부채비율", "ROE"]:
+            result.append(f"{name}: {format_ratio(ratios[name], missing='N/A')}")
+        return '\n'.join(result)
     else:
         return "기업명을 찾을 수 없습니다. (최종 답변)"
 
@@ -92,32 +186,88 @@ def analyze_csv_tool(input: str) -> str:
     입력 예시: input='data/재무정보.csv'
     출력 예시: '컬럼: [...], 기초 통계: ...'
     """
-    file_path = input
-    df = pd.read_csv(file_path)
-    return f"컬럼: {list(df.columns)}\n기초 통계:\n{df.describe().to_string()}"
+    file_path = input.strip()
+    try:
+        # 큰 파일도 청크 단위로 읽어 메모리 사용량이 일정한 스트리밍 통계
+        stats = analyze_csv(file_path)
+    except FileNotFoundError:
+        return f"파일이 존재하지 않습니다: {file_path}"
+    return stats.summary()
 
 @tool
 def summarize_pdf_tool(input: str) -> str:
     """
-    PDF 파일 경로를 입력하면 앞부분 텍스트 요약을 반환합니다.
-    입력 예시: input='data/사업보고서.pdf'
+    PDF 파일 경로를 입력하면 앞부분 텍스트 요약을 반환합니다. '|' 뒤에 페이지 범위를 주면 해당 페이지 텍스트를 반환합니다.
+    입력 예시: input='data/사업보고서.pdf' 또는 input='data/사업보고서.pdf | 10-12'
     출력 예시: '요약 텍스트 ...'
     """
-    file_path = input
+    file_path, _, page_spec = [part.strip() for part in input.partition("|")]
     try:
-        pdf_reader = PyPDF2.PdfReader(file_path)
+        doc = open_pdf(file_path)
     except FileNotFoundError:
         return f"파일이 존재하지 않습니다: {file_path}"
-    all_text = ""
-    for i, page in enumerate(pdf_reader.pages):
-        text = page.extract_text()
-        if text:
-            all_text += text
-            if i >= 1:
-                break
+    if page_spec:
+        try:
+            pages = parse_page_spec(page_spec, doc.page_count)
+        except ValueError:  # 'x.pdf | 주요 리스크'처럼 search_pdf_tool 형식으로 들어온 경우
+            pages = []
+        if not pages:
+            return f"페이지 범위가 올바르지 않습니다: {page_spec} (전체 {doc.page_count}페이지)"
+        all_text = "\n".join(f"[{i + 1}페이지]\n{text}" for i, text in doc.iter_pages(pages))
+        return all_text[:3000] + ("..." if len(all_text) > 3000 else "")
+    # 앞쪽 PDF_SUMMARY_SCAN_PAGES 페이지를 한 번에 추출해 텍스트가 있는 앞쪽 두 페이지까지 (스캔본이 전체를 훑지 않도록)
+    texts = [text for _, text in doc.iter_pages(range(min(PDF_SUMMARY_SCAN_PAGES, doc.page_count))) if text]
+    all_text = "".join(texts[:2])
     return all_text[:1000] + ("..." if len(all_text) > 1000 else "")
 
 @tool
+def search_pdf_tool(input: str) -> str:
+    """
+    업로드한 PDF(사업보고서 등)에서 질문과 관련된 구간을 찾아 페이지 번호와 함께 반환합니다. 긴 보고서의 특정 내용 질문에 사용하세요.
+    입력 예시: input='data/사업보고서.pdf | 주요 리스크는?'
+    출력 예시: '[12페이지] ... 환율 변동 위험 ...'
+    """
+    file_path, _, question = [part.strip() for part in input.partition("|")]
+    if not question:
+        return "입력 형식: 'PDF 경로 | 질문'"
+    try:
+        index = build_pdf_index(file_path)
+    except FileNotFoundError:
+        return f"파일이 존재하지 않습니다: {file_path}"
+    results = index.search(question, top_k=5)
+    if not results:
+        return "관련 내용을 찾지 못했습니다."
+    return "\n\n".join(f"[{page}페이지] {text}" for _, page, text in results)
+
+@tool
+def extract_pdf_tables_tool(input: str) -> str:
+    """
+    PDF(실적발표 자료, 사업보고서 등)의 표를 추출합니다. 경로만 주면 표 목록을, '|' 뒤에 표 번호를 주면
+    해당 표 내용(금액은 숫자로 변환)과 기초 통계를 반환합니다.
+    입력 예시: input='data/실적발표.pdf' 또는 input='data/실적발표.pdf | 3'
+    출력 예시: '표 3 (5페이지) ... 기초 통계: ...'
+    """
+    file_path, _, table_no = [part.strip() for part in input.partition("|")]
+    try:
+        tables = extract_tables(file_path)
+    except FileNotFoundError:
+        return f"파일이 존재하지 않습니다: {file_path}"
+    if not tables:
+        return "PDF에서 표를 찾지 못했습니다."
+    if not table_no:
+        lines = [f"표 {len(tables)}개 (표 번호를 함께 입력하면 내용을 보여줍니다)"]
+        for t in tables[:30]:
+            lines.append(f"표 {t.index} ({t.page}페이지, {t.df.shape[0]}행 x {t.df.shape[1]}열): {list(t.df.columns)[:6]}")
+        return "\n".join(lines)
+    try:
+        table = tables[int(table_no) - 1]
+    except (ValueError, IndexError):
+        return f"표 번호가 올바르지 않습니다: {table_no} (1~{len(tables)})"
+    return f"표 {table.index} ({table.page}페이지)\n{table.df.head(20).to_string()}\n{table.describe()}"
+
+@tool
+@memoize_tool(normalize=financial_query_key, prepare=expand_references,
+              cacheable=lambda r: isinstance(r, str) and r.endswith(".png") and os.path.exists(r))
 def plot_financials_tool(input: str) -> str:
     """
     기업명, 연도, 보고서 종류가 포함된 자연어 문장을 입력하면 주요 재무제표를 바 차트로 시각화합니다.
@@ -127,11 +277,13 @@ def plot_financials_tool(input: str) -> str:
     import matplotlib.pyplot as plt
     query = input
     parsed = parse_financial_query(query)
-    dart = DartAPI()
-    corp_code = dart.find_corp_code(parsed['corp_name'])
-    if not corp_code or not (isinstance(corp_code, str) and corp_code.isdigit() and len(corp_code) == 8):
-        return corp_code if isinstance(corp_code, str) else "기업명을 찾을 수 없습니다. (최종 답변)"
-    fs = dart.get_financial_statements(corp_code, bsns_year=parsed['year'])
+    corp_code = resolve_corp_code(parsed['corp_name'])
+    if not corp_code:
+        return "기업명을 찾을 수 없습니다. (최종 답변)"
+    tag_result((corp_code, parsed['year']))
+    fs = dart_cache.get_statements(corp_code, parsed['year'], reprt_code=parsed['reprt_code'])
+    if (error := dart_error(fs)):
+        return error
     if not fs.get("list"):
         return "재무 데이터가 없습니다. (최종 답변)"
     df = pd.DataFrame(fs["list"])
@@ -146,11 +298,13 @@ def plot_financials_tool(input: str) -> str:
     ax.set_title(f"{parsed['year']}년 주요 재무제표")
     plt.tight_layout()
     img_path = f".cache/{parsed['corp_name']}_{parsed['year']}_fin.png"
+    os.makedirs(".cache", exist_ok=True)
     fig.savefig(img_path)
     plt.close(fig)
     return img_path
 
 @tool
+@memoize_tool(prepare=expand_references, cacheable=is_cacheable_financial_result)
 def get_semiannual_reports_tool(input: str) -> str:
     """
     기업명, 연도, 반기(상/하반기)가 포함된 자연어 문장을 입력하면 DART API에서 반기보고서 리스트를 반환합니다.
@@ -163,10 +317,13 @@ def get_semiannual_reports_tool(input: str) -> str:
     year = year_match.group(1) if year_match else "2023"
     half = '상반기' if '상반기' in query else ('하반기' if '하반기' in query else '상반기')
     corp_name = query.split(str(year))[0].strip() if year else query
-    dart = DartAPI()
-    corp_code = dart.find_corp_code(corp_name)
-    if corp_code and isinstance(corp_code, str) and corp_code.isdigit() and len(corp_code) == 8:
-        reports = dart.get_semiannual_reports_list(corp_code, year, half)
+    corp_code = resolve_corp_code(corp_name)
+    if corp_code:
+        tag_result((corp_code, year))
+        data = dart_cache.get_semiannual_reports(corp_code, year, half)
+        if (error := dart_error(data)):
+            return error
+        reports = data['list']
         if not reports:
             return f"{year}년 {half} 반기보고서가 없습니다."
         result = []
@@ -177,7 +334,72 @@ def get_semiannual_reports_tool(input: str) -> str:
             result.append(f"{dt} {nm}: {url}")
         return '\n'.join(result)
     else:
-        return corp_code if isinstance(corp_code, str) else "기업명을 찾을 수 없습니다. (최종 답변)"
+        return "기업명을 찾을 수 없습니다. (최종 답변)"
+
+@tool
+@memoize_tool(normalize=financial_query_key, prepare=expand_references, cacheable=is_cacheable_financial_result)
+def get_quarterly_trend_tool(input: str) -> str:
+    """
+    기업명과 연도를 입력하면 전년도~해당 연도의 분기별(단일 분기) 매출액/영업이익/순이익과 TTM(최근 4개 분기) 매출액, 영업이익률을 반환합니다.
+    입력 예시: input='삼성전자 2023'
+    출력 예시: '2023.Q1 매출액 63조 7453억, 영업이익 6402억, ... TTM 매출액 ..., TTM 영업이익률 4.3%'
+    """
+    parsed = parse_financial_query(input)
+    corp_code = resolve_corp_code(parsed['corp_name'])
+    if not corp_code:
+        return "기업명을 찾을 수 없습니다. (최종 답변)"
+    year = int(parsed['year'])
+    tag_result((corp_code, str(year - 1)), (corp_code, str(year)))
+    result = quarterly_statements(corp_code, [year - 1, year])
+    if result["failed"]:
+        return f"[ERROR] DART 조회 실패: 분기 보고서 {result['failed']}건을 가져오지 못했습니다."
+    table = quarterly_summary(result)
+    if table.empty:
+        return "분기 재무 데이터가 없습니다. (최종 답변)"
+    lines = []
+    for label, row in table.iterrows():
+        values = [f"{name} {row[name] / 1e8:,.0f}억원" if pd.notna(row[name]) else f"{name} N/A"
+                  for name in table.columns if name != "TTM 영업이익률"]
+        values.append(f"TTM 영업이익률 {format_ratio(row['TTM 영업이익률'], missing='N/A')}")
+        lines.append(f"{label} " + ", ".join(values))
+    return "\n".join(lines)
+
+@tool
+@memoize_tool(version=screener.store.stamp)
+def screen_companies_tool(input: str) -> str:
+    """
+    로컬에 수집된 상장사 재무 데이터에서 조건에 맞는 기업을 찾아 순위를 반환합니다. (DART 호출 없음)
+    입력 형식: '연도 | 필터식 | 정렬식 | 개수' (필터식/정렬식은 비워 둘 수 있음, 정렬은 내림차순, '오름차순'을 붙이면 오름차순)
+    지표: 매출액, 영업이익, 당기순이익, 자산총계, 부채총계, 자본총계, 유동자산, 유동부채, 영업활동현금흐름, 잉여현금흐름,
+          매출총이익률, 영업이익률, 순이익률, 매출성장률, 영업이익성장률, 순이익성장률, 자산성장률, 부채비율, 자기자본비율,
+          유동비율, 당좌비율, 현금비율, 영업현금흐름비율, 현금흐름대비순이익, ROE, ROA (비율 지표는 % 단위, 금액은 원 단위)
+    입력 예시: input='2023 | 영업이익률 >= 10 and 매출액 >= 1e12 | 매출액 | 10'
+    입력 예시: input='2023 | | 부채비율 오름차순 | 5'
+    출력 예시: '1. 삼성전자 (00126380) 매출액 2,589,355억원, 영업이익률 2.5%'
+    """
+    parts = [p.strip() for p in input.split("|")]
+    parts += [""] * (4 - len(parts))
+    year_match = re.search(r'(\d{4})', parts[0])
+    if not year_match:
+        return "[ERROR] 첫 항목에 연도(예: 2023)를 입력하세요. 입력 형식: '연도 | 필터식 | 정렬식 | 개수'"
+    where, rank_by = parts[1], parts[2]
+    ascending = "오름차순" in rank_by
+    rank_by = rank_by.replace("오름차순", "").replace("내림차순", "").strip()
+    limit = int(parts[3]) if parts[3].isdigit() else 10
+    try:
+        result = screener.screen(year_match.group(1), where=where or None, rank_by=rank_by or None,
+                                 ascending=ascending, limit=limit)
+    except ValueError as e:
+        return f"[ERROR] {e}"
+    if result.empty:
+        return f"{year_match.group(1)}년 조건에 맞는 기업이 없거나 로컬 재무 데이터가 없습니다. (최종 답변)"
+    # 식에 쓰인 지표와 대표 지표를 함께 표시
+    shown = [m for m in AMOUNT_METRICS + RATIO_METRICS if m in f"{where} {rank_by}"] or ["매출액", "영업이익률"]
+    lines = []
+    for i, (corp_code, row) in enumerate(result.iterrows(), start=1):
+        values = ", ".join(f"{m} {format_metric(m, row[m])}" for m in shown)
+        lines.append(f"{row.get('순위', i)}. {row['corp_name']} ({corp_code}) {values}")
+    return "\n".join(lines)
 
 def load_general_prompt():
     """prompts/general.yaml에서 프롬프트 템플릿을 불러옴"""
@@ -189,10 +411,14 @@ def load_general_prompt():
 def answer_from_page_context(question, page_context):
     """
     질문에 대해 페이지 내 결과값(문자열 등)에서 답변을 우선적으로 추출.
-    간단히는 context 내에서 유사 문장 반환, 없으면 None 반환.
+    완전일치 줄이 있으면 그 줄을, 없으면 검색 인덱스(BM25+임베딩)로 확신도가 높은 줄을 반환.
+    확신할 수 없으면 None 반환 (이때는 retrieve_page_context로 상위 passage만 LLM에 전달).
     """
-    # 완전일치 우선, 추후 유사도 검색으로 개선 가능
+    if not question or not question.strip() or not page_context:
+        return None
+    # 1. 완전일치 우선
     for line in page_context.split('\n'):
         if question.strip() in line:
             return line
-    return None
\ No newline at end of file
+    # 2. 검색 인덱스 기반 답변
+    return build_page_context_index(page_context).answer(question)
\ No newline at end of file
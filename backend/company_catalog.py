@@ -0,0 +1,25 @@
+# 조회가 가장 많은 대표 기업 목록 (페이지 2 기업 선택, 페이지 3 산업 매핑, 캐시 워밍업에서 공통 사용)
+# DART 기업 코드 테이블의 정확한 corp_name으로 적음 (약칭은 유사 매칭에서 다른 법인으로 풀릴 수 있음. 예: '현대차')
+TOP_COMPANIES = [
+    "삼성전자", "SK하이닉스", "LG화학", "삼성바이오로직스", "현대자동차", "기아", "POSCO홀딩스", "삼성SDI", "NAVER", "카카오"
+]
+
+# 페이지 3 산업/시장 카테고리 (시장 요약을 백그라운드에서 미리 만들어 두는 대상)
+MARKET_INDUSTRIES = ["반도체", "2차전지", "자동차", "게임", "바이오", "IT", "금융", "유통", "조선", "항공", "기타"]
+
+# 페이지 2에서 선택 가능한 사업연도
+DEFAULT_YEARS = ["2024", "2023", "2022", "2021"]
+
+COMPANY_TO_INDUSTRY = {
+    "삼성전자": "반도체",
+    "SK하이닉스": "반도체",
+    "LG화학": "2차전지",
+    "현대자동차": "자동차",
+    "현대차": "자동차",  # 페이지 3에서 약칭으로 검색하는 경우
+    "기아": "자동차",
+    "NAVER": "IT",
+    "카카오": "IT",
+    "삼성바이오로직스": "바이오",
+    "POSCO홀딩스": "2차전지",
+    "삼성SDI": "2차전지",
+}
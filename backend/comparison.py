@@ -0,0 +1,154 @@
+"""
+여러 기업 재무 비교 (페이지 2 Q&A의 '삼성전자와 LG전자 매출 비교', 'LG화학 경쟁사와 비교' 등).
+
+기업명 매칭과 재무제표 조회를 기업마다 차례로 하지 않고 한 번에 동시에 처리합니다.
+    1) 기업명 -> corp_code: 세션 엔터티 메모리/dart_cache를 거쳐 동시에 매칭 (같은 표현은 한 번만)
+    2) 재무제표: dart_cache로 동시에 조회 (연결재무제표가 없으면 별도재무제표로 대체)
+    3) 표준 계정(accounts)과 비율(ratios)로 맞춰 기업 × 지표 비교표 하나로 정리
+전체 시간은 가장 느린 DART 응답 한 번 정도이며, 캐시에 있으면 스레드 없이 바로 계산합니다.
+
+    result = compare_companies(["LG화학", "삼성SDI", "SK이노베이션"], "2023", item="매출")
+    result.table      # index: 기업명, 열: corp_code + 금액(원)/비율(%) 지표, 요청 지표 기준 내림차순
+    result.summary()  # 'LG화학 2023년 매출액: 55조 2498억' ...
+"""
+import contextvars
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from backend import dart_cache
+from backend.accounts import ACCOUNT_LABELS, STANDARD_ACCOUNTS, standardize_statement
+from backend.company_analysis_tools import resolve_corp_code
+from backend.entity_memory import mention_key
+from backend.ratios import RATIO_NAMES, compute_ratios
+from backend.screening import format_metric
+
+COMPARISON_WORKERS = int(os.getenv("COMPARISON_WORKERS", "8"))
+# 비교표에 항상 넣는 지표 (요청 지표가 여기에 없으면 앞에 추가)
+DEFAULT_METRICS = ["매출액", "영업이익", "당기순이익", "영업이익률", "순이익률", "매출성장률", "부채비율", "ROE"]
+# 'LG화학 경쟁사와 비교', '2023년 삼성전자와 LG전자 매출 비교' 등 비교 질문 표현
+COMPARISON_RE = re.compile(r"비교|경쟁사|동종\s?업계|업계\s?\d?위|대비|\svs\.?\s", re.IGNORECASE)
+
+
+@dataclass
+class ComparisonResult:
+    year: str
+    metric: str = None  # 요청 지표 (표준 지표명, 못 맞추면 None)
+    table: pd.DataFrame = None
+    missing: list = field(default_factory=list)  # 매칭 실패/재무 데이터 없음 기업명
+
+    @property
+    def empty(self):
+        return self.table is None or self.table.empty
+
+    def summary(self):
+        """Q&A 답변용 문자열 (요청 지표가 없으면 대표 지표)"""
+        metrics = [self.metric] if self.metric else ["매출액", "영업이익", "영업이익률"]
+        lines = []
+        if not self.empty:
+            for name, row in self.table.iterrows():
+                values = ", ".join(f"{m}: {format_metric(m, row[m])}" for m in metrics)
+                lines.append(f"{name} {self.year}년 {values}")
+        lines += [f"{name} {self.year}년: 정보 없음" for name in self.missing]
+        return "\n".join(lines)
+
+
+def is_comparison_query(text):
+    return bool(text) and COMPARISON_RE.search(str(text)) is not None
+
+
+def resolve_metric(item):
+    """
+    '매출', '영업 이익', '부채비율' 등 -> 표준 지표명 ('매출액', '영업이익', '부채비율'). 못 맞추면 None.
+    비율 이름과 표준 계정 표시명/계정명 키워드(accounts.STANDARD_ACCOUNTS)를 완전일치로, 그다음 포함 관계로 찾습니다.
+    """
+    text = re.sub(r"\s+", "", str(item or ""))
+    if not text:
+        return None
+    for name in RATIO_NAMES:
+        if text.upper() == name.upper():  # 'roe' -> 'ROE'
+            return name
+    for key, spec in STANDARD_ACCOUNTS.items():
+        if text == spec["label"] or text in spec["keywords"]:
+            return spec["label"]
+    # '2023년 매출액 추이'처럼 다른 말이 붙은 경우: 긴 이름부터 포함 여부 확인 ('매출총이익률'이 '매출'보다 먼저)
+    names = sorted(RATIO_NAMES + list(ACCOUNT_LABELS.values()), key=len, reverse=True)
+    return next((name for name in names if name.upper() in text.upper()), None)
+
+
+def _run_concurrently(fn, items, max_workers):
+    """items에 fn을 동시에 적용한 결과 리스트 (세션 엔터티 메모리 등 컨텍스트 변수를 작업 스레드에 복사)"""
+    if len(items) <= 1:
+        return [fn(item) for item in items]
+    with ThreadPoolExecutor(max_workers=min(max_workers, len(items))) as pool:
+        futures = [pool.submit(contextvars.copy_context().run, fn, item) for item in items]
+        return [f.result() for f in futures]
+
+
+def resolve_companies(names, max_workers=COMPARISON_WORKERS):
+    """기업명 리스트 -> {기업명: corp_code 또는 None}. 같은 기업의 다른 표기는 한 번만 매칭합니다."""
+    unique = {}
+    for name in names:
+        unique.setdefault(mention_key(name), name)
+    codes = dict(zip(unique, _run_concurrently(resolve_corp_code, list(unique.values()), max_workers)))
+    return {name: codes[mention_key(name)] for name in names}
+
+
+def _fetch_statement(job):
+    corp_code, year, reprt_code, fs_div = job
+    fs = dart_cache.get_statements(corp_code, year, reprt_code=reprt_code, fs_div=fs_div)
+    if not fs.get("list") and fs_div == "CFS":
+        # 종속회사가 없는 기업은 연결재무제표가 없으므로 별도재무제표로 대체
+        fs = dart_cache.get_statements(corp_code, year, reprt_code=reprt_code, fs_div="OFS")
+    return fs
+
+
+def fetch_statements(corp_codes, year, reprt_code="11011", fs_div="CFS", max_workers=COMPARISON_WORKERS):
+    """corp_code 리스트 -> {corp_code: 재무제표 응답}. 모두 캐시에 있으면 스레드 없이 바로 반환합니다."""
+    jobs = [(code, str(year), reprt_code, fs_div) for code in dict.fromkeys(corp_codes)]
+    if all(dart_cache.is_statement_cached(code, year, reprt_code, fs_div) for code, *_ in jobs):
+        return {job[0]: _fetch_statement(job) for job in jobs}
+    return dict(zip((job[0] for job in jobs), _run_concurrently(_fetch_statement, jobs, max_workers)))
+
+
+def comparison_table(statements, names):
+    """
+    {corp_code: 재무제표 응답}, {기업명: corp_code} -> 기업명별 한 행의 비교표.
+    금액 열은 표준 계정 표시명(원), 비율 열은 ratios의 이름(%)이며 성장률은 같은 응답의 전기 대비입니다.
+    """
+    rows = {name: standardize_statement(statements[code]) for name, code in names.items()}
+    current = pd.DataFrame({name: t.loc["당기"] for name, t in rows.items()}).T
+    previous = pd.DataFrame({name: t.loc["전기"] for name, t in rows.items()}).T
+    amounts = current.reindex(columns=list(STANDARD_ACCOUNTS)).rename(columns=ACCOUNT_LABELS)
+    table = pd.concat([amounts, compute_ratios(current, previous)], axis=1)
+    table.insert(0, "corp_code", pd.Series(names))
+    return table
+
+
+def compare_companies(names, year, item=None, reprt_code="11011", fs_div="CFS", max_workers=COMPARISON_WORKERS):
+    """
+    기업명 리스트 -> ComparisonResult. 매칭 실패/재무 데이터가 없는 기업은 missing에 모읍니다.
+    표는 요청 지표(item) 기준 내림차순이며, 열은 corp_code + 요청 지표 + DEFAULT_METRICS 순서입니다.
+    """
+    # LLM 파싱 결과가 그대로 들어오므로 문자열이 아닌 항목은 무시
+    names = list(dict.fromkeys(n.strip() for n in names if isinstance(n, str) and n.strip()))
+    metric = resolve_metric(item)
+    result = ComparisonResult(year=str(year), metric=metric)
+    codes = resolve_companies(names, max_workers=max_workers)
+    found = {name: code for name, code in codes.items() if code}
+    statements = fetch_statements(list(found.values()), year, reprt_code, fs_div, max_workers=max_workers)
+    with_data = {name: code for name, code in found.items() if statements[code].get("list")}
+    result.missing = [name for name in names if name not in with_data]
+    if not with_data:
+        return result
+    table = comparison_table(statements, with_data)
+    columns = ["corp_code"] + list(dict.fromkeys(([metric] if metric else []) + DEFAULT_METRICS))
+    table = table[columns]
+    if metric:
+        table = table.sort_values(metric, ascending=False, na_position="last")
+    result.table = table.replace([np.inf, -np.inf], np.nan)
+    return result
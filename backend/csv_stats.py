@@ -0,0 +1,159 @@
+"""
+대용량 CSV 스트리밍 통계.
+
+파일 전체를 pd.read_csv로 올리지 않고 CSV_CHUNK_ROWS행씩 읽으면서
+열별 개수/평균/분산/최솟값/최댓값/결측 수를 한 번에 누적(Chan 등의 병합식)하고,
+저수지 표본(reservoir sample)을 함께 유지해 분위수 근사와 미리보기에 씁니다.
+메모리 사용량은 파일 크기와 무관하게 (청크 + 표본) 크기로 일정합니다.
+
+    stats = analyze_csv("data/재무정보.csv")
+    stats.describe()      # pandas describe()와 같은 모양 (분위수는 표본 기준 근사값) + 결측 수
+    stats.sample.head()   # 미리보기
+"""
+import os
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from backend.cache_utils import TTLCache
+
+CSV_CHUNK_ROWS = int(os.getenv("CSV_CHUNK_ROWS", "100000"))
+CSV_SAMPLE_SIZE = int(os.getenv("CSV_SAMPLE_SIZE", "10000"))
+
+# (경로, 수정 시각, 크기) -> CsvStats
+_stats_cache = TTLCache(maxsize=64, ttl=24 * 60 * 60)
+
+
+@dataclass
+class RunningStats:
+    """한 숫자 열의 병합 가능한 단일 패스 통계"""
+    count: int = 0
+    mean: float = 0.0
+    m2: float = 0.0  # 평균과의 편차 제곱합
+    min: float = np.inf
+    max: float = -np.inf
+
+    def update(self, values):
+        """결측을 제외한 float 배열 하나를 더합니다."""
+        n = len(values)
+        if not n:
+            return
+        self.merge(RunningStats(n, float(values.mean()), float(((values - values.mean()) ** 2).sum()),
+                                float(values.min()), float(values.max())))
+
+    def merge(self, other):
+        """다른 RunningStats를 합칩니다. (Chan et al. 병렬 분산 병합식)"""
+        if not other.count:
+            return
+        n = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / n
+        self.m2 += other.m2 + delta ** 2 * self.count * other.count / n
+        self.count = n
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+
+    @property
+    def std(self):
+        return float(np.sqrt(self.m2 / (self.count - 1))) if self.count > 1 else np.nan
+
+
+@dataclass
+class CsvStats:
+    rows: int = 0
+    columns: list = field(default_factory=list)
+    numeric: dict = field(default_factory=dict)  # 열 -> RunningStats
+    nulls: dict = field(default_factory=dict)  # 열 -> 결측 수
+    sample: pd.DataFrame = None
+
+    def describe(self):
+        """숫자 열의 count/mean/std/min/25%/50%/75%/max + 결측 수 표. 분위수는 표본 기준 근사값입니다."""
+        out = {}
+        for col, s in self.numeric.items():
+            values = pd.to_numeric(self.sample[col], errors="coerce").dropna() if self.sample is not None else pd.Series(dtype=float)
+            q = values.quantile([0.25, 0.5, 0.75]) if len(values) else pd.Series([np.nan] * 3, index=[0.25, 0.5, 0.75])
+            out[col] = {
+                "count": s.count, "mean": s.mean if s.count else np.nan, "std": s.std,
+                "min": s.min if s.count else np.nan, "25%": q[0.25], "50%": q[0.5], "75%": q[0.75],
+                "max": s.max if s.count else np.nan, "null": self.nulls.get(col, 0),
+            }
+        return pd.DataFrame(out)
+
+    def summary(self):
+        """analyze_csv_tool 출력 형식의 문자열"""
+        stats = self.describe()
+        return (f"행 수: {self.rows:,}\n컬럼: {self.columns}\n"
+                f"결측 수: { {c: n for c, n in self.nulls.items() if n} }\n"
+                f"기초 통계 (분위수는 표본 {len(self.sample) if self.sample is not None else 0:,}행 기준 근사):\n"
+                f"{stats.to_string() if not stats.empty else '(숫자 열 없음)'}")
+
+
+def _update_sample(sample, chunk, seen, size, rng):
+    """
+    저수지 표본(Algorithm R)을 청크 단위로 갱신합니다. seen은 이 청크 이전까지 읽은 행 수.
+    표본이 찬 뒤에는 각 행이 size / (행 번호 + 1) 확률로 임의의 자리를 대체합니다.
+    """
+    if sample is None or len(sample) < size:
+        take = size - (0 if sample is None else len(sample))
+        head = chunk.iloc[:take]
+        sample = head.reset_index(drop=True) if sample is None else pd.concat([sample, head], ignore_index=True)
+        chunk = chunk.iloc[take:]
+        seen += len(head)
+    if chunk.empty:
+        return sample
+    positions = np.arange(seen, seen + len(chunk))
+    slots = (rng.random(len(chunk)) * (positions + 1)).astype(np.int64)
+    accepted = np.flatnonzero(slots < size)
+    if not len(accepted):
+        return sample
+    # 같은 자리가 여러 번 뽑히면 (순서대로 대입했을 때처럼) 마지막 행만 남김
+    latest = accepted[::-1]
+    replaced, first = np.unique(slots[latest], return_index=True)
+    replacement = chunk.iloc[latest[first]].set_axis(replaced)
+    return pd.concat([sample.drop(index=replaced), replacement]).sort_index()
+
+
+def analyze_csv(source, chunk_rows=CSV_CHUNK_ROWS, sample_size=CSV_SAMPLE_SIZE, seed=0, **read_kwargs):
+    """
+    CSV 경로(또는 파일 객체) -> CsvStats. 모든 열을 청크마다 pd.to_numeric으로 읽어 누적하고,
+    끝까지 읽은 뒤 숫자로 읽힌 값이 숫자가 아닌 값보다 많은 열을 숫자 열로 봅니다.
+    (첫 청크에만 '-' 같은 값이 섞여 있어도 통계가 빠지지 않음. 숫자 열의 숫자가 아닌 값은 결측으로 셈)
+    경로로 주면 (경로, 수정 시각, 크기) 기준으로 결과를 캐시합니다.
+    """
+    key = None
+    if isinstance(source, (str, os.PathLike)):
+        stat = os.stat(source)
+        key = (os.path.abspath(source), stat.st_mtime_ns, stat.st_size, chunk_rows, sample_size)
+        cached = _stats_cache.get(key)
+        if cached is not None:
+            return cached
+    rng = np.random.default_rng(seed)
+    stats = CsvStats()
+    running, non_numeric = {}, {}  # 열 -> RunningStats / 숫자로 읽히지 않은 (결측이 아닌) 값 수
+    for chunk in pd.read_csv(source, chunksize=chunk_rows, low_memory=False, **read_kwargs):
+        if not stats.columns:
+            stats.columns = list(chunk.columns)
+            running = {c: RunningStats() for c in chunk.columns}
+            non_numeric = {c: 0 for c in chunk.columns}
+            stats.nulls = {c: 0 for c in chunk.columns}
+        for col in stats.columns:
+            column = chunk[col]
+            if not pd.api.types.is_numeric_dtype(column):
+                parsed = pd.to_numeric(column, errors="coerce")
+                non_numeric[col] += int((parsed.isna() & column.notna()).sum())
+                column = parsed
+            values = column.to_numpy(dtype=float)
+            running[col].update(values[~np.isnan(values)])
+        for col, n in chunk.isna().sum().items():
+            stats.nulls[col] = stats.nulls.get(col, 0) + int(n)
+        stats.sample = _update_sample(stats.sample, chunk, stats.rows, sample_size, rng)
+        stats.rows += len(chunk)
+    stats.numeric = {c: s for c, s in running.items() if s.count >= non_numeric[c]}
+    for col in stats.numeric:
+        stats.nulls[col] += non_numeric[col]
+    if stats.sample is None:
+        stats.sample = pd.DataFrame(columns=stats.columns)
+    if key is not None:
+        _stats_cache.set(key, stats)
+    return stats
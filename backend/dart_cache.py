@@ -0,0 +1,169 @@
+import os
+import threading
+
+from backend.cache_utils import TTLCache
+from backend.request_scheduler import scheduler, INTERACTIVE
+from dart_api import DartAPI
+
+# 캐시 유지 시간(초). 재무제표는 공시 후 거의 바뀌지 않으므로 길게 유지합니다.
+STATEMENT_TTL = int(os.getenv("DART_STATEMENT_TTL", 24 * 60 * 60))
+NO_DATA_TTL = 60 * 60  # '조회된 데이터 없음' 응답은 짧게 유지
+COMPANY_INFO_TTL = 24 * 60 * 60
+CORP_CODE_TTL = 7 * 24 * 60 * 60
+
+_corp_code_cache = TTLCache(maxsize=4096, ttl=CORP_CODE_TTL)
+_company_info_cache = TTLCache(maxsize=2048, ttl=COMPANY_INFO_TTL)
+_statement_cache = TTLCache(maxsize=1024, ttl=STATEMENT_TTL)
+
+_dart = None
+_dart_lock = threading.Lock()
+_inflight = {}
+_inflight_lock = threading.Lock()
+
+
+def get_dart_api():
+    """프로세스 전체에서 공유하는 DartAPI 인스턴스 (기업 코드 테이블을 한 번만 로드)"""
+    global _dart
+    if _dart is None:
+        with _dart_lock:
+            if _dart is None:
+                _dart = DartAPI()
+    return _dart
+
+
+def set_dart_api(dart):
+    """공유 DartAPI 인스턴스를 교체합니다. (벤치마크/오프라인 대체 구현 주입용)"""
+    global _dart
+    with _dart_lock:
+        _dart = dart
+
+
+def _single_flight(cache, key, fetch, ttl_for):
+    """
+    캐시에 있으면 바로 반환하고, 없으면 같은 키에 대한 동시 요청 중 하나만 fetch()를 실행합니다.
+    ttl_for(result)가 0/None을 반환하면 결과를 캐시하지 않습니다.
+    """
+    value = cache.get(key)
+    if value is not None:
+        return value
+    # 키별 [잠금, 대기 중인 호출 수]. 마지막 호출이 나갈 때만 지워서, 기다리는 호출이 있는 동안
+    # 새로 온 호출이 다른 잠금을 만들어 같은 키를 동시에 조회하지 않도록 합니다.
+    with _inflight_lock:
+        entry = _inflight.setdefault(key, [threading.Lock(), 0])
+        entry[1] += 1
+    try:
+        with entry[0]:
+            value = cache.get(key)
+            if value is None:
+                value = fetch()
+                ttl = ttl_for(value)
+                if ttl:
+                    cache.set(key, value, ttl=ttl)
+    finally:
+        with _inflight_lock:
+            entry[1] -= 1
+            if entry[1] == 0 and _inflight.get(key) is entry:
+                del _inflight[key]
+    return value
+
+
+def _scheduled_fetch(cache, key, fetch, ttl_for, priority, deadline):
+    """
+    _single_flight와 같지만, 실제 조회는 공유 요청 스케줄러('dart')에서 토큰을 받은 뒤 실행합니다.
+    키 잠금을 잡은 뒤 캐시를 다시 확인하고 나서 토큰을 받으므로,
+    다른 스레드가 이미 채운 항목에는 토큰(DART 요청 한도)을 쓰지 않습니다.
+    """
+    return _single_flight(
+        cache, key,
+        lambda: scheduler.call("dart", fetch, priority=priority, deadline=deadline),
+        ttl_for,
+    )
+
+
+def resolve_corp_code(corp_name, priority=INTERACTIVE):
+    """
+    기업명 -> find_corp_code 결과 dict ({'corp_code', 'candidates', 'llm_result'}).
+    corp_code를 찾은 경우에만 캐시합니다. 매칭은 로컬 기업 코드 테이블로 하고,
+    후보 중 고르는 LLM 호출만 공유 요청 스케줄러('llm')를 priority로 거칩니다.
+    """
+    key = ("corp", get_dart_api().clean_corp_name(str(corp_name)))
+    return _single_flight(
+        _corp_code_cache, key,
+        lambda: get_dart_api().find_corp_code(corp_name, priority=priority),
+        lambda r: CORP_CODE_TTL if isinstance(r, dict) and r.get("corp_code") else None,
+    )
+
+
+def get_company_info(corp_code, priority=INTERACTIVE, deadline=None):
+    """company.json 응답 (정상 응답만 캐시)"""
+    return _scheduled_fetch(
+        _company_info_cache, ("company", corp_code),
+        lambda: get_dart_api().get_company_info(corp_code),
+        lambda r: COMPANY_INFO_TTL if r.get("status") == "000" else None,
+        priority, deadline,
+    )
+
+
+def get_semiannual_reports(corp_code, year, half="상반기", priority=INTERACTIVE, deadline=None):
+    """
+    해당 연도/반기의 공시목록 응답에서 반기보고서만 최신순으로 남긴 dict ({'status', 'message', 'list'}).
+    list.json 한 번 조회이며 공유 요청 스케줄러('dart')를 거칩니다. 오류 응답은 status로 구분합니다.
+    """
+    bgn_de, end_de = (f"{year}0101", f"{year}0630") if half == "상반기" else (f"{year}0701", f"{year}1231")
+    data = scheduler.call("dart", get_dart_api().get_notice_list, corp_code, bgn_de, end_de,
+                          priority=priority, deadline=deadline)
+    data = data if isinstance(data, dict) else {"status": "error", "message": str(data)}
+    reports = [item for item in data.get("list") or [] if "반기보고서" in item.get("report_nm", "")]
+    reports.sort(key=lambda x: x.get("rcept_dt", ""), reverse=True)
+    return dict(data, list=reports)
+
+
+def statements_key(corp_code, bsns_year, reprt_code="11011", fs_div="CFS"):
+    return ("fs", str(corp_code), str(bsns_year), str(reprt_code), str(fs_div))
+
+
+def _statement_ttl(result):
+    status = result.get("status") if isinstance(result, dict) else None
+    if status == "000":
+        return STATEMENT_TTL
+    if status == "013":
+        return NO_DATA_TTL
+    return None  # 네트워크 오류/한도 초과 등은 캐시하지 않음
+
+
+def get_statements(corp_code, bsns_year, reprt_code="11011", fs_div="CFS",
+                   priority=INTERACTIVE, deadline=None):
+    """
+    (기업, 연도, 보고서, 연결/별도) 단위의 전체 재무제표 응답.
+    fnlttSinglAcntAll은 한 번에 모든 sj_div(IS/CIS/BS/CF/SCE)를 돌려주므로,
+    재무제표 종류 전환은 이 응답을 sj_div로 걸러 쓰기만 하면 됩니다.
+    priority/deadline은 request_scheduler로 전달됩니다. (프리페치/워밍업은 낮은 우선순위로 호출)
+    """
+    return _scheduled_fetch(
+        _statement_cache, statements_key(corp_code, bsns_year, reprt_code, fs_div),
+        lambda: get_dart_api().get_financial_statements(corp_code, bsns_year=bsns_year, reprt_code=reprt_code, fs_div=fs_div),
+        _statement_ttl,
+        priority, deadline,
+    )
+
+
+def is_statement_cached(corp_code, bsns_year, reprt_code="11011", fs_div="CFS"):
+    return statements_key(corp_code, bsns_year, reprt_code, fs_div) in _statement_cache
+
+
+def invalidate_statements(corp_code, bsns_year=None, reprt_code=None):
+    """해당 기업(과 연도/보고서)의 재무제표 캐시를 제거하고 제거된 개수를 반환합니다."""
+    def match(key):
+        _, c, y, r, _fs = key
+        return c == str(corp_code) and (bsns_year is None or y == str(bsns_year)) \
+            and (reprt_code is None or r == str(reprt_code))
+    return _statement_cache.pop_where(match)
+
+
+def cache_stats():
+    return {
+        "corp_code": _corp_code_cache.stats(),
+        "company_info": _company_info_cache.stats(),
+        "statements": _statement_cache.stats(),
+        "scheduler": scheduler.stats(),
+    }
@@ -0,0 +1,49 @@
+import os
+import threading
+import numpy as np
+
+# 한국어 질문/문서 임베딩용 다국어 모델 (CPU에서도 가볍게 동작)
+EMBEDDING_MODEL_NAME = os.getenv("EMBEDDING_MODEL_NAME", "paraphrase-multilingual-MiniLM-L12-v2")
+
+_model = None
+_load_failed = False
+_lock = threading.Lock()
+
+
+def get_embedding_model():
+    """
+    sentence-transformers 모델을 프로세스당 한 번만 로드해 반환합니다.
+    모델 로드에 실패하면 None을 반환하고, 이후에는 다시 시도하지 않습니다.
+    """
+    global _model, _load_failed
+    if _model is not None or _load_failed:
+        return _model
+    with _lock:
+        if _model is None and not _load_failed:
+            try:
+                from sentence_transformers import SentenceTransformer
+                _model = SentenceTransformer(EMBEDDING_MODEL_NAME, device="cpu")
+            except Exception as e:
+                print(f"[ERROR] 임베딩 모델 로드 실패: {e}")
+                _load_failed = True
+    return _model
+
+
+def embed_texts(texts, batch_size=32):
+    """
+    문자열 리스트를 L2 정규화된 float32 임베딩 행렬로 변환합니다. (내적 = 코사인 유사도)
+    모델을 사용할 수 없으면 None을 반환합니다.
+    """
+    model = get_embedding_model()
+    if model is None:
+        return None
+    if not texts:
+        return np.zeros((0, 0), dtype=np.float32)
+    vectors = model.encode(
+        list(texts),
+        batch_size=batch_size,
+        normalize_embeddings=True,
+        convert_to_numpy=True,
+        show_progress_bar=False,
+    )
+    return np.asarray(vectors, dtype=np.float32)
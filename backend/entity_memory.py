@@ -0,0 +1,199 @@
+"""
+대화 단위 기업/기간 기억 (세션별 엔터티 메모리).
+
+한 번 찾은 '기업명 -> corp_code' 매칭을 세션에 기억해 두고, 다음 질문에서는 find_corp_code(퍼지 매칭, LLM 보조)를
+다시 거치지 않습니다. '그 회사', '해당 기업' 같은 지시 표현과 '작년', '전년도' 같은 상대 기간도
+직전 대화의 기업/연도로 풀어 줍니다.
+
+메모리는 세션마다 하나씩(st.session_state[SESSION_KEY]) 두고, 페이지 콜백과 에이전트 툴은 컨텍스트 변수로
+현재 세션의 메모리를 공유합니다. (ParallelToolAgentExecutor는 툴 실행 스레드에 컨텍스트를 복사하므로 툴에서도 그대로 보임)
+
+    memory = session_entity_memory(st.session_state)
+    with use_entity_memory(memory):
+        agent.invoke(...)                  # 툴 안에서는 current_entity_memory()로 같은 메모리 사용
+    memory.expand("그 회사 작년 매출")        # 직전 기업이 삼성전자면 -> '삼성전자 2025 매출'
+"""
+import contextvars
+import datetime
+import os
+import re
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+
+ENTITY_MEMORY_SIZE = int(os.getenv("ENTITY_MEMORY_SIZE", "128"))
+SESSION_KEY = "entity_memory"
+
+# '그 회사', '해당 기업의', '이 종목은' 등 직전 기업을 가리키는 표현.
+# 조사는 명사의 받침에 맞는 것만 인정하고 바로 뒤에 한글이 이어지면 제외 ('그 기업가 정신'은 지시 표현이 아님)
+# 그룹 1/3: 기업명으로 바꿀 때 빼는 조사, 그룹 2/4: 기업명 받침에 맞춰 붙여 두는 조사
+_DROPPED = {"vowel": "의|는|가|를|도", "consonant": "의|은|이|을|도"}
+_KEPT = {"vowel": "와|로|랑|에서|에게|에|보다|처럼|만|까지|부터",
+         "consonant": "과|으로|이랑|에서|에게|에|보다|처럼|만|까지|부터"}
+REFERENCE_RE = re.compile(
+    r"(?<![가-힣A-Za-z0-9])(?:그|이|저|해당|같은|동일한?)\s?"
+    rf"(?:(?:회사|업체)(?:({_DROPPED['vowel']})|({_KEPT['vowel']}))?"
+    rf"|(?:기업|종목)(?:({_DROPPED['consonant']})|({_KEPT['consonant']}))?)"
+    r"(?![가-힣])")
+# 받침 유무에 따라 바뀌는 조사 (받침 없음, 받침 있음)
+_PARTICLE_PAIRS = [("와", "과"), ("로", "으로"), ("랑", "이랑")]
+# 오늘 기준 상대 연도
+TODAY_PERIODS = {"재작년": -2, "작년": -1, "지난해": -1, "지난 해": -1, "올해": 0, "금년": 0}
+# 직전 대화 연도 기준 상대 연도
+FOCUS_PERIODS = {"그 해": 0, "그해": 0, "같은 해": 0, "같은 연도": 0, "해당 연도": 0, "해당 년도": 0,
+                 "전년도": -1, "그 전년": -1, "이듬해": 1, "다음 해": 1, "다음해": 1}
+PERIOD_RE = re.compile(
+    "|".join(re.escape(p) for p in sorted({**TODAY_PERIODS, **FOCUS_PERIODS}, key=len, reverse=True)))
+YEAR_RE = re.compile(r"\d{4}")
+
+_current = contextvars.ContextVar("entity_memory", default=None)
+
+
+def mention_key(mention):
+    """'삼성전자 (주)' -> '삼성전자' (공백/법인 표기/대소문자 차이를 무시)"""
+    text = re.sub(r"\(주\)|㈜|주식회사", "", str(mention))
+    return re.sub(r"\s+", "", text).lower()
+
+
+def _has_final_consonant(word):
+    """마지막 글자가 받침 있는 한글이면 True (영문/숫자는 받침 없음으로 봄)"""
+    last = str(word).strip()[-1:]
+    return "가" <= last <= "힣" and (ord(last) - ord("가")) % 28 != 0
+
+
+def attach_particle(name, particle):
+    """기업명 뒤에 받침에 맞는 조사를 붙임 ('그 기업과' -> '삼성전자와', 'LG화학과')"""
+    final = _has_final_consonant(name)
+    for without, with_final in _PARTICLE_PAIRS:
+        if particle in (without, with_final):
+            particle = with_final if final else without
+    return name + particle
+
+
+def is_reference(mention):
+    """빈 기업명 또는 '그 회사'처럼 직전 기업을 가리키는 표현인지"""
+    text = str(mention or "").strip()
+    return not text or REFERENCE_RE.fullmatch(text) is not None
+
+
+class EntityMemory:
+    """
+    한 세션(대화)의 엔터티 메모리.
+    - 기업명 표현 -> corp_code (최근 사용 순으로 최대 max_mentions개)
+    - 포커스: 마지막으로 다룬 기업명/corp_code/연도/보고서 (지시 표현과 상대 기간을 풀 때 사용)
+    포커스는 observe()로만 바뀝니다. 툴은 여러 스레드에서 동시에 돌 수 있으므로 매칭(lookup/remember)만 하고,
+    포커스는 페이지가 한 질문의 처리를 마친 뒤 순서대로 기록합니다.
+    """
+
+    def __init__(self, max_mentions=ENTITY_MEMORY_SIZE):
+        self.max_mentions = max_mentions
+        self._mentions = OrderedDict()  # mention_key -> (표현, corp_code)
+        self._lock = threading.Lock()  # 같은 단계의 툴이 여러 스레드에서 동시에 씀
+        self.corp_name = None
+        self.corp_code = None
+        self.year = None
+        self.reprt_code = None
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, mention):
+        """기업명 표현 -> 기억해 둔 corp_code (없으면 None). 지시 표현이면 포커스 기업을 돌려줍니다."""
+        with self._lock:
+            if is_reference(mention):
+                corp_code = self.corp_code
+            else:
+                key = mention_key(mention)
+                entry = self._mentions.get(key)
+                corp_code = entry[1] if entry else None
+                if entry:
+                    self._mentions.move_to_end(key)
+            if corp_code:
+                self.hits += 1
+            else:
+                self.misses += 1
+            return corp_code
+
+    def remember(self, mention, corp_code):
+        """새로 찾은 매칭을 기억합니다. (포커스는 바꾸지 않음)"""
+        if is_reference(mention) or not corp_code:
+            return
+        with self._lock:
+            key = mention_key(mention)
+            self._mentions[key] = (str(mention).strip(), str(corp_code))
+            self._mentions.move_to_end(key)
+            while len(self._mentions) > self.max_mentions:
+                self._mentions.popitem(last=False)
+
+    def observe(self, corp_name=None, year=None, reprt_code=None):
+        """질문에서 다룬 기업/연도/보고서를 포커스로 기록합니다. (corp_code를 모르는 기업이면 corp_code는 비움)"""
+        with self._lock:
+            if corp_name and not is_reference(corp_name):
+                entry = self._mentions.get(mention_key(corp_name))
+                self.corp_name = str(corp_name).strip()
+                self.corp_code = entry[1] if entry else None
+            if year:
+                self.year = str(year)
+            if reprt_code:
+                self.reprt_code = str(reprt_code)
+
+    def _replace_reference(self, match):
+        # 빼는 조사까지 치환한 경우에는 뒤 단어와 띄어 씀 ('그 회사의 매출' -> '삼성전자 매출', '그 회사에서' -> '삼성전자에서')
+        if match.group(1) or match.group(3):
+            return self.corp_name + " "
+        kept = match.group(2) or match.group(4)
+        return attach_particle(self.corp_name, kept) if kept else self.corp_name
+
+    def resolve_period(self, phrase, today=None):
+        """'작년', '전년도' 등 -> 연도 문자열 (풀 수 없으면 None)"""
+        if phrase in TODAY_PERIODS:
+            return str((today or datetime.date.today()).year + TODAY_PERIODS[phrase])
+        if phrase in FOCUS_PERIODS and self.year and self.year.isdigit():
+            return str(int(self.year) + FOCUS_PERIODS[phrase])
+        return None
+
+    def expand(self, text, today=None):
+        """
+        지시 표현을 포커스 기업명으로, 상대 기간을 연도로 바꾼 문장.
+        문장에 연도(4자리)가 이미 있으면 '전년 대비' 같은 비교 표현일 수 있으므로 기간은 바꾸지 않습니다.
+        """
+        text = str(text)
+        if self.corp_name:
+            text = REFERENCE_RE.sub(self._replace_reference, text)
+        if not YEAR_RE.search(text):
+            text = PERIOD_RE.sub(lambda m: self.resolve_period(m.group(0), today) or m.group(0), text)
+        return re.sub(r"[ \t]+", " ", text).strip()
+
+    def snapshot(self):
+        with self._lock:
+            return {"corp_name": self.corp_name, "corp_code": self.corp_code, "year": self.year,
+                    "reprt_code": self.reprt_code, "mentions": len(self._mentions),
+                    "hits": self.hits, "misses": self.misses}
+
+
+def current_entity_memory():
+    """현재 컨텍스트(세션)의 EntityMemory (없으면 None)"""
+    return _current.get()
+
+
+@contextmanager
+def use_entity_memory(memory):
+    """with 블록 안의 코드(와 그 안에서 컨텍스트를 복사해 실행하는 툴)가 memory를 쓰도록 설정"""
+    token = _current.set(memory)
+    try:
+        yield memory
+    finally:
+        _current.reset(token)
+
+
+def session_entity_memory(session_state):
+    """Streamlit session_state(또는 dict)에 저장된 세션 메모리 (없으면 새로 만듦)"""
+    memory = session_state.get(SESSION_KEY)
+    if memory is None:
+        memory = session_state[SESSION_KEY] = EntityMemory()
+    return memory
+
+
+def expand_references(text):
+    """현재 컨텍스트의 메모리로 지시 표현/상대 기간을 푼 문장 (메모리가 없으면 그대로)"""
+    memory = current_entity_memory()
+    return memory.expand(text) if memory is not None else text
@@ -0,0 +1,257 @@
+"""
+신규 공시 증분 동기화.
+
+DART 공시목록(list.json)을 주기적으로 조회해 마지막으로 본 접수번호(rcept_no) 이후의 정기공시만 가져오고,
+보고서명('사업보고서 (2023.12)', '[기재정정]반기보고서 (2024.06)' 등)에서 연도/보고서 코드를 읽어
+해당 (기업, 연도, 보고서)의 캐시만 정확히 무효화합니다.
+
+- dart_cache: 해당 재무제표 캐시를 지우고, 캐시에 있던 항목이면 낮은 우선순위로 바로 다시 받아 둡니다.
+- warehouse: 해당 수집 작업을 stale로 표시해 다음 ingest에서 다시 수집합니다.
+
+워터마크({rcept_dt, rcept_no})는 시장 전체/기업별로 JSON 파일에 저장되므로 프로세스를 재시작해도
+이미 처리한 공시를 다시 보지 않습니다. 동기화가 돌고 있으면 새 공시가 바로 반영되므로
+DART_STATEMENT_TTL을 길게 잡아도 됩니다.
+
+예시:
+    python -m backend.filing_sync                 # 시장 전체 정기공시 동기화
+    python -m backend.filing_sync --corp 00126380 # 한 기업만
+    python -m backend.filing_sync --status
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import threading
+import time
+
+from backend import dart_cache
+from backend.request_scheduler import scheduler, BATCH, PREFETCH
+from backend.tool_cache import invalidate_tool_cache_tags
+from backend.warehouse import warehouse, FS_DIVS, REPORT_CODES
+
+SYNC_STATE_PATH = os.getenv("DART_FILING_SYNC_STATE", os.path.join(".cache", "filing_sync.json"))
+# 워터마크가 없을 때 처음 조회할 기간(일)과 반복 주기(초), 비활성화 스위치(DART_FILING_SYNC=0)
+FILING_SYNC_LOOKBACK_DAYS = int(os.getenv("DART_FILING_SYNC_LOOKBACK_DAYS", "7"))
+FILING_SYNC_INTERVAL = int(os.getenv("DART_FILING_SYNC_INTERVAL", "600"))
+FILING_SYNC_ENABLED = os.getenv("DART_FILING_SYNC", "1") != "0"
+# corp_code 없이 조회하면 DART가 검색 기간을 3개월로 제한함
+MARKET_MAX_DAYS = 90
+PAGE_COUNT = 100
+PERIODIC = "A"  # 정기공시
+
+# '[기재정정]사업보고서 (2023.12)' -> ('사업', '2023', '12')
+REPORT_NAME_RE = re.compile(r"(사업|반기|분기)보고서\s*\((\d{4})\.(\d{2})\)")
+QUARTER_REPORT_CODES = {"03": "11013", "09": "11014"}
+
+
+def parse_report_name(report_nm):
+    """
+    정기보고서명 -> (사업연도, reprt_code). 정기보고서가 아니면 None.
+    결산월이 12월이 아닌 기업의 분기보고서처럼 분기를 특정할 수 없으면 reprt_code는 None(그 연도 전체)입니다.
+    """
+    m = REPORT_NAME_RE.search(report_nm or "")
+    if not m:
+        return None
+    kind, year, month = m.groups()
+    if kind == "사업":
+        return year, "11011"
+    if kind == "반기":
+        return year, "11012"
+    return year, QUARTER_REPORT_CODES.get(month)
+
+
+class FilingSync:
+    """워터마크 이후의 신규 정기공시를 찾아 관련 캐시를 무효화/갱신합니다."""
+
+    def __init__(self, state_path=SYNC_STATE_PATH, store=warehouse, lookback_days=FILING_SYNC_LOOKBACK_DAYS):
+        self.state_path = state_path
+        self.store = store
+        self.lookback_days = lookback_days
+        self._lock = threading.Lock()
+        self._last_report = None
+
+    # ---- 워터마크 ----
+    def _read_state(self):
+        if not os.path.exists(self.state_path):
+            return {"market": None, "corps": {}}
+        with open(self.state_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_state(self, state):
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp = f"{self.state_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=1)
+        os.replace(tmp, self.state_path)
+
+    def watermark(self, corp_code=None):
+        """시장 전체(corp_code=None) 또는 기업별 워터마크 {rcept_dt, rcept_no} (없으면 None)"""
+        state = self._read_state()
+        return state["market"] if corp_code is None else state["corps"].get(str(corp_code))
+
+    def _window(self, mark, today, max_days=None):
+        """조회 기간 (워터마크 접수일 포함 ~ 오늘). 같은 날 늦게 접수된 공시를 놓치지 않도록 접수일부터 다시 봅니다."""
+        if mark:
+            bgn = datetime.datetime.strptime(mark["rcept_dt"], "%Y%m%d").date()
+        else:
+            bgn = today - datetime.timedelta(days=self.lookback_days)
+        if max_days is not None:
+            bgn = max(bgn, today - datetime.timedelta(days=max_days))
+        return f"{bgn:%Y%m%d}", f"{today:%Y%m%d}"
+
+    # ---- 공시목록 ----
+    def fetch_new(self, corp_code=None, mark=None, today=None):
+        """
+        워터마크 이후 접수된 정기공시 목록과 조회한 페이지 수를 반환합니다. (오래된 공시만 남은 페이지에서 중단)
+        DART 오류(한도 초과 등)면 RuntimeError를 발생시켜 워터마크가 앞으로 가지 않게 합니다.
+        """
+        today = today or datetime.date.today()
+        bgn_de, end_de = self._window(mark, today, None if corp_code else MARKET_MAX_DAYS)
+        last_no = mark["rcept_no"] if mark else ""
+        dart = dart_cache.get_dart_api()
+        filings, page_no, total_page, pages = [], 1, 1, 0
+        while page_no <= total_page:
+            pages += 1
+            data = scheduler.call("dart", dart.get_notice_list, corp_code, bgn_de, end_de,
+                                  page_no=page_no, page_count=PAGE_COUNT, pblntf_ty=PERIODIC, priority=BATCH)
+            status = data.get("status") if isinstance(data, dict) else None
+            if status == "013":
+                break
+            if status != "000":
+                raise RuntimeError(f"공시목록 조회 실패: {data.get('message') if isinstance(data, dict) else data}")
+            rows = data.get("list", [])
+            new = [r for r in rows if r.get("rcept_no", "") > last_no]
+            filings.extend(new)
+            if len(new) < len(rows):  # 접수번호 내림차순이므로 이후 페이지는 모두 처리한 공시
+                break
+            total_page = int(data.get("total_page") or 1)
+            page_no += 1
+        return filings, pages
+
+    # ---- 캐시 무효화 ----
+    def apply(self, filings, refresh=True):
+        """
+        신규 공시 -> 영향받는 (기업, 연도, 보고서)의 dart_cache 항목 무효화(+캐시에 있던 것은 재조회)와
+        웨어하우스 작업 stale 표시. 처리 결과 집계를 반환합니다.
+        """
+        result = {"affected": [], "invalidated": 0, "refreshed": 0, "stale_tasks": 0, "skipped": 0}
+        targets = {}
+        for filing in filings:
+            parsed = parse_report_name(filing.get("report_nm"))
+            if parsed is None or not filing.get("corp_code"):
+                result["skipped"] += 1
+                continue
+            targets[(filing["corp_code"], *parsed)] = filing
+        for corp_code, year, reprt_code in targets:
+            codes = [reprt_code] if reprt_code else REPORT_CODES
+            cached = [(r, fs) for r in codes for fs in FS_DIVS if dart_cache.is_statement_cached(corp_code, year, r, fs)]
+            result["invalidated"] += dart_cache.invalidate_statements(corp_code, year, reprt_code)
+            # 이 재무제표로 만든 에이전트 툴 결과도 함께 제거 (툴 캐시는 (corp_code, 연도) 단위)
+            result["invalidated"] += invalidate_tool_cache_tags([(corp_code, str(year))])
+            result["affected"].append(f"{corp_code}|{year}|{reprt_code or '*'}")
+            if refresh:
+                # 사용자가 보던 데이터만 다시 채움 (프리페치 우선순위: 사용자 요청에 양보)
+                for r, fs in cached:
+                    fs_data = dart_cache.get_statements(corp_code, year, reprt_code=r, fs_div=fs, priority=PREFETCH)
+                    if isinstance(fs_data, dict) and fs_data.get("status") == "000":
+                        result["refreshed"] += 1
+        # 웨어하우스 체크포인트는 대상 전체를 모아 한 번만 갱신
+        result["stale_tasks"] = self.store.mark_stale_many(targets)
+        return result
+
+    # ---- 동기화 ----
+    def _sync(self, corp_code, refresh, today):
+        with self._lock:
+            mark = self.watermark(corp_code)
+            started = time.perf_counter()
+            filings, pages = self.fetch_new(corp_code, mark, today)
+            report = {
+                "scope": corp_code or "market",
+                "since": mark,
+                "pages": pages,
+                "new_filings": len(filings),
+            }
+            report.update(self.apply(filings, refresh=refresh))
+            if filings:
+                newest = max(filings, key=lambda r: r["rcept_no"])
+                state = self._read_state()
+                new_mark = {"rcept_dt": newest["rcept_dt"], "rcept_no": newest["rcept_no"]}
+                if corp_code is None:
+                    state["market"] = new_mark
+                else:
+                    state["corps"][str(corp_code)] = new_mark
+                self._write_state(state)
+            report["duration_s"] = round(time.perf_counter() - started, 2)
+            self._last_report = report
+            return report
+
+    def sync_market(self, refresh=True, today=None):
+        """시장 전체 정기공시를 워터마크 이후부터 동기화합니다."""
+        return self._sync(None, refresh, today)
+
+    def sync_company(self, corp_code, refresh=True, today=None):
+        """한 기업의 정기공시를 기업별 워터마크 이후부터 동기화합니다."""
+        return self._sync(str(corp_code), refresh, today)
+
+    def last_report(self):
+        return self._last_report
+
+    def status(self):
+        state = self._read_state()
+        return {"market": state["market"], "corps": len(state["corps"]), "last_report": self._last_report}
+
+
+# 프로세스 전체에서 공유하는 동기화 객체
+filing_sync = FilingSync()
+
+_background_started = False
+_background_lock = threading.Lock()
+
+
+def start_background_sync(interval=FILING_SYNC_INTERVAL):
+    """
+    시장 전체 공시 동기화를 백그라운드 스레드에서 interval(초)마다 실행합니다.
+    프로세스당 한 번만 시작되므로 Streamlit rerun마다 호출해도 안전합니다.
+    """
+    global _background_started
+    if not FILING_SYNC_ENABLED or not interval:
+        return False
+    with _background_lock:
+        if _background_started:
+            return False
+        _background_started = True
+
+    def loop():
+        while True:
+            try:
+                report = filing_sync.sync_market()
+                if report["new_filings"]:
+                    print(f"[LOG] [filing_sync] 신규 공시 {report['new_filings']}건, "
+                          f"캐시 무효화 {report['invalidated']}건, 재조회 {report['refreshed']}건")
+            except Exception as e:
+                print(f"[ERROR] filing_sync: {e}")
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="filing-sync", daemon=True).start()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DART 신규 정기공시 증분 동기화")
+    parser.add_argument("--corp", help="한 기업의 corp_code (생략하면 시장 전체)")
+    parser.add_argument("--no-refresh", action="store_true", help="무효화만 하고 다시 받지 않음")
+    parser.add_argument("--status", action="store_true")
+    args = parser.parse_args(argv)
+    if args.status:
+        print(json.dumps(filing_sync.status(), ensure_ascii=False, indent=2))
+        return
+    if args.corp:
+        report = filing_sync.sync_company(args.corp, refresh=not args.no_refresh)
+    else:
+        report = filing_sync.sync_market(refresh=not args.no_refresh)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
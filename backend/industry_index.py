@@ -0,0 +1,315 @@
+"""
+업종 색인과 경쟁사(동종 업계) 그룹.
+
+상장사 전체의 기업개황(company.json)을 한 번 수집해 DART 업종코드(induty_code, 한국표준산업분류 KSIC)를 모아 두고,
+- 업종코드 앞자리 -> 페이지 3 산업 카테고리(반도체, 2차전지, ...) 매핑
+- 같은 업종(KSIC 3자리, 부족하면 2자리) 기업을 웨어하우스 매출액(없으면 자산총계) 순으로 정렬한 경쟁사 그룹
+을 .cache/industry/index.json으로 만들어 둡니다. 조회는 메모리의 dict 조회뿐이라 LLM/DART 호출이 없습니다.
+
+- 수집은 request_scheduler의 batch 우선순위로 보내 사용자 요청을 막지 않고, companies.json에 기업별 결과를 기록하므로
+  중단 후 다시 실행하면 끝난 기업은 건너뜁니다. max_requests나 DART 한도 초과 응답(020)을 만나면 기록을 남기고 멈춥니다.
+- 업종코드는 잘 바뀌지 않으므로 INDUSTRY_REFRESH_DAYS가 지난 기업만 다시 조회합니다.
+
+예시:
+    python -m backend.industry_index fetch --max-requests 3000   # 수집 후 색인 생성
+    python -m backend.industry_index build                       # 웨어하우스 갱신 후 순위만 다시 계산
+    python -m backend.industry_index status
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+
+from backend import dart_cache
+from backend.company_catalog import COMPANY_TO_INDUSTRY, DEFAULT_YEARS
+from backend.entity_memory import mention_key
+from backend.request_scheduler import scheduler, BATCH
+from backend.screening import screener
+from backend.warehouse import QuotaExceeded, listed_companies
+
+INDUSTRY_DIR = os.getenv("INDUSTRY_INDEX_DIR", os.path.join(".cache", "industry"))
+INDUSTRY_WORKERS = int(os.getenv("INDUSTRY_FETCH_WORKERS", "4"))
+INDUSTRY_REFRESH = int(os.getenv("INDUSTRY_REFRESH_DAYS", "90")) * 24 * 60 * 60
+# 3자리 업종 그룹의 기업 수가 이보다 적으면 2자리 그룹까지 넓혀 경쟁사를 채움
+MIN_PEER_GROUP = 4
+DEFAULT_CATEGORY = "기타"
+
+# KSIC 업종코드 앞자리 -> 페이지 3 산업 카테고리 (가장 긴 앞자리가 우선)
+KSIC_CATEGORIES = {
+    "261": "반도체",        # 반도체 제조업
+    "282": "2차전지",       # 일차전지 및 축전지 제조업 (28202 축전지)
+    "301": "자동차",        # 자동차용 엔진 및 자동차 제조업
+    "302": "자동차",        # 자동차 차체 및 트레일러 제조업
+    "303": "자동차",        # 자동차 부품 제조업
+    "5821": "게임",         # 게임 소프트웨어 개발 및 공급업
+    "21": "바이오",         # 의료용 물질 및 의약품 제조업
+    "7011": "바이오",       # 자연과학 연구개발업 (생명과학 연구 포함)
+    "262": "IT",           # 전자부품 제조업
+    "263": "IT",           # 컴퓨터 및 주변장치 제조업
+    "264": "IT",           # 통신 및 방송 장비 제조업
+    "582": "IT",           # 소프트웨어 개발 및 공급업
+    "612": "IT",           # 전기 통신업
+    "62": "IT",            # 컴퓨터 프로그래밍, 시스템 통합 및 관리업
+    "63": "IT",            # 정보서비스업 (포털 등)
+    "64": "금융",           # 금융업
+    "65": "금융",           # 보험 및 연금업
+    "66": "금융",           # 금융 및 보험 관련 서비스업
+    "46": "유통",           # 도매 및 상품 중개업
+    "47": "유통",           # 소매업
+    "311": "조선",          # 선박 및 보트 건조업
+    "313": "항공",          # 항공기, 우주선 및 부품 제조업
+    "51": "항공",           # 항공 운송업
+}
+_MAX_PREFIX = max(len(p) for p in KSIC_CATEGORIES)
+
+
+def category_for_code(induty_code):
+    """업종코드 -> 산업 카테고리 (앞자리가 긴 것부터 찾고, 없으면 '기타')"""
+    code = str(induty_code or "").strip()
+    for n in range(min(len(code), _MAX_PREFIX), 1, -1):
+        category = KSIC_CATEGORIES.get(code[:n])
+        if category:
+            return category
+    return DEFAULT_CATEGORY
+
+
+def _size_table():
+    """웨어하우스의 가장 최근 사업연도 기준 기업 규모 (corp_code -> 매출액, 없으면 자산총계). 데이터가 없으면 빈 Series"""
+    for year in DEFAULT_YEARS:
+        universe = screener.universe(year)
+        if not universe.empty:
+            size = universe["매출액"].fillna(universe["자산총계"]) if "자산총계" in universe else universe["매출액"]
+            return year, size.dropna()
+    return None, pd.Series(dtype=float)
+
+
+class IndustryIndex:
+    """기업개황 수집(fetch) -> 색인 생성(build) -> 조회(category_for, peers)"""
+
+    def __init__(self, root=INDUSTRY_DIR):
+        self.root = root
+        self.companies_path = os.path.join(root, "companies.json")
+        self.index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._index = None
+        self._index_mtime = None
+
+    # --- 수집 ---
+    def _read_companies(self):
+        if not os.path.exists(self.companies_path):
+            return {}
+        with open(self.companies_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_json(self, path, data):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp, path)
+
+    @staticmethod
+    def _needs_fetch(entry, now):
+        if entry is None or entry.get("status") not in ("000", "013"):
+            return True
+        return now - entry.get("at", 0) > INDUSTRY_REFRESH
+
+    def fetch(self, corp_codes=None, max_workers=INDUSTRY_WORKERS, max_requests=None, flush_every=200,
+              progress=None):
+        """
+        상장사(또는 corp_codes) 중 아직 조회하지 않았거나 오래된 기업의 company.json을 동시에 조회해 기록합니다.
+        수집 결과 리포트(dict)를 반환합니다.
+        """
+        companies = listed_companies()
+        if corp_codes is not None:
+            companies = companies[companies["corp_code"].isin([str(c) for c in corp_codes])]
+        known = self._read_companies()
+        now = time.time()
+        tasks = [row for row in companies.itertuples(index=False)
+                 if self._needs_fetch(known.get(row.corp_code), now)]
+        if max_requests is not None:
+            tasks = tasks[:max_requests]
+        report = {"planned": len(tasks), "fetched": 0, "no_data": 0, "failed": 0, "stopped": None}
+        dart = dart_cache.get_dart_api()
+        done = {}
+        started = time.perf_counter()
+
+        def work(row):
+            info = scheduler.call("dart", dart.get_company_info, row.corp_code, priority=BATCH)
+            status = info.get("status") if isinstance(info, dict) else None
+            if status == "020":
+                raise QuotaExceeded(info.get("message", "DART 요청 한도 초과"))
+            return row, status, info
+
+        def flush():
+            with self._lock:
+                merged = self._read_companies()
+                merged.update(done)
+                self._write_json(self.companies_path, merged)
+            done.clear()
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [pool.submit(work, row) for row in tasks]
+        try:
+            for i, future in enumerate(as_completed(futures), start=1):
+                if future.cancelled():
+                    continue
+                try:
+                    row, status, info = future.result()
+                except QuotaExceeded as e:
+                    report["stopped"] = str(e)
+                    for f in futures:
+                        f.cancel()
+                    continue
+                except Exception as e:
+                    report["failed"] += 1
+                    print(f"[ERROR] industry fetch: {e}")
+                    continue
+                entry = {"status": status, "corp_name": row.corp_name, "stock_code": row.stock_code, "at": time.time()}
+                if status == "000":
+                    entry.update(induty_code=str(info.get("induty_code") or ""), corp_cls=info.get("corp_cls", ""))
+                    report["fetched"] += 1
+                else:
+                    report["no_data" if status == "013" else "failed"] += 1
+                done[row.corp_code] = entry
+                if len(done) >= flush_every:
+                    flush()
+                if progress:
+                    progress(i, len(tasks))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if done:
+                flush()
+        report["duration_s"] = round(time.perf_counter() - started, 2)
+        print(f"[LOG] [industry] {report}")
+        return report
+
+    # --- 색인 ---
+    def build(self):
+        """
+        companies.json + 웨어하우스 규모 -> index.json.
+        groups: 업종코드 앞 2/3자리 -> 규모 내림차순 corp_code 목록 (규모를 모르는 기업은 뒤에 이름순)
+        """
+        known = {code: e for code, e in self._read_companies().items()
+                 if e.get("status") == "000" and e.get("induty_code")}
+        size_year, size = _size_table()
+        order = sorted(known, key=lambda c: (c not in size.index, -size.get(c, 0.0), known[c]["corp_name"]))
+        groups = {}
+        for code in order:
+            induty = known[code]["induty_code"]
+            for n in (2, 3):
+                if len(induty) >= n:
+                    groups.setdefault(induty[:n], []).append(code)
+        index = {
+            "built_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "size_year": size_year,
+            "companies": {
+                code: {"corp_name": e["corp_name"], "stock_code": e.get("stock_code", ""),
+                       "induty_code": e["induty_code"], "category": category_for_code(e["induty_code"])}
+                for code, e in known.items()
+            },
+            "by_name": {mention_key(e["corp_name"]): code for code, e in known.items()},
+            "groups": groups,
+        }
+        with self._lock:
+            self._write_json(self.index_path, index)
+        print(f"[LOG] [industry] 색인 생성: {len(known)}개 기업, {len(groups)}개 업종 그룹 (규모 기준 {size_year})")
+        return index
+
+    def _loaded(self):
+        """index.json (파일이 바뀌었으면 다시 읽음, 없으면 빈 색인)"""
+        try:
+            mtime = os.stat(self.index_path).st_mtime_ns
+        except FileNotFoundError:
+            return {"companies": {}, "by_name": {}, "groups": {}}
+        if self._index is None or mtime != self._index_mtime:
+            with open(self.index_path, encoding="utf-8") as f:
+                self._index = json.load(f)
+            self._index_mtime = mtime
+        return self._index
+
+    # --- 조회 ---
+    def company(self, corp_name=None, corp_code=None):
+        """기업명(정확히 일치, 공백/법인 표기 무시) 또는 corp_code -> (corp_code, 색인 항목). 없으면 (None, None)"""
+        index = self._loaded()
+        if corp_code is None and corp_name:
+            corp_code = index["by_name"].get(mention_key(corp_name))
+        entry = index["companies"].get(str(corp_code)) if corp_code else None
+        return (str(corp_code), entry) if entry else (None, None)
+
+    def category_for(self, corp_name=None, corp_code=None):
+        """
+        기업 -> 페이지 3 산업 카테고리. 대표 기업 사전(COMPANY_TO_INDUSTRY)을 우선하고,
+        색인에 없거나 카테고리에 매핑되지 않은 업종('기타')이면 None (호출하는 쪽에서 다른 방법으로 추정)
+        """
+        if corp_name:
+            for name, category in COMPANY_TO_INDUSTRY.items():
+                if mention_key(name) == mention_key(corp_name):
+                    return category
+        _, entry = self.company(corp_name, corp_code)
+        if not entry or entry["category"] == DEFAULT_CATEGORY:
+            return None
+        return entry["category"]
+
+    def peers(self, corp_name=None, corp_code=None, limit=5):
+        """
+        같은 업종(KSIC 3자리, 부족하면 2자리) 기업명을 규모 순으로 최대 limit개 (자기 자신 제외).
+        색인에 없는 기업이면 빈 리스트.
+        """
+        code, entry = self.company(corp_name, corp_code)
+        if not entry:
+            return []
+        index = self._loaded()
+        induty = entry["induty_code"]
+        candidates = list(index["groups"].get(induty[:3], []))
+        if len(candidates) < MIN_PEER_GROUP:
+            candidates += index["groups"].get(induty[:2], [])
+        peers = [c for c in dict.fromkeys(candidates) if c != code][:limit]
+        return [index["companies"][c]["corp_name"] for c in peers]
+
+    def status(self):
+        known = self._read_companies()
+        counts = {}
+        for entry in known.values():
+            counts[entry.get("status")] = counts.get(entry.get("status"), 0) + 1
+        index = self._loaded()
+        return {"root": self.root, "companies": counts, "indexed": len(index["companies"]),
+                "groups": len(index["groups"]), "built_at": index.get("built_at"), "size_year": index.get("size_year")}
+
+
+# 프로세스 전체에서 공유하는 업종 색인
+industry_index = IndustryIndex()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="DART 업종코드 기반 업종 색인/경쟁사 그룹")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_fetch = sub.add_parser("fetch", help="상장사 기업개황 수집 후 색인 생성 (중단 후 재실행 시 이어서 수집)")
+    p_fetch.add_argument("--corp-codes", nargs="*")
+    p_fetch.add_argument("--workers", type=int, default=INDUSTRY_WORKERS)
+    p_fetch.add_argument("--max-requests", type=int)
+    sub.add_parser("build", help="수집된 기업개황과 웨어하우스 규모로 색인만 다시 생성")
+    sub.add_parser("status", help="수집/색인 현황")
+    args = parser.parse_args(argv)
+
+    if args.command == "fetch":
+        def progress(i, total):
+            if i % 100 == 0 or i == total:
+                print(f"[LOG] [industry] {i}/{total}")
+        result = industry_index.fetch(args.corp_codes, max_workers=args.workers, max_requests=args.max_requests,
+                                      progress=progress)
+        industry_index.build()
+    elif args.command == "build":
+        industry_index.build()
+        result = industry_index.status()
+    else:
+        result = industry_index.status()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
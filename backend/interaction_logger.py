@@ -0,0 +1,122 @@
+import atexit
+import datetime
+import json
+import os
+import queue
+import threading
+import time
+
+# 로그 내구성 모드
+# - "none": 배치 단위로 write만 수행 (OS 버퍼에 맡김)
+# - "flush": 배치마다 flush (기본값)
+# - "fsync": 배치마다 flush + os.fsync (가장 안전, 가장 느림)
+DURABILITY_MODES = ("none", "flush", "fsync")
+
+
+def elapsed_ms(started_at):
+    """time.perf_counter() 기준 시작 시각으로부터 경과 시간(ms)"""
+    return round((time.perf_counter() - started_at) * 1000, 1)
+
+
+class InteractionLogger:
+    """
+    페이지별 사용자 상호작용 로그를 백그라운드 스레드에서 배치로 기록하는 구조화 로거.
+    - 요청 경로에서는 큐에 넣기만 하므로 파일 I/O/fsync 대기가 없습니다.
+    - 스트림(page1_qa, page2_search 등)마다 logs/<stream>.jsonl 파일에 한 줄씩 JSON으로 기록합니다.
+    - 파일이 max_bytes를 넘으면 <stream>.jsonl.1, .2 ... 로 회전합니다.
+    """
+
+    def __init__(self, log_dir="logs", durability="flush", batch_size=64, flush_interval=1.0,
+                 max_bytes=10 * 1024 * 1024, backup_count=5, max_queue=10000):
+        if durability not in DURABILITY_MODES:  # 로그 설정 오류로 페이지가 뜨지 않는 일이 없도록 기본값으로 계속
+            print(f"[ERROR] interaction_logger: durability는 {DURABILITY_MODES} 중 하나여야 합니다. "
+                  f"(입력값: {durability}, 'flush'로 기록합니다)")
+            durability = "flush"
+        self.log_dir = log_dir
+        self.durability = durability
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._queue = queue.Queue(maxsize=max_queue)
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="interaction-logger", daemon=True)
+        self._thread.start()
+
+    def log(self, stream, **fields):
+        """로그 레코드를 큐에 넣고 즉시 반환합니다. 큐가 가득 차면 레코드를 버리고 개수만 셉니다."""
+        record = {"ts": datetime.datetime.now().isoformat(timespec="milliseconds"), "stream": stream}
+        record.update(fields)
+        try:
+            self._queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _path(self, stream):
+        return os.path.join(self.log_dir, f"{stream}.jsonl")
+
+    def _rotate_if_needed(self, path):
+        if not self.max_bytes or not os.path.exists(path) or os.path.getsize(path) < self.max_bytes:
+            return
+        for i in range(self.backup_count - 1, 0, -1):
+            src, dst = f"{path}.{i}", f"{path}.{i + 1}"
+            if os.path.exists(src):
+                os.replace(src, dst)
+        os.replace(path, f"{path}.1")
+
+    def _write_batch(self, batch):
+        by_stream = {}
+        for record in batch:
+            by_stream.setdefault(record["stream"], []).append(record)
+        os.makedirs(self.log_dir, exist_ok=True)
+        for stream, records in by_stream.items():
+            path = self._path(stream)
+            try:
+                self._rotate_if_needed(path)
+                with open(path, "a", encoding="utf-8") as f:
+                    f.write("".join(json.dumps(r, ensure_ascii=False, default=str) + "\n" for r in records))
+                    if self.durability in ("flush", "fsync"):
+                        f.flush()
+                    if self.durability == "fsync":
+                        os.fsync(f.fileno())
+            except Exception as e:
+                print(f"[ERROR] interaction log write ({stream}): {e}")
+
+    def _drain(self, block):
+        batch = []
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_size:
+            timeout = deadline - time.monotonic()
+            try:
+                if block and timeout > 0:
+                    batch.append(self._queue.get(timeout=timeout))
+                else:
+                    batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while not self._stop.is_set():
+            batch = self._drain(block=True)
+            if batch:
+                self._write_batch(batch)
+        # 종료 시 남은 레코드 모두 기록
+        while True:
+            batch = self._drain(block=False)
+            if not batch:
+                break
+            self._write_batch(batch)
+
+    def close(self, timeout=5.0):
+        self._stop.set()
+        self._thread.join(timeout=timeout)
+
+
+# 프로세스 전체에서 공유하는 로거 (Streamlit rerun마다 새로 만들지 않도록 모듈 레벨에 둠)
+interaction_logger = InteractionLogger(
+    log_dir=os.getenv("INTERACTION_LOG_DIR", "logs"),
+    durability=os.getenv("INTERACTION_LOG_DURABILITY", "flush"),
+)
+atexit.register(interaction_logger.close)
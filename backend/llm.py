@@ -0,0 +1,22 @@
+from backend.settings import offline_mode, fake_latency_ms
+from backend.request_scheduler import scheduler, INTERACTIVE
+
+
+def get_chat_model(model="gpt-4o", temperature=0):
+    """
+    앱 전체에서 사용하는 채팅 모델 생성 함수.
+    오프라인 모드(LANGCHAIN_DART_OFFLINE=1)에서는 결정적 가짜 모델을 반환합니다.
+    """
+    if offline_mode():
+        from fake_services.chat_model import FakeChatModel
+        return FakeChatModel(latency_ms=fake_latency_ms("openai"))
+    from langchain_openai import ChatOpenAI
+    return ChatOpenAI(model=model, temperature=temperature)
+
+
+def invoke_llm(llm, prompt, priority=INTERACTIVE, deadline=None):
+    """
+    llm.invoke(prompt)를 공유 요청 스케줄러('llm' 서비스)를 거쳐 호출합니다.
+    사용자 질문은 interactive, 미리 만들어 두는 요약 등은 prefetch/batch로 호출합니다.
+    """
+    return scheduler.call("llm", llm.invoke, prompt, priority=priority, deadline=deadline)
@@ -0,0 +1,232 @@
+"""
+페이지 3 산업별 시장 요약 저장소.
+
+산업마다 웹 검색('{산업} 산업 시장 동향') + LLM 요약을 미리 만들어 JSON 파일에 생성 시각과 함께 저장해 두고,
+페이지에서는 저장된 요약을 바로 보여 줍니다.
+
+백그라운드 갱신(start_background_refresh, MARKET_SUMMARY_SYNC=1일 때만)은 interval마다 MARKET_INDUSTRIES를 다시 검색하지만,
+검색 결과(제목/요약/링크)의 해시가 저장된 값과 같으면 LLM 요약을 건너뛰고 확인 시각만 기록합니다.
+저장소에 없는 산업(기업명 검색에서 LLM이 추정한 산업명 등)은 처음 요청할 때 만들어 저장합니다.
+
+예시:
+    python -m backend.market_summary refresh                  # 결과가 바뀐 산업만 다시 요약
+    python -m backend.market_summary refresh --industries 반도체 --force
+    python -m backend.market_summary status
+"""
+import argparse
+import hashlib
+import json
+import os
+import threading
+import time
+
+from backend.company_catalog import MARKET_INDUSTRIES
+from backend.llm import get_chat_model, invoke_llm
+from backend.request_scheduler import BATCH, INTERACTIVE
+from backend.web_search import web_search
+
+MARKET_SUMMARY_PATH = os.getenv("MARKET_SUMMARY_PATH", os.path.join(".cache", "market_summaries.json"))
+# 반복 주기(초)와 활성화 스위치. 갱신마다 산업 수만큼 SerpAPI를 쓰므로 MARKET_SUMMARY_SYNC=1일 때만 백그라운드 갱신
+# (기본은 CLI refresh를 cron 등으로 실행하고, 앱은 저장된 요약을 읽기만 함)
+MARKET_SUMMARY_INTERVAL = int(os.getenv("MARKET_SUMMARY_INTERVAL", 24 * 60 * 60))
+MARKET_SUMMARY_ENABLED = os.getenv("MARKET_SUMMARY_SYNC", "0") == "1"
+MARKET_SEARCH_RESULTS = 5
+# 요약 프롬프트를 바꾸면 올려서 검색 결과가 같아도 다시 요약되게 함
+SUMMARY_VERSION = 1
+
+_background_started = False
+_background_lock = threading.Lock()
+
+
+def search_query(industry_name):
+    return f"{industry_name} 산업 시장 동향"
+
+
+def results_digest(web_results):
+    """검색 결과 -> 해시 (순서와 앞뒤 공백 차이는 무시, 프롬프트 버전 포함)"""
+    items = sorted(
+        (str(r.get("link") or "").strip(), str(r.get("title") or "").strip(), str(r.get("snippet") or "").strip())
+        for r in web_results or []
+    )
+    payload = json.dumps([SUMMARY_VERSION, items], ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def summarize_market(industry_name, web_results=None, priority=INTERACTIVE):
+    """웹 검색 결과를 참고한 산업 요약 (시장 개념/규모/Value Chain/Key Players/이슈). 실패하면 '[요약 실패] ...'"""
+    web_context = ""
+    if web_results:
+        web_context = "\n\n[웹 검색 결과]\n" + "\n".join([
+            f"- {item['title']}\n  {item['snippet']}\n  {item['link']}" for item in web_results if item.get('title')
+        ])
+    prompt = f"""
+    '{industry_name}' 산업(시장)에 대해 아래 항목별로 한국어로 간결하게 요약해줘.{web_context}
+
+    1. 시장 개념
+    2. 국내 산업 규모 및 현황
+    3. Value Chain
+    4. Key Players
+    5. 산업 이슈
+    각 항목별로 소제목과 내용을 구분해서 5줄 이내로 요약해줘.
+    """
+    try:
+        result = invoke_llm(get_chat_model(), prompt, priority=priority)
+        return result.content.strip()
+    except Exception as e:
+        return f"[요약 실패] {e}"
+
+
+class MarketSummaryStore:
+    """
+    산업명 -> {summary, web_results, digest, updated_at(요약 생성), checked_at(검색 확인)}.
+    파일 전체를 메모리에 두고, 바뀔 때마다 임시 파일에 쓴 뒤 교체합니다.
+    """
+
+    def __init__(self, path=MARKET_SUMMARY_PATH):
+        self.path = path
+        self._lock = threading.Lock()
+        self._industry_locks = {}  # 같은 산업을 페이지와 백그라운드가 동시에 요약하지 않도록
+        self._entries = self._read()
+
+    def _read(self):
+        if not os.path.exists(self.path):
+            return {}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            print(f"[ERROR] market_summary 파일 읽기 실패: {e}")
+            return {}
+
+    def _write(self):
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self._entries, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, self.path)
+
+    def _industry_lock(self, industry_name):
+        with self._lock:
+            return self._industry_locks.setdefault(industry_name, threading.Lock())
+
+    def get(self, industry_name):
+        """저장된 요약 항목 (없으면 None)"""
+        with self._lock:
+            entry = self._entries.get(industry_name)
+            return dict(entry) if entry else None
+
+    def refresh(self, industry_name, force=False, priority=BATCH):
+        """
+        다시 검색해 결과가 바뀌었을 때(또는 force)만 LLM으로 요약합니다.
+        (항목, 상태) 반환. 상태: 'updated' | 'unchanged' | 'failed' (실패하면 기존 요약을 유지, 없으면 항목은 None)
+        검색 결과가 비어 있으면(SerpAPI 오류/한도 초과) 실패로 보고 요약하지 않습니다.
+        """
+        with self._industry_lock(industry_name):
+            web_results = web_search(search_query(industry_name), num_results=MARKET_SEARCH_RESULTS)
+            digest = results_digest(web_results)
+            now = time.strftime("%Y-%m-%d %H:%M:%S")
+            with self._lock:
+                entry = self._entries.get(industry_name)
+                if not web_results:
+                    print(f"[ERROR] market_summary {industry_name}: 웹 검색 결과 없음")
+                    return (dict(entry) if entry else None), "failed"
+                if entry and entry["digest"] == digest and not force:
+                    entry["checked_at"] = now
+                    self._write()
+                    return dict(entry), "unchanged"
+            summary = summarize_market(industry_name, web_results, priority=priority)
+            if summary.startswith("[요약 실패]"):
+                print(f"[ERROR] market_summary {industry_name}: {summary}")
+                return (dict(entry) if entry else None), "failed"
+            with self._lock:
+                entry = self._entries[industry_name] = {
+                    "summary": summary, "web_results": web_results, "digest": digest,
+                    "updated_at": now, "checked_at": now,
+                }
+                self._write()
+                return dict(entry), "updated"
+
+    def get_or_create(self, industry_name):
+        """
+        저장된 요약을 바로 반환하고, 없으면 지금(사용자 요청 우선순위로) 만들어 저장합니다.
+        웹 검색/요약에 실패하면 검색 결과 없이 만든 요약을 저장하지 않고 반환합니다.
+        """
+        entry = self.get(industry_name)
+        if entry is None:
+            with self._industry_lock(industry_name):
+                entry = self.get(industry_name)  # 기다리는 동안 백그라운드에서 만들었을 수 있음
+            if entry is None:
+                entry, _ = self.refresh(industry_name, priority=INTERACTIVE)
+            if entry is None:
+                entry = {"summary": summarize_market(industry_name), "web_results": []}
+        return entry
+
+    def refresh_all(self, industries=None, force=False):
+        """산업별 refresh 결과 리포트"""
+        started = time.perf_counter()
+        report = {"updated": [], "unchanged": [], "failed": []}
+        for industry_name in industries or MARKET_INDUSTRIES:
+            try:
+                _, status = self.refresh(industry_name, force=force)
+            except Exception as e:
+                print(f"[ERROR] market_summary {industry_name}: {e}")
+                status = "failed"
+            report[status].append(industry_name)
+        report["duration_s"] = round(time.perf_counter() - started, 2)
+        return report
+
+    def status(self):
+        with self._lock:
+            return {name: {"updated_at": e["updated_at"], "checked_at": e["checked_at"], "digest": e["digest"][:12]}
+                    for name, e in self._entries.items()}
+
+
+market_summaries = MarketSummaryStore()
+
+
+def start_background_refresh(interval=MARKET_SUMMARY_INTERVAL):
+    """
+    MARKET_SUMMARY_SYNC=1이면 MARKET_INDUSTRIES의 시장 요약을 백그라운드 스레드에서 interval(초)마다 갱신합니다.
+    프로세스당 한 번만 시작되므로 Streamlit rerun마다 호출해도 안전합니다.
+    """
+    global _background_started
+    if not MARKET_SUMMARY_ENABLED or not interval:
+        return False
+    with _background_lock:
+        if _background_started:
+            return False
+        _background_started = True
+
+    def loop():
+        while True:
+            try:
+                report = market_summaries.refresh_all()
+                if report["updated"] or report["failed"]:
+                    print(f"[LOG] [market_summary] 갱신 {report['updated']}, 실패 {report['failed']}, "
+                          f"변경 없음 {len(report['unchanged'])}개")
+            except Exception as e:
+                print(f"[ERROR] market_summary: {e}")
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="market-summary", daemon=True).start()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="페이지 3 산업별 시장 요약 미리 생성/갱신")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_refresh = sub.add_parser("refresh", help="검색 결과가 바뀐 산업만 다시 요약")
+    p_refresh.add_argument("--industries", nargs="*", default=MARKET_INDUSTRIES)
+    p_refresh.add_argument("--force", action="store_true", help="검색 결과가 같아도 다시 요약")
+    sub.add_parser("status", help="저장된 요약의 생성/확인 시각")
+    args = parser.parse_args(argv)
+
+    if args.command == "refresh":
+        result = market_summaries.refresh_all(args.industries, force=args.force)
+    else:
+        result = market_summaries.status()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+import hashlib
+import math
+import re
+from collections import Counter
+import numpy as np
+
+from backend.cache_utils import TTLCache
+from backend.embeddings import embed_texts
+
+# 질문에서 자주 나오지만 검색에는 의미 없는 표현
+STOPWORDS = {
+    "알려줘", "알려주세요", "얼마", "얼마야", "얼마인가요", "뭐야", "무엇", "무엇인가요", "어때", "어떻게",
+    "해줘", "해주세요", "설명", "설명해줘", "궁금해", "그리고", "대해", "대한", "관련", "좀", "은", "는",
+    "이", "가", "을", "를", "의", "에", "와", "과", "도",
+}
+
+
+def tokenize(text):
+    """
+    한국어 조사 변화에 강하도록 단어 토큰 + 한글 단어의 2글자 n-gram을 함께 사용합니다.
+    예: '매출액을' -> ['매출액을', '매출', '출액', '액을']
+    """
+    tokens = []
+    for word in re.findall(r"\w+", str(text).lower()):
+        if word in STOPWORDS:
+            continue
+        tokens.append(word)
+        if re.search(r"[가-힣]", word) and len(word) > 2:
+            tokens.extend(word[i:i + 2] for i in range(len(word) - 1))
+    return tokens
+
+
+def split_passages(page_context):
+    """
+    컨텍스트를 줄 단위 passage와 섹션(빈 줄 / 마크다운 제목 기준) 단위 passage로 나눕니다.
+    반환: [(kind, text), ...]  kind는 'line' 또는 'section'
+    """
+    passages = []
+    section = []
+    for raw in str(page_context or "").split("\n"):
+        line = raw.strip()
+        is_heading = bool(re.match(r"^#{1,6}\s|^\d+\.\s", line))
+        if (not line or is_heading) and section:
+            passages.append(("section", "\n".join(section)))
+            section = []
+        if line:
+            passages.append(("line", line))
+            section.append(line)
+    if section:
+        passages.append(("section", "\n".join(section)))
+    # 한 줄짜리 섹션은 line과 중복이므로 제외
+    return [p for p in passages if p[0] == "line" or "\n" in p[1]]
+
+
+class PageContextIndex:
+    """
+    페이지 결과 텍스트(재무 요약, 시장 요약 등)에 대한 경량 검색 인덱스.
+    BM25 점수에 (가능하면) 임베딩 코사인 유사도를 더해 passage 순위를 매깁니다.
+    """
+
+    def __init__(self, page_context, use_embeddings=True, k1=1.5, b=0.75):
+        self.passages = split_passages(page_context)
+        self.k1 = k1
+        self.b = b
+        self._doc_tokens = [Counter(tokenize(text)) for _, text in self.passages]
+        self._doc_len = np.array([sum(c.values()) for c in self._doc_tokens], dtype=np.float32)
+        self._avg_len = float(self._doc_len.mean()) if len(self._doc_len) else 0.0
+        df = Counter()
+        for counts in self._doc_tokens:
+            df.update(counts.keys())
+        n = len(self.passages)
+        self._idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+        self._vectors = None
+        if use_embeddings and self.passages:
+            try:
+                self._vectors = embed_texts([text for _, text in self.passages])
+            except Exception as e:
+                print(f"[ERROR] 페이지 컨텍스트 임베딩 실패: {e}")
+
+    def _bm25(self, query_tokens):
+        scores = np.zeros(len(self.passages), dtype=np.float32)
+        if not query_tokens or not self._avg_len:
+            return scores
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len / self._avg_len)
+        for token in set(query_tokens):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            tf = np.array([c.get(token, 0) for c in self._doc_tokens], dtype=np.float32)
+            scores += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, question, top_k=5):
+        """질문과 관련도가 높은 순서로 [(score, kind, text), ...] 반환"""
+        if not self.passages:
+            return []
+        scores = self._bm25(tokenize(question))
+        if scores.max() > 0:
+            scores = scores / scores.max()
+        if self._vectors is not None and len(self._vectors):
+            q_vec = embed_texts([question])
+            if q_vec is not None:
+                scores = 0.5 * scores + 0.5 * np.clip(self._vectors @ q_vec[0], 0, None)
+        order = np.argsort(-scores)[:top_k]
+        return [(float(scores[i]), self.passages[i][0], self.passages[i][1]) for i in order if scores[i] > 0]
+
+    def coverage(self, question, text):
+        """질문의 검색 토큰 중 passage에 포함된 비율"""
+        q_tokens = set(tokenize(question))
+        if not q_tokens:
+            return 0.0
+        t_tokens = set(tokenize(text))
+        return len(q_tokens & t_tokens) / len(q_tokens)
+
+    def answer(self, question, min_coverage=0.6, min_margin=1.2):
+        """
+        확신도가 높을 때만 한 줄 답변을 반환합니다.
+        - 최상위 line의 질문 토큰 포함률이 min_coverage 이상
+        - 두 번째 line보다 점수가 min_margin배 이상 높음
+        """
+        lines = [r for r in self.search(question, top_k=10) if r[1] == "line"]
+        if not lines:
+            return None
+        best_score, _, best_text = lines[0]
+        if self.coverage(question, best_text) < min_coverage:
+            return None
+        if len(lines) > 1 and best_score < lines[1][0] * min_margin:
+            return None
+        return best_text
+
+
+_index_cache = TTLCache(maxsize=64, ttl=60 * 60)
+
+
+def build_page_context_index(page_context):
+    """컨텍스트 문자열의 해시로 인덱스를 캐시하여, 같은 결과에 대해서는 한 번만 만듭니다."""
+    key = hashlib.sha1(str(page_context or "").encode("utf-8")).hexdigest()
+    index = _index_cache.get(key)
+    if index is None:
+        index = PageContextIndex(page_context)
+        _index_cache.set(key, index)
+    return index
+
+
+def retrieve_page_context(question, page_context, top_k=5):
+    """LLM 프롬프트에 넣을 상위 top_k개 passage 텍스트 (관련 passage가 없으면 원문 그대로)"""
+    results = build_page_context_index(page_context).search(question, top_k=top_k)
+    if not results:
+        return page_context
+    selected = []
+    for _, _, text in results:
+        # 이미 고른 섹션에 포함된 줄은 중복이므로 제외
+        if not any(text in s for s in selected):
+            selected.append(text)
+    return "\n".join(selected)
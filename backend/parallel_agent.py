@@ -0,0 +1,145 @@
+"""
+한 단계의 여러 툴 호출을 동시에 실행하는 에이전트 실행기.
+
+OpenAI multi-functions 에이전트는 '삼성전자와 SK하이닉스 2023 재무제표 비교'처럼 서로 독립적인 툴 호출을
+한 번에 여러 개 요청할 수 있는데, 기본 AgentExecutor는 이를 하나씩 차례로 실행합니다.
+ParallelToolAgentExecutor는 같은 단계의 툴 호출을 그 단계 전용 스레드 풀에서 동시에 실행하고(툴별 제한 시간 적용),
+결과는 요청 순서대로 돌려주므로 여러 기업 질문도 툴 지연 한 번 정도로 끝납니다.
+제한 시간을 넘긴 툴은 멈출 수 없으므로 결과만 버리고 넘어가며, 끝날 때까지 abandoned_tool_calls()에 집계됩니다.
+(실행 중인 스레드가 다른 세션의 툴 실행 자리를 차지하지 않도록 공유 풀을 쓰지 않음)
+툴 호출이 하나든 여럿이든 예외와 시간 초과는 같은 방식으로 '[ERROR] ...' 관찰 결과가 됩니다.
+
+툴 실행 스레드에는 호출 시점의 contextvars를 복사해 넘기므로, 컨텍스트 변수로 전달되는 상태도 그대로 보입니다.
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from typing import Dict, List, Optional
+
+from langchain.agents import AgentExecutor
+from langchain.agents.openai_functions_multi_agent.base import OpenAIMultiFunctionsAgent
+from langchain_core.agents import AgentAction, AgentStep
+from langchain_core.messages import SystemMessage
+from pydantic import PrivateAttr
+
+from backend.request_scheduler import scheduler, INTERACTIVE
+
+AGENT_TOOL_WORKERS = int(os.getenv("AGENT_TOOL_WORKERS", "4"))
+AGENT_TOOL_TIMEOUT = float(os.getenv("AGENT_TOOL_TIMEOUT", "60"))
+# 기본 제한 시간보다 오래 걸릴 수 있는 툴 (PDF 전체 추출/임베딩)
+TOOL_TIMEOUTS = {
+    "search_pdf_tool": 180.0,
+    "extract_pdf_tables_tool": 180.0,
+}
+
+# 제한 시간을 넘겨 결과를 버렸지만 아직 실행 중인 툴 호출 수 (툴 이름 -> 개수)
+_abandoned = {}
+_abandoned_lock = threading.Lock()
+
+
+def _track_abandoned(tool_name, future):
+    with _abandoned_lock:
+        _abandoned[tool_name] = _abandoned.get(tool_name, 0) + 1
+
+    def done(_):
+        with _abandoned_lock:
+            _abandoned[tool_name] -= 1
+            if not _abandoned[tool_name]:
+                del _abandoned[tool_name]
+
+    future.add_done_callback(done)
+
+
+def abandoned_tool_calls():
+    """시간 초과로 결과를 버렸지만 아직 끝나지 않은 툴 호출 수 (툴 이름 -> 개수)"""
+    with _abandoned_lock:
+        return dict(_abandoned)
+
+
+class _PendingToolCall:
+    """기본 실행 루프가 넘긴 툴 호출 인자 (나중에 한꺼번에 실행)"""
+
+    def __init__(self, name_to_tool_map, color_mapping, agent_action, run_manager):
+        self.args = (name_to_tool_map, color_mapping, agent_action, run_manager)
+        self.action = agent_action
+
+
+class ScheduledMultiFunctionsAgent(OpenAIMultiFunctionsAgent):
+    """계획 단계의 LLM 호출을 공유 요청 스케줄러('llm' 서비스, 사용자 요청 우선순위)로 보내는 에이전트"""
+
+    def plan(self, intermediate_steps, callbacks=None, **kwargs):
+        return scheduler.call("llm", super().plan, intermediate_steps, callbacks, priority=INTERACTIVE, **kwargs)
+
+
+class ParallelToolAgentExecutor(AgentExecutor):
+    """같은 단계에서 요청된 툴 호출을 동시에 실행하는 AgentExecutor"""
+
+    tool_timeout: float = AGENT_TOOL_TIMEOUT
+    tool_timeouts: Dict[str, float] = TOOL_TIMEOUTS
+    _deferred: set = PrivateAttr(default_factory=set)
+
+    def _perform_agent_action(self, name_to_tool_map, color_mapping, agent_action, run_manager=None):
+        # _iter_next_step이 표시한 액션은 바로 실행하지 않고 모아 둠
+        if id(agent_action) in self._deferred:
+            self._deferred.discard(id(agent_action))
+            return _PendingToolCall(name_to_tool_map, color_mapping, agent_action, run_manager)
+        return super()._perform_agent_action(name_to_tool_map, color_mapping, agent_action, run_manager)
+
+    def _iter_next_step(self, name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager=None):
+        """
+        기본 구현으로 LLM 계획(파싱 오류 처리 포함)과 액션 알림을 그대로 수행하고,
+        툴 실행만 모아서 _run_concurrently로 동시에 실행합니다.
+        """
+        pending: List[_PendingToolCall] = []
+        for item in super()._iter_next_step(name_to_tool_map, color_mapping, inputs, intermediate_steps, run_manager):
+            if isinstance(item, AgentAction):
+                self._deferred.add(id(item))
+                yield item
+            elif isinstance(item, _PendingToolCall):
+                pending.append(item)
+            else:  # AgentFinish 또는 파싱 오류 처리 결과
+                yield item
+        yield from self._run_concurrently(pending)
+
+    def _timeout_for(self, tool_name):
+        return self.tool_timeouts.get(tool_name, self.tool_timeout)
+
+    def _run_concurrently(self, pending):
+        if not pending:
+            return
+        started = time.monotonic()
+        # 단계마다 새 풀: 시간 초과로 남은 스레드는 이 풀에만 남고 다음 단계/다른 세션의 실행 자리를 막지 않음
+        pool = ThreadPoolExecutor(max_workers=min(AGENT_TOOL_WORKERS, len(pending)), thread_name_prefix="agent-tool")
+        futures = [
+            pool.submit(contextvars.copy_context().run, AgentExecutor._perform_agent_action, self, *call.args)
+            for call in pending
+        ]
+        try:
+            for call, future in zip(pending, futures):
+                timeout = self._timeout_for(call.action.tool)
+                try:
+                    # 제한 시간은 제출 시점부터 계산 (앞의 툴을 기다린 시간도 포함)
+                    yield future.result(timeout=max(0.0, started + timeout - time.monotonic()))
+                except FutureTimeoutError:
+                    if not future.cancel():
+                        _track_abandoned(call.action.tool, future)
+                        print(f"[LOG] [agent] {call.action.tool} 시간 초과 ({timeout:.0f}초), "
+                              f"결과를 버린 실행 중 툴: {abandoned_tool_calls()}")
+                    yield AgentStep(action=call.action,
+                                    observation=f"[ERROR] {call.action.tool} 실행 시간 초과 ({timeout:.0f}초)")
+                except Exception as e:
+                    yield AgentStep(action=call.action, observation=f"[ERROR] {call.action.tool} 실행 실패: {e}")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def create_parallel_agent(tools, llm, system_message: Optional[str] = None, **executor_kwargs):
+    """
+    한 번에 여러 툴을 호출할 수 있는 OpenAI multi-functions 에이전트 + ParallelToolAgentExecutor.
+    executor_kwargs는 AgentExecutor 옵션(verbose, max_iterations, handle_parsing_errors 등)입니다.
+    """
+    agent = ScheduledMultiFunctionsAgent.from_llm_and_tools(
+        llm, tools, system_message=SystemMessage(content=system_message or "You are a helpful AI assistant."))
+    return ParallelToolAgentExecutor.from_agent_and_tools(agent=agent, tools=tools, **executor_kwargs)
@@ -0,0 +1,186 @@
+"""
+PDF 텍스트 추출 + 페이지 단위 캐시.
+
+수백 페이지짜리 사업보고서를 에이전트가 호출할 때마다 처음부터 다시 읽지 않도록,
+파일 내용 해시(sha256)별로 페이지 텍스트를 .cache/pdf_text/<sha>/에 저장해 두고 필요한 페이지만 읽습니다.
+아직 추출하지 않은 페이지가 많으면 페이지 구간을 나눠 프로세스 풀에서 동시에 추출합니다. (PyPDF2는 CPU 작업이라 스레드로는 빨라지지 않음)
+
+    doc = open_pdf("data/사업보고서.pdf")
+    doc.page(0)              # 한 페이지 (캐시에 없으면 그 페이지만 추출)
+    for i, text in doc.iter_pages(range(10, 20)): ...
+    doc.text()               # 전체 텍스트 (없는 페이지는 병렬 추출)
+"""
+import hashlib
+import json
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+
+import PyPDF2
+
+from backend.cache_utils import TTLCache
+
+PDF_TEXT_DIR = os.getenv("PDF_TEXT_CACHE_DIR", os.path.join(".cache", "pdf_text"))
+PDF_WORKERS = int(os.getenv("PDF_EXTRACT_WORKERS", str(min(4, os.cpu_count() or 1))))
+# 이보다 적은 페이지를 추출할 때는 프로세스를 띄우지 않고 현재 프로세스에서 처리
+PARALLEL_MIN_PAGES = 8
+
+# (경로, 수정 시각, 크기) -> PdfDocument. 같은 파일을 다시 열 때 해시 계산을 건너뜁니다.
+_documents = TTLCache(maxsize=64, ttl=24 * 60 * 60)
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _extract_range(path, start, stop):
+    """[start, stop) 페이지의 텍스트 리스트 (프로세스 풀 작업 단위)"""
+    reader = PyPDF2.PdfReader(path)
+    texts = []
+    for i in range(start, stop):
+        try:
+            texts.append(reader.pages[i].extract_text() or "")
+        except Exception as e:  # 깨진 페이지 하나 때문에 전체가 실패하지 않도록
+            print(f"[ERROR] PDF {i + 1}페이지 추출 실패: {e}")
+            texts.append("")
+    return texts
+
+
+def split_page_ranges(pages, parts):
+    """정렬된 페이지 번호 -> 연속 구간 [(start, stop)]을 최대 parts개 정도로 나눔"""
+    runs = []
+    for i in pages:
+        if runs and runs[-1][1] == i:
+            runs[-1][1] = i + 1
+        else:
+            runs.append([i, i + 1])
+    size = max(1, -(-len(pages) // parts))
+    ranges = []
+    for start, stop in runs:
+        for s in range(start, stop, size):
+            ranges.append((s, min(s + size, stop)))
+    return ranges
+
+
+class PdfDocument:
+    """내용 해시로 식별되는 PDF. 페이지 텍스트는 처음 요청될 때 추출되어 디스크에 캐시됩니다."""
+
+    def __init__(self, path, sha=None, cache_dir=PDF_TEXT_DIR):
+        self.path = path
+        self.sha = sha or file_sha256(path)
+        self.dir = os.path.join(cache_dir, self.sha)
+        self._lock = threading.Lock()
+        self._page_count = None
+
+    @property
+    def page_count(self):
+        if self._page_count is None:
+            meta_path = os.path.join(self.dir, "meta.json")
+            if os.path.exists(meta_path):
+                with open(meta_path, encoding="utf-8") as f:
+                    self._page_count = json.load(f)["pages"]
+            else:
+                self._page_count = len(PyPDF2.PdfReader(self.path).pages)
+                os.makedirs(os.path.join(self.dir, "pages"), exist_ok=True)
+                with open(meta_path, "w", encoding="utf-8") as f:
+                    json.dump({"pages": self._page_count, "source": os.path.basename(self.path)}, f, ensure_ascii=False)
+        return self._page_count
+
+    def _page_path(self, i):
+        return os.path.join(self.dir, "pages", f"{i:05d}.txt")
+
+    def _read_cached(self, i):
+        path = self._page_path(i)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return f.read()
+
+    def _write_cached(self, i, text):
+        path = self._page_path(i)
+        os.makedirs(os.path.dirname(path), exist_ok=True)  # 업로드 저장소가 캐시 디렉터리를 지웠을 수 있음
+        tmp = f"{path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+
+    def cached_pages(self):
+        return [i for i in range(self.page_count) if os.path.exists(self._page_path(i))]
+
+    def extract(self, pages=None, max_workers=PDF_WORKERS):
+        """
+        pages(0부터 시작하는 페이지 번호, None이면 전체) 중 캐시에 없는 페이지를 추출해 저장하고, 새로 추출한 페이지 수를 반환합니다.
+        추출할 페이지가 PARALLEL_MIN_PAGES 이상이면 구간을 나눠 프로세스 풀에서 동시에 처리합니다.
+        """
+        pages = range(self.page_count) if pages is None else pages
+        with self._lock:
+            missing = sorted(i for i in set(pages) if 0 <= i < self.page_count and not os.path.exists(self._page_path(i)))
+            if not missing:
+                return 0
+            ranges = split_page_ranges(missing, max(1, max_workers) * 2)
+            if len(missing) < PARALLEL_MIN_PAGES or max_workers <= 1:
+                results = [_extract_range(self.path, s, e) for s, e in ranges]
+            else:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(ranges))) as pool:
+                    futures = [pool.submit(_extract_range, self.path, s, e) for s, e in ranges]
+                    results = [f.result() for f in futures]
+            for (start, _stop), texts in zip(ranges, results):
+                for offset, text in enumerate(texts):
+                    self._write_cached(start + offset, text)
+            return len(missing)
+
+    def page(self, i):
+        """i번째(0부터) 페이지 텍스트"""
+        text = self._read_cached(i)
+        if text is None:
+            self.extract([i])
+            text = self._read_cached(i) or ""
+        return text
+
+    def iter_pages(self, pages=None):
+        """(페이지 번호, 텍스트)를 순서대로 내보냅니다. 필요한 페이지만 먼저 한 번에 추출합니다."""
+        pages = list(range(self.page_count) if pages is None else pages)
+        self.extract(pages)
+        for i in pages:
+            if 0 <= i < self.page_count:
+                yield i, self._read_cached(i) or ""
+
+    def text(self, pages=None, separator="\n"):
+        return separator.join(text for _, text in self.iter_pages(pages))
+
+
+def open_pdf(path):
+    """경로 -> PdfDocument. 파일이 바뀌지 않았으면 같은 객체를 재사용합니다. (없는 파일이면 FileNotFoundError)"""
+    stat = os.stat(path)
+    key = (os.path.abspath(path), stat.st_mtime_ns, stat.st_size)
+    doc = _documents.get(key)
+    if doc is None:
+        doc = PdfDocument(path)
+        _documents.set(key, doc)
+    return doc
+
+
+def forget_document(sha):
+    """sha의 PdfDocument를 메모리 캐시에서 제거 (업로드 저장소가 디스크 캐시를 지울 때 호출)"""
+    keys = {key for key, doc in _documents.items() if doc.sha == sha}
+    return _documents.pop_where(lambda key: key in keys)
+
+
+def parse_page_spec(spec, page_count):
+    """'3', '1-5', '2,4,10-12' (1부터 시작) -> 0부터 시작하는 페이지 번호 리스트"""
+    pages = []
+    for part in str(spec).replace(" ", "").split(","):
+        if not part:
+            continue
+        if "-" in part:
+            start, _, stop = part.partition("-")
+            start = int(start) if start else 1
+            stop = int(stop) if stop else page_count
+            pages.extend(range(start - 1, min(stop, page_count)))
+        else:
+            pages.append(int(part) - 1)
+    return [i for i in pages if 0 <= i < page_count]
@@ -0,0 +1,170 @@
+"""
+업로드한 공시 PDF 검색 인덱스.
+
+pdf_extract로 얻은 페이지 텍스트를 겹치는 구간(chunk)으로 나누고, sentence-transformers로 배치 임베딩해
+.cache/pdf_text/<sha>/index/<모델명>/ 아래에 vectors.npy(임베딩)와 chunks.json(페이지 번호, 텍스트)으로 저장합니다.
+같은 내용의 PDF는 다시 임베딩하지 않으므로, 긴 사업보고서도 두 번째 질문부터는 질문 임베딩 한 번과 행렬 곱 한 번으로 검색됩니다.
+임베딩 모델을 쓸 수 없으면 BM25(page_context_index.tokenize 토큰)로만 검색합니다.
+
+    index = build_pdf_index("data/사업보고서.pdf")
+    index.search("주요 리스크는?", top_k=5)  # [(score, page, text), ...]
+"""
+import json
+import math
+import os
+import re
+import threading
+from collections import Counter
+
+import numpy as np
+
+from backend.cache_utils import TTLCache
+from backend.embeddings import EMBEDDING_MODEL_NAME, embed_texts
+from backend.page_context_index import tokenize
+from backend.pdf_extract import open_pdf
+
+CHUNK_CHARS = int(os.getenv("PDF_CHUNK_CHARS", "800"))
+CHUNK_OVERLAP = int(os.getenv("PDF_CHUNK_OVERLAP", "150"))
+EMBED_BATCH_SIZE = int(os.getenv("PDF_EMBED_BATCH_SIZE", "64"))
+
+# 문서 해시 -> PdfIndex (디스크에서 다시 읽지 않도록)
+_index_cache = TTLCache(maxsize=16, ttl=24 * 60 * 60)
+_build_lock = threading.Lock()
+
+
+def chunk_pages(pages, size=CHUNK_CHARS, overlap=CHUNK_OVERLAP):
+    """
+    [(page, text)] -> [{"page": page, "text": chunk}]. 페이지 경계를 넘지 않고,
+    공백을 정리한 뒤 size 글자 구간을 overlap 글자씩 겹치게 자릅니다. (가능하면 문장/줄 끝에서 자름)
+    """
+    chunks = []
+    step = max(1, size - overlap)
+    for page, text in pages:
+        text = re.sub(r"[ \t]+", " ", text or "").strip()
+        start = 0
+        while start < len(text):
+            end = min(start + size, len(text))
+            if end < len(text):
+                cut = max(text.rfind("\n", start + step // 2, end), text.rfind(". ", start + step // 2, end))
+                if cut > start:
+                    end = cut + 1
+            chunk = text[start:end].strip()
+            if chunk:
+                chunks.append({"page": page, "text": chunk})
+            if end >= len(text):
+                break
+            start = max(end - overlap, start + 1)
+    return chunks
+
+
+class PdfIndex:
+    """한 PDF의 chunk 목록과 임베딩 행렬 (임베딩이 없으면 BM25만 사용)"""
+
+    def __init__(self, chunks, vectors=None, k1=1.5, b=0.75):
+        self.chunks = chunks
+        self.vectors = vectors
+        self.k1 = k1
+        self.b = b
+        self._doc_tokens = None
+
+    def _bm25(self, question):
+        # 임베딩이 없을 때만 필요하므로 처음 검색할 때 토큰화
+        if self._doc_tokens is None:
+            self._doc_tokens = [Counter(tokenize(c["text"])) for c in self.chunks]
+            self._doc_len = np.array([sum(c.values()) for c in self._doc_tokens], dtype=np.float32)
+            df = Counter()
+            for counts in self._doc_tokens:
+                df.update(counts.keys())
+            n = len(self.chunks)
+            self._idf = {t: math.log(1 + (n - f + 0.5) / (f + 0.5)) for t, f in df.items()}
+        scores = np.zeros(len(self.chunks), dtype=np.float32)
+        avg_len = float(self._doc_len.mean()) if len(self._doc_len) else 0.0
+        if not avg_len:
+            return scores
+        norm = self.k1 * (1 - self.b + self.b * self._doc_len / avg_len)
+        for token in set(tokenize(question)):
+            idf = self._idf.get(token)
+            if idf is None:
+                continue
+            tf = np.array([c.get(token, 0) for c in self._doc_tokens], dtype=np.float32)
+            scores += idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+    def search(self, question, top_k=5):
+        """질문과 관련도가 높은 순서로 [(score, page, text), ...] 반환 (page는 1부터)"""
+        if not self.chunks:
+            return []
+        scores = None
+        if self.vectors is not None and len(self.vectors):
+            q_vec = embed_texts([question])
+            if q_vec is not None:
+                scores = self.vectors @ q_vec[0]
+        if scores is None:
+            scores = self._bm25(question)
+        top_k = min(top_k, len(scores))
+        order = np.argpartition(-scores, top_k - 1)[:top_k]
+        order = order[np.argsort(-scores[order])]
+        return [(float(scores[i]), self.chunks[i]["page"] + 1, self.chunks[i]["text"]) for i in order if scores[i] > 0]
+
+
+def _index_dir(doc):
+    model = re.sub(r"[^\w.-]+", "_", EMBEDDING_MODEL_NAME)
+    return os.path.join(doc.dir, "index", f"{model}-{CHUNK_CHARS}-{CHUNK_OVERLAP}")
+
+
+def _load(index_dir):
+    chunks_path = os.path.join(index_dir, "chunks.json")
+    if not os.path.exists(chunks_path):
+        return None
+    with open(chunks_path, encoding="utf-8") as f:
+        chunks = json.load(f)
+    vectors_path = os.path.join(index_dir, "vectors.npy")
+    vectors = np.load(vectors_path) if os.path.exists(vectors_path) else None
+    return PdfIndex(chunks, vectors)
+
+
+def _save(index_dir, index):
+    os.makedirs(index_dir, exist_ok=True)
+    if index.vectors is not None:
+        tmp = os.path.join(index_dir, "vectors.tmp.npy")
+        np.save(tmp, index.vectors)
+        os.replace(tmp, os.path.join(index_dir, "vectors.npy"))
+    # chunks.json이 마지막에 생기므로, 이 파일이 있으면 인덱스가 완성된 것
+    tmp = os.path.join(index_dir, "chunks.json.tmp")
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(index.chunks, f, ensure_ascii=False)
+    os.replace(tmp, os.path.join(index_dir, "chunks.json"))
+
+
+def forget_pdf_index(sha):
+    """sha의 검색 인덱스를 메모리 캐시에서 제거"""
+    return _index_cache.pop_where(lambda key: key == sha)
+
+
+def build_pdf_index(path):
+    """
+    PDF 경로 -> PdfIndex. 메모리 -> 디스크(.cache/pdf_text/<sha>/index) 순으로 재사용하고,
+    없을 때만 전체 페이지 추출(병렬) + chunk 배치 임베딩을 수행합니다. (없는 파일이면 FileNotFoundError)
+    """
+    doc = open_pdf(path)
+    index = _index_cache.get(doc.sha)
+    if index is not None:
+        return index
+    with _build_lock:
+        index = _index_cache.get(doc.sha)
+        if index is not None:
+            return index
+        index_dir = _index_dir(doc)
+        index = _load(index_dir)
+        # 임베딩 없이 만든 인덱스는 모델을 쓸 수 있게 되면 다시 만듦
+        if index is None or (index.vectors is None and embed_texts(["확인"]) is not None):
+            chunks = chunk_pages(doc.iter_pages())
+            vectors = None
+            try:
+                vectors = embed_texts([c["text"] for c in chunks], batch_size=EMBED_BATCH_SIZE) if chunks else None
+            except Exception as e:
+                print(f"[ERROR] PDF chunk 임베딩 실패: {e}")
+            index = PdfIndex(chunks, vectors)
+            _save(index_dir, index)
+        _index_cache.set(doc.sha, index)
+        return index
@@ -0,0 +1,172 @@
+"""
+PDF 표 추출.
+
+pdfplumber로 페이지별 표를 찾아 행 목록으로 뽑고(페이지 구간을 나눠 프로세스 풀에서 동시에 처리),
+'1,234' / '(1,234)' / '△1,234' / '1조 2,345억' 같은 한국식 금액 문자열을 숫자로 바꾼 DataFrame으로 돌려줍니다.
+추출 결과(원본 셀 문자열)는 pdf_extract와 같은 문서 해시 디렉터리의 tables.json에 저장되므로 같은 PDF는 한 번만 처리합니다.
+
+    tables = extract_tables("data/실적발표.pdf")   # [PdfTable(page, index, df), ...]
+"""
+import json
+import os
+import re
+import threading
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from backend.cache_utils import TTLCache
+from backend.pdf_extract import PDF_WORKERS, PARALLEL_MIN_PAGES, split_page_ranges, open_pdf
+
+# 한국식 금액 단위 (천/백은 조/억/만 앞의 숫자에 곱해짐: '5천만' = 5 * 1000 * 10000)
+KOREAN_UNITS = {"조": 1e12, "억": 1e8, "만": 1e4}
+SMALL_UNITS = {"천": 1e3, "백": 1e2}
+NEGATIVE_MARKS = ("△", "▲", "-", "−", "(")
+# 숫자로 볼 열의 최소 비율 (빈 칸 제외)
+NUMERIC_COLUMN_RATIO = 0.6
+
+_lock = threading.Lock()
+# 문서 해시 -> [PdfTable] (tables.json을 다시 파싱하지 않도록)
+_tables_cache = TTLCache(maxsize=32, ttl=24 * 60 * 60)
+
+
+def _parse_unit_amount(text):
+    """'1조2345억', '3억5천만' 같은 단위 조합 -> float (형식이 맞지 않으면 None)"""
+    if not re.fullmatch(r"(\d+(\.\d+)?|[조억만천백])+", text) or not re.search(r"\d", text):
+        return None
+    total = group = current = 0.0
+    for token in re.findall(r"\d+(?:\.\d+)?|[조억만천백]", text):
+        if token in SMALL_UNITS:
+            group += (current or 1) * SMALL_UNITS[token]
+            current = 0.0
+        elif token in KOREAN_UNITS:
+            total += (group + current) * KOREAN_UNITS[token]
+            group = current = 0.0
+        else:
+            current = float(token)
+    return total + group + current
+
+
+def parse_korean_amount(value):
+    """
+    한국식 숫자/금액 문자열 -> float (숫자가 아니면 NaN).
+    '1,234' -> 1234, '(1,234)' / '△1,234' -> -1234, '1조 2,345억' -> 1.2345e12, '12.5%' -> 12.5
+    """
+    if value is None:
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    text = re.sub(r"[,\s]", "", str(value))
+    if not text or text in ("-", "−", "–", "—"):
+        return np.nan
+    sign = 1.0
+    if text.startswith(NEGATIVE_MARKS):
+        sign = -1.0
+        text = text.lstrip("△▲-−(").rstrip(")")
+    text = text.rstrip("%원")
+    try:
+        return sign * float(text)
+    except ValueError:
+        pass
+    amount = _parse_unit_amount(text)
+    return np.nan if amount is None else sign * amount
+
+
+def _extract_table_range(path, start, stop):
+    """[start, stop) 페이지의 표 -> [(page, rows)] (프로세스 풀 작업 단위)"""
+    import pdfplumber
+    results = []
+    with pdfplumber.open(path) as pdf:
+        for i in range(start, stop):
+            try:
+                for rows in pdf.pages[i].extract_tables():
+                    rows = [[(cell or "").strip() for cell in row] for row in rows if row]
+                    # 제목 상자처럼 열이 하나뿐인 영역은 표로 보지 않음
+                    if len(rows) >= 2 and max(len(row) for row in rows) >= 2 \
+                            and any(any(cell for cell in row) for row in rows):
+                        results.append((i, rows))
+            except Exception as e:
+                print(f"[ERROR] PDF {i + 1}페이지 표 추출 실패: {e}")
+    return results
+
+
+def rows_to_frame(rows):
+    """
+    표 행 목록 -> DataFrame. 첫 행을 열 이름으로 쓰고(빈 이름/중복은 번호를 붙임),
+    빈 칸을 제외한 값의 NUMERIC_COLUMN_RATIO 이상이 숫자로 읽히는 열은 숫자 열로 바꿉니다.
+    """
+    width = max(len(row) for row in rows)
+    rows = [row + [""] * (width - len(row)) for row in rows]
+    header, body = rows[0], rows[1:]
+    columns, seen = [], Counter()
+    for i, name in enumerate(header):
+        name = re.sub(r"\s+", " ", name).strip() or f"열{i + 1}"
+        seen[name] += 1
+        columns.append(name if seen[name] == 1 else f"{name}_{seen[name]}")
+    df = pd.DataFrame(body, columns=columns)
+    for col in df.columns:
+        values = df[col].replace("", np.nan).dropna()
+        if values.empty:
+            continue
+        parsed = df[col].map(parse_korean_amount)
+        if parsed.notna().sum() >= NUMERIC_COLUMN_RATIO * len(values):
+            df[col] = parsed
+    return df
+
+
+@dataclass
+class PdfTable:
+    page: int  # 1부터
+    index: int  # 문서 전체에서의 표 번호 (1부터)
+    df: pd.DataFrame
+
+    def describe(self):
+        """analyze_csv_tool과 같은 형식의 컬럼/기초 통계 문자열"""
+        numeric = self.df.select_dtypes("number")
+        stats = numeric.describe().to_string() if not numeric.empty else "(숫자 열 없음)"
+        return f"컬럼: {list(self.df.columns)}\n기초 통계:\n{stats}"
+
+
+def _tables_path(doc):
+    return os.path.join(doc.dir, "tables.json")
+
+
+def forget_tables(sha):
+    """sha의 표 추출 결과를 메모리 캐시에서 제거"""
+    return _tables_cache.pop_where(lambda key: key == sha)
+
+
+def extract_tables(path, max_workers=PDF_WORKERS):
+    """
+    PDF 경로 -> [PdfTable]. 문서 해시별 tables.json이 있으면 다시 추출하지 않습니다.
+    페이지가 PARALLEL_MIN_PAGES 이상이면 페이지 구간을 나눠 프로세스 풀에서 추출합니다. (없는 파일이면 FileNotFoundError)
+    """
+    doc = open_pdf(path)
+    tables = _tables_cache.get(doc.sha)
+    if tables is not None:
+        return tables
+    cache_path = _tables_path(doc)
+    with _lock:
+        if os.path.exists(cache_path):
+            with open(cache_path, encoding="utf-8") as f:
+                raw = json.load(f)
+        else:
+            ranges = split_page_ranges(list(range(doc.page_count)), max(1, max_workers) * 2)
+            if doc.page_count < PARALLEL_MIN_PAGES or max_workers <= 1:
+                results = [_extract_table_range(doc.path, s, e) for s, e in ranges]
+            else:
+                with ProcessPoolExecutor(max_workers=min(max_workers, len(ranges))) as pool:
+                    futures = [pool.submit(_extract_table_range, doc.path, s, e) for s, e in ranges]
+                    results = [f.result() for f in futures]
+            raw = [{"page": page, "rows": rows} for part in results for page, rows in part]
+            os.makedirs(doc.dir, exist_ok=True)
+            tmp = f"{cache_path}.tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(raw, f, ensure_ascii=False)
+            os.replace(tmp, cache_path)
+    tables = [PdfTable(item["page"] + 1, i, rows_to_frame(item["rows"])) for i, item in enumerate(raw, start=1)]
+    _tables_cache.set(doc.sha, tables)
+    return tables
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+from backend import dart_cache
+from backend.request_scheduler import PREFETCH, DeadlineExceeded
+
+# 기업 선택 후 이 시간(초) 안에 시작하지 못한 프리페치는 취소합니다. (이미 관심이 옮겨갔을 가능성이 큼)
+PREFETCH_DEADLINE = float(os.getenv("DART_PREFETCH_DEADLINE", "60"))
+
+
+class StatementPrefetcher:
+    """
+    페이지 2에서 기업을 선택하는 즉시, 다음에 누를 가능성이 큰 (연도 × CFS/OFS) 재무제표를
+    dart_cache에 미리 받아 두는 백그라운드 작업자.
+    - DART 호출은 request_scheduler의 prefetch 우선순위로 보내 공유 속도 제한을 지키고 사용자 요청에 양보합니다.
+    - 사용자 요청(interactive 구간)이 진행 중이면 다음 작업을 꺼내지 않습니다.
+    - 같은 작업은 한 번만 대기열에 넣고, 가장 최근에 선택한 기업을 먼저 처리합니다.
+    - 대기열에 들어간 지 deadline초가 지나도록 시작하지 못한 작업은 취소합니다.
+    """
+
+    def __init__(self, max_pending=200, deadline=PREFETCH_DEADLINE):
+        self.max_pending = max_pending
+        self.deadline = deadline
+        self._pending = deque()
+        self._queued = {}  # job -> 대기열에 넣은 시각 (time.monotonic)
+        self._cond = threading.Condition()
+        self._interactive = 0
+        self._thread = None
+        self._start_lock = threading.Lock()  # 여러 세션이 동시에 선택해도 작업자 스레드는 하나만
+        self.fetched = 0
+        self.skipped = 0
+        self.cancelled = 0
+        self.errors = 0
+
+    def _ensure_started(self):
+        with self._start_lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, name="statement-prefetcher", daemon=True)
+                self._thread.start()
+
+    @contextmanager
+    def interactive(self):
+        """사용자 요청 구간. 이 구간 동안 프리페치는 새 요청을 보내지 않습니다."""
+        with self._cond:
+            self._interactive += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._interactive -= 1
+                self._cond.notify_all()
+
+    def prefetch_company(self, company_name, years, fs_divs=("CFS",), reprt_code="11011"):
+        """기업명과 연도 목록에 대한 프리페치 작업을 대기열 앞쪽에 넣습니다. (이미 있으면 무시)"""
+        jobs = [(company_name, str(y), reprt_code, fs) for y in years for fs in fs_divs]
+        now = time.monotonic()
+        with self._cond:
+            # 최근 선택한 기업이 먼저 처리되도록 역순으로 앞에 넣음
+            for job in reversed(jobs):
+                if job in self._queued:
+                    continue
+                self._pending.appendleft(job)
+                self._queued[job] = now
+            while len(self._pending) > self.max_pending:
+                self._queued.pop(self._pending.pop(), None)
+            self._cond.notify_all()
+        self._ensure_started()
+
+    def _next_job(self):
+        with self._cond:
+            while not self._pending or self._interactive:
+                self._cond.wait(timeout=1.0)
+            job = self._pending.popleft()
+            return job, self._queued.pop(job) + self.deadline
+
+    def _run(self):
+        while True:
+            (company_name, year, reprt_code, fs_div), deadline = self._next_job()
+            try:
+                info = dart_cache.resolve_corp_code(company_name, priority=PREFETCH)
+                corp_code = info.get("corp_code") if isinstance(info, dict) else None
+                if not corp_code or dart_cache.is_statement_cached(corp_code, year, reprt_code, fs_div):
+                    self.skipped += 1
+                    continue
+                dart_cache.get_statements(corp_code, year, reprt_code=reprt_code, fs_div=fs_div,
+                                          priority=PREFETCH, deadline=deadline)
+                self.fetched += 1
+            except DeadlineExceeded:
+                self.cancelled += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"[ERROR] prefetch {company_name} {year}: {e}")
+                time.sleep(1.0)
+
+    def stats(self):
+        with self._cond:
+            pending = len(self._pending)
+        return {"pending": pending, "fetched": self.fetched, "skipped": self.skipped,
+                "cancelled": self.cancelled, "errors": self.errors}
+
+
+# 프로세스 전체에서 공유하는 프리페처
+statement_prefetcher = StatementPrefetcher()
@@ -0,0 +1,130 @@
+import hashlib
+import re
+import threading
+import unicodedata
+import numpy as np
+
+from backend.cache_utils import TTLCache
+from backend.company_catalog import COMPANY_TO_INDUSTRY, TOP_COMPANIES
+from backend.embeddings import embed_texts
+from backend.entity_memory import mention_key
+from backend.industry_index import industry_index
+
+# 기업명 뒤에 붙는 조사 ('삼성전자의', 'LG화학과')
+PARTICLE_RE = re.compile(r"(의|은|는|이|가|을|를|와|과|도|에서|에|으로|로|랑|하고|보다|대비)$")
+_KNOWN_COMPANIES = {mention_key(name) for name in TOP_COMPANIES + list(COMPANY_TO_INDUSTRY)}
+
+
+def normalize_question(question):
+    """
+    캐시 키용 질문 정규화: 유니코드 정규화, 소문자화, 문장부호/공백 제거.
+    예: 'LG 화학 경쟁사와 2023년 매출액 비교해줘?' -> 'lg화학경쟁사와2023년매출액비교해줘'
+    """
+    text = unicodedata.normalize("NFKC", str(question or "")).lower()
+    text = re.sub(r"[^\w]", "", text)
+    return text
+
+
+def context_hash(page_context, namespace=""):
+    """페이지 컨텍스트(와 페이지 구분자)의 짧은 해시"""
+    raw = f"{namespace}\x00{page_context or ''}".encode("utf-8")
+    return hashlib.sha1(raw).hexdigest()[:16]
+
+
+def key_terms(question):
+    """
+    답을 바꾸는 핵심 토큰 집합: 숫자(연도/금액/순위), 영문 단어(LG, SK 등), 기업명(대표 기업 + 업종 색인의 상장사).
+    유사도 캐시는 이 집합이 같은 질문끼리만 맞춥니다. ('삼성전자 2022년 매출' != '삼성전자 2023년 매출')
+    """
+    text = unicodedata.normalize("NFKC", str(question or "")).lower()
+    terms = set(re.findall(r"\d+(?:\.\d+)?", text)) | set(re.findall(r"[a-z]+", text))
+    for token in re.findall(r"[\w&()]+", text):
+        name = mention_key(PARTICLE_RE.sub("", token))
+        if name and not name.isdigit() and (name in _KNOWN_COMPANIES or industry_index.company(name)[0]):
+            terms.add(name)
+    return frozenset(terms)
+
+
+class SemanticQACache:
+    """
+    사이드바 Q&A 챗봇용 응답 캐시.
+    1) (정규화된 질문, 컨텍스트 해시) 완전일치 조회
+    2) 같은 컨텍스트 안에서 숫자/기업명(key_terms)이 같고 임베딩 코사인 유사도가 threshold 이상인 질문 조회
+    TTL 만료와 최대 크기(LRU) 기준으로 항목을 제거합니다.
+    """
+
+    def __init__(self, maxsize=512, ttl=6 * 60 * 60, similarity_threshold=0.92, use_embeddings=True):
+        self._entries = TTLCache(maxsize=maxsize, ttl=ttl)
+        self.similarity_threshold = similarity_threshold
+        self.use_embeddings = use_embeddings
+        self._lock = threading.Lock()
+        self.exact_hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+
+    def _embed(self, question):
+        if not self.use_embeddings:
+            return None
+        try:
+            vectors = embed_texts([question])
+        except Exception as e:
+            print(f"[ERROR] 질문 임베딩 실패: {e}")
+            return None
+        return vectors[0] if vectors is not None and len(vectors) else None
+
+    def get(self, question, page_context="", namespace=""):
+        """캐시된 답변 문자열을 반환하고, 없으면 None"""
+        norm_q = normalize_question(question)
+        if not norm_q:
+            return None
+        ctx = context_hash(page_context, namespace)
+        entry = self._entries.get((ctx, norm_q))
+        if entry is not None:
+            with self._lock:
+                self.exact_hits += 1
+            return entry["answer"]
+
+        terms = key_terms(question)
+        candidates = [v for (c, _), v in self._entries.items()
+                      if c == ctx and v.get("embedding") is not None and v.get("terms") == terms]
+        if candidates:
+            q_vec = self._embed(question)
+            if q_vec is not None:
+                matrix = np.vstack([v["embedding"] for v in candidates])
+                scores = matrix @ q_vec
+                best = int(np.argmax(scores))
+                if scores[best] >= self.similarity_threshold:
+                    with self._lock:
+                        self.semantic_hits += 1
+                    return candidates[best]["answer"]
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def set(self, question, page_context, answer, namespace=""):
+        norm_q = normalize_question(question)
+        if not norm_q or not answer:
+            return
+        ctx = context_hash(page_context, namespace)
+        self._entries.set((ctx, norm_q), {
+            "question": question,
+            "answer": answer,
+            "embedding": self._embed(question),
+            "terms": key_terms(question),
+        })
+
+    def clear(self):
+        self._entries.clear()
+
+    def stats(self):
+        stats = self._entries.stats()
+        stats.update({
+            "exact_hits": self.exact_hits,
+            "semantic_hits": self.semantic_hits,
+            "lookup_misses": self.misses,
+        })
+        return stats
+
+
+# 프로세스 전체(모든 세션/페이지)에서 공유하는 캐시 인스턴스
+qa_cache = SemanticQACache()
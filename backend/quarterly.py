@@ -0,0 +1,151 @@
+"""
+분기/TTM(최근 4개 분기 합계) 재무 데이터.
+
+DART 정기보고서는 보고서마다 기간이 다릅니다.
+    11013 1분기보고서: 1~3월    11012 반기보고서: 1~6월 누적
+    11014 3분기보고서: 1~9월 누적  11011 사업보고서: 연간
+손익/현금흐름(기간 계정)은 누적 금액(thstrm_add_amount, 없으면 thstrm_amount)으로 맞춘 뒤
+차분해 단일 분기를 만들고(Q4 = 연간 - 3분기 누적), 재무상태표(시점 계정)는 분기말 값을 그대로 씁니다.
+
+한 연도의 네 보고서는 dart_cache를 통해 동시에 받으며, 파생 결과도 원본 응답과 함께 메모리에 캐시하므로
+같은 기업의 분기 추이를 다시 볼 때는 추가 호출이나 재계산이 없습니다. (dart_cache가 무효화되면 다시 계산)
+"""
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from backend import dart_cache
+from backend.accounts import ACCOUNT_LABELS, STANDARD_ACCOUNTS, parse_amounts, standardize
+from backend.cache_utils import TTLCache
+from backend.ratios import compute_ratios
+
+# 보고서 종류 -> reprt_code (parse_financial_query에서 사용)
+REPORT_CODES = {
+    "사업보고서": "11011",
+    "반기보고서": "11012",
+    "1분기보고서": "11013",
+    "3분기보고서": "11014",
+}
+# reprt_code -> (분기 번호, 누적 개월 수)
+QUARTER_OF_REPORT = {"11013": (1, 3), "11012": (2, 6), "11014": (3, 9), "11011": (4, 12)}
+# 기간 계정(차분 대상)이 있는 재무제표 구분
+FLOW_SJ_DIVS = ("IS", "CIS", "CF")
+FLOW_ACCOUNTS = [k for k, spec in STANDARD_ACCOUNTS.items() if set(spec["sj_divs"]) & set(FLOW_SJ_DIVS)]
+
+_quarterly_cache = TTLCache(maxsize=256, ttl=dart_cache.STATEMENT_TTL)
+
+
+def report_code_for(report_type):
+    """보고서 종류 문자열 -> reprt_code ('분기보고서'만 있으면 3분기보고서로 간주)"""
+    if report_type in REPORT_CODES:
+        return REPORT_CODES[report_type]
+    if "1분기" in report_type:
+        return REPORT_CODES["1분기보고서"]
+    if "분기" in report_type:
+        return REPORT_CODES["3분기보고서"]
+    if "반기" in report_type:
+        return REPORT_CODES["반기보고서"]
+    return REPORT_CODES["사업보고서"]
+
+
+def fetch_year_reports(corp_code, years, fs_div="CFS", max_workers=8):
+    """(연도 × 4개 보고서) 재무제표를 동시에 조회해 {(year, reprt_code): 응답}으로 반환합니다."""
+    jobs = [(str(y), r) for y in years for r in QUARTER_OF_REPORT]
+
+    def fetch(job):
+        return dart_cache.get_statements(corp_code, job[0], reprt_code=job[1], fs_div=fs_div)
+
+    if all(dart_cache.is_statement_cached(corp_code, y, r, fs_div) for y, r in jobs):
+        return {job: fetch(job) for job in jobs}  # 모두 캐시에 있으면 스레드 없이 바로 반환
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        return dict(zip(jobs, pool.map(fetch, jobs)))
+
+
+def _cumulative_rows(fs_data, year, reprt_code):
+    """보고서 하나 -> 기간 계정은 누적 금액, 시점 계정은 기말 금액을 amount로 가진 계정 행"""
+    df = pd.DataFrame(fs_data.get("list", []) if isinstance(fs_data, dict) else [])
+    if df.empty or "account_nm" not in df.columns:
+        return None
+    for col in ("account_id", "thstrm_amount", "thstrm_add_amount"):
+        if col not in df.columns:
+            df[col] = None
+    amount = parse_amounts(df["thstrm_amount"])
+    add_amount = parse_amounts(df["thstrm_add_amount"])
+    # 반기/3분기 손익계산서의 thstrm_amount는 3개월치이므로 누적 금액이 있으면 누적 금액 사용
+    is_flow = df["sj_div"].isin(FLOW_SJ_DIVS)
+    cumulative = amount.where(~(is_flow & add_amount.notna()), add_amount)
+    return df[["sj_div", "account_id", "account_nm"]].assign(
+        bsns_year=int(year), quarter=QUARTER_OF_REPORT[reprt_code][0], amount=cumulative)
+
+
+def derive_quarters(reports):
+    """
+    {(year, reprt_code): 응답} -> index (year, quarter), 열이 표준 계정인 단일 분기 표.
+    직전 누적이 없는 분기(예: 1분기보고서가 없는 연도의 2분기)는 기간 계정이 NaN입니다.
+    """
+    frames = [rows for (year, code), fs in reports.items()
+              if (rows := _cumulative_rows(fs, year, code)) is not None]
+    if not frames:
+        return pd.DataFrame(columns=list(STANDARD_ACCOUNTS),
+                            index=pd.MultiIndex.from_tuples([], names=["year", "quarter"]))
+    cumulative = standardize(pd.concat(frames, ignore_index=True), index=("bsns_year", "quarter"))
+    cumulative.index = cumulative.index.set_names(["year", "quarter"])
+    # 연도가 빠져 있어도 TTM이 공백을 건너 합산하지 않도록 연속된 (연도, 분기) 격자로 맞춤
+    years = cumulative.index.get_level_values("year")
+    grid = pd.MultiIndex.from_product([range(years.min(), years.max() + 1), [1, 2, 3, 4]], names=["year", "quarter"])
+    cumulative = cumulative.reindex(grid)
+    quarters = cumulative.copy()
+    # 기간 계정: 같은 연도 안에서 직전 분기 누적을 빼서 단일 분기로 (1분기는 누적 = 단일)
+    flow = cumulative[FLOW_ACCOUNTS]
+    prior = flow.groupby(level="year").shift(1)
+    first = flow.index.get_level_values("quarter") == 1
+    quarters[FLOW_ACCOUNTS] = np.where(first[:, None], flow.to_numpy(), (flow - prior).to_numpy())
+    return quarters
+
+
+def ttm(quarters):
+    """단일 분기 표 -> 최근 4개 분기 합계(TTM) 표. 기간 계정은 연속 4개 분기가 모두 있어야 계산, 시점 계정은 분기말 값"""
+    out = quarters.copy()
+    out[FLOW_ACCOUNTS] = quarters[FLOW_ACCOUNTS].rolling(4, min_periods=4).sum()
+    return out
+
+
+def quarterly_statements(corp_code, years, fs_div="CFS"):
+    """
+    기업의 연도별 단일 분기 표와 TTM 표, TTM 기준 비율을 반환합니다.
+    반환: {"quarters": DataFrame, "ttm": DataFrame, "ttm_ratios": DataFrame, "failed": 오류 보고서 수} (index: (year, quarter))
+    """
+    years = sorted(str(y) for y in years)
+    key = (str(corp_code), tuple(years), fs_div)
+    reports = fetch_year_reports(corp_code, years, fs_div=fs_div)
+    # 원본 응답 객체가 그대로면(= dart_cache가 무효화되지 않았으면) 파생 결과 재사용
+    cached = _quarterly_cache.get(key)
+    if cached is not None and all(cached[0].get(k) is v for k, v in reports.items()):
+        return cached[1]
+    quarters = derive_quarters(reports)
+    trailing = ttm(quarters)
+    previous = trailing.groupby(level="quarter").shift(1)  # 전년 동기 TTM
+    failed = sum(not (isinstance(fs, dict) and fs.get("status") in ("000", "013")) for fs in reports.values())
+    result = {"quarters": quarters, "ttm": trailing, "ttm_ratios": compute_ratios(trailing, previous), "failed": failed}
+    # 한 보고서라도 오류(네트워크/한도 초과)였으면 캐시하지 않음
+    if not failed:
+        _quarterly_cache.set(key, (reports, result))
+    return result
+
+
+def quarter_label(year, quarter):
+    return f"{year}.Q{quarter}"
+
+
+def quarterly_summary(result, accounts=("revenue", "operating_income", "net_income")):
+    """
+    quarterly_statements() 결과 -> 분기 라벨(2023.Q1 ...)별 주요 계정(단일 분기), TTM 매출액, TTM 영업이익률 표.
+    금액은 원 단위 숫자이며, 화면/에이전트에서 형식을 맞춥니다.
+    """
+    quarters, trailing, ratios = result["quarters"], result["ttm"], result["ttm_ratios"]
+    table = quarters[list(accounts)].rename(columns=ACCOUNT_LABELS)
+    table["TTM 매출액"] = trailing["revenue"]
+    table["TTM 영업이익률"] = ratios["영업이익률"]
+    table.index = [quarter_label(y, q) for y, q in table.index]
+    return table.dropna(how="all")
@@ -0,0 +1,54 @@
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 토큰이 차고 최대 capacity개까지 쌓이는 토큰 버킷.
+    acquire()는 토큰을 얻을 때까지 기다리고, try_acquire()는 기다리지 않습니다.
+    """
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self):
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens=1.0, reserve=0.0):
+        """
+        토큰을 즉시 얻을 수 있으면 차감하고 True를 반환합니다.
+        reserve만큼은 남겨 두어야 할 때(우선순위가 낮은 호출) reserve를 지정합니다.
+        """
+        with self._lock:
+            self._refill()
+            if self._tokens - tokens >= reserve:
+                self._tokens -= tokens
+                return True
+            return False
+
+    def acquire(self, tokens=1.0, reserve=0.0, timeout=None):
+        """토큰을 얻을 때까지 대기합니다. timeout(초) 안에 얻지 못하면 False"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            if self.try_acquire(tokens, reserve):
+                return True
+            with self._lock:
+                missing = tokens + reserve - self._tokens
+            wait = max(missing / self.rate, 0.005) if self.rate > 0 else 0.05
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                wait = min(wait, remaining)
+            time.sleep(wait)
@@ -0,0 +1,96 @@
+"""
+재무비율 엔진.
+
+표준 계정(backend.accounts의 key) 열을 가진 표를 받아, 행(기업 × 기간)이 몇 개든
+모든 비율을 numpy 배열 연산 한 번으로 계산합니다.
+분모가 0이거나 값이 없으면(NaN) 결과도 NaN이며, 화면에서는 이를 'N/A' 등으로 표시합니다.
+
+    ratios = compute_ratios(current, previous)   # previous: 같은 index의 직전 기간 표 (성장률용)
+"""
+import numpy as np
+import pandas as pd
+
+from backend.accounts import STANDARD_ACCOUNTS
+
+
+def safe_divide(num, den):
+    """num / den (배열). 분모가 0이거나 NaN이면 NaN"""
+    num = np.asarray(num, dtype=float)
+    den = np.asarray(den, dtype=float)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return np.where((den == 0) | np.isnan(den), np.nan, num / den)
+
+
+def growth(current, previous):
+    """직전 기간 대비 증감률(%). 직전 값이 음수여도 개선이 양수가 되도록 |직전 값|으로 나눕니다."""
+    current = np.asarray(current, dtype=float)
+    previous = np.asarray(previous, dtype=float)
+    return safe_divide(current - previous, np.abs(previous)) * 100
+
+
+# 비율 이름 -> (분류, 계산 함수(a: 당기 계정 표, p: 직전 기간 계정 표 또는 None)). 비율은 % 단위
+RATIOS = {
+    # 수익성
+    "매출총이익률": ("margin", lambda a, p: safe_divide(a["gross_profit"], a["revenue"]) * 100),
+    "영업이익률": ("margin", lambda a, p: safe_divide(a["operating_income"], a["revenue"]) * 100),
+    "순이익률": ("margin", lambda a, p: safe_divide(a["net_income"], a["revenue"]) * 100),
+    # 성장성
+    "매출성장률": ("growth", lambda a, p: growth(a["revenue"], p["revenue"])),
+    "영업이익성장률": ("growth", lambda a, p: growth(a["operating_income"], p["operating_income"])),
+    "순이익성장률": ("growth", lambda a, p: growth(a["net_income"], p["net_income"])),
+    "자산성장률": ("growth", lambda a, p: growth(a["total_assets"], p["total_assets"])),
+    # 안정성
+    "부채비율": ("leverage", lambda a, p: safe_divide(a["total_liabilities"], a["total_equity"]) * 100),
+    "자기자본비율": ("leverage", lambda a, p: safe_divide(a["total_equity"], a["total_assets"]) * 100),
+    # 유동성
+    "유동비율": ("liquidity", lambda a, p: safe_divide(a["current_assets"], a["current_liabilities"]) * 100),
+    "당좌비율": ("liquidity", lambda a, p: safe_divide(a["current_assets"] - a["inventories"].fillna(0),
+                                                     a["current_liabilities"]) * 100),
+    "현금비율": ("liquidity", lambda a, p: safe_divide(a["cash"], a["current_liabilities"]) * 100),
+    # 현금흐름
+    "영업현금흐름비율": ("cash_flow", lambda a, p: safe_divide(a["operating_cf"], a["revenue"]) * 100),
+    "현금흐름대비순이익": ("cash_flow", lambda a, p: safe_divide(a["operating_cf"], a["net_income"]) * 100),
+    # 수익률 (기말 잔액 기준)
+    "ROE": ("return", lambda a, p: safe_divide(a["net_income"], a["total_equity"]) * 100),
+    "ROA": ("return", lambda a, p: safe_divide(a["net_income"], a["total_assets"]) * 100),
+}
+# 금액 단위(원) 파생 지표
+DERIVED_AMOUNTS = {
+    "잉여현금흐름": lambda a: a["operating_cf"] - a["capex"].abs().fillna(0),
+}
+RATIO_NAMES = list(RATIOS)
+RATIO_GROUPS = {
+    "margin": "수익성", "growth": "성장성", "leverage": "안정성",
+    "liquidity": "유동성", "cash_flow": "현금흐름", "return": "수익률",
+}
+
+
+def compute_ratios(current, previous=None, groups=None):
+    """
+    current: 표준 계정 key 열을 가진 DataFrame (행: 기업 × 기간). 없는 계정 열은 NaN으로 취급합니다.
+    previous: current와 같은 index의 직전 기간 표. 없으면 성장률은 NaN.
+    groups: 계산할 분류 목록 (None이면 전체)
+    반환: current와 같은 index, 비율(%) 열 + 파생 금액 열을 가진 DataFrame
+    """
+    keys = list(STANDARD_ACCOUNTS)
+    a = current.reindex(columns=keys).astype(float)
+    p = previous.reindex(index=current.index, columns=keys).astype(float) if previous is not None else None
+    out = {}
+    for name, (group, fn) in RATIOS.items():
+        if groups and group not in groups:
+            continue
+        if group == "growth" and p is None:
+            out[name] = np.full(len(a), np.nan)
+        else:
+            out[name] = fn(a, p)
+    if not groups or "cash_flow" in groups:
+        for name, fn in DERIVED_AMOUNTS.items():
+            out[name] = fn(a).to_numpy(dtype=float)
+    return pd.DataFrame(out, index=current.index)
+
+
+def format_ratio(value, signed=False, missing=""):
+    """비율 값을 '12.3%' 형식으로 (signed=True면 양수에 '+' 표시, 값이 없으면 missing)"""
+    if value is None or pd.isna(value):
+        return missing
+    return f"{'+' if signed and value >= 0 else ''}{value:.1f}%"
@@ -0,0 +1,125 @@
+import os
+import threading
+import time
+from contextlib import contextmanager
+
+from backend.rate_limit import TokenBucket
+
+# 우선순위 클래스 (앞쪽일수록 높음)
+INTERACTIVE = "interactive"  # 사용자 클릭/질문
+PREFETCH = "prefetch"        # 다음 요청 예측 프리페치
+BATCH = "batch"              # 워밍업, 대량 수집 등
+PRIORITIES = (INTERACTIVE, PREFETCH, BATCH)
+
+# 서비스별 공유 속도 제한 (초당 요청 수)
+DEFAULT_RATES = {
+    "dart": float(os.getenv("DART_RATE_LIMIT", "10")),
+    "llm": float(os.getenv("LLM_RATE_LIMIT", "5")),
+}
+# 클래스별 동시 실행 상한 (서비스마다 따로 적용)
+DEFAULT_CONCURRENCY = {INTERACTIVE: 16, PREFETCH: 2, BATCH: 4}
+# 낮은 우선순위가 토큰을 쓸 때 남겨 둬야 하는 버킷 비율 (사용자 클릭용 여유분)
+DEFAULT_RESERVE = {INTERACTIVE: 0.0, PREFETCH: 0.3, BATCH: 0.5}
+
+
+class DeadlineExceeded(Exception):
+    """마감 시각 전에 요청을 시작하지 못해 취소됨"""
+
+
+def deadline_in(seconds):
+    """지금부터 seconds초 뒤의 마감 시각 (time.monotonic 기준)"""
+    return time.monotonic() + seconds
+
+
+class RequestScheduler:
+    """
+    DART/LLM 외부 호출을 위한 우선순위 스케줄러.
+    - 서비스별 TokenBucket 하나를 모든 호출자가 공유합니다. (속도 제한 합산)
+    - 높은 우선순위가 토큰을 기다리는 동안 낮은 우선순위는 토큰을 가져가지 않고,
+      낮은 우선순위는 버킷의 일정 비율을 남겨 두어 사용자 클릭이 기다리지 않게 합니다.
+    - 클래스별 동시 실행 수를 제한하고, 마감 시각까지 시작하지 못한 요청은 DeadlineExceeded로 취소합니다.
+    """
+
+    def __init__(self, rates=None, concurrency=None, reserve=None):
+        rates = rates or DEFAULT_RATES
+        concurrency = concurrency or DEFAULT_CONCURRENCY
+        self.reserve = reserve or DEFAULT_RESERVE
+        self._buckets = {s: TokenBucket(rate=r, capacity=max(2.0, r)) for s, r in rates.items()}
+        self._slots = {
+            (s, p): threading.BoundedSemaphore(concurrency[p]) for s in rates for p in PRIORITIES
+        }
+        self._waiting = {(s, p): 0 for s in rates for p in PRIORITIES}
+        self._cond = threading.Condition()
+        self._stats = {(s, p): {"calls": 0, "cancelled": 0, "errors": 0, "wait_ms": 0.0}
+                       for s in rates for p in PRIORITIES}
+
+    def _higher_waiting(self, service, priority):
+        higher = PRIORITIES[:PRIORITIES.index(priority)]
+        return any(self._waiting[(service, p)] for p in higher)
+
+    def _check_deadline(self, service, priority, deadline):
+        if deadline is not None and time.monotonic() >= deadline:
+            with self._cond:
+                self._stats[(service, priority)]["cancelled"] += 1
+            raise DeadlineExceeded(f"{service}/{priority} 요청이 마감 시각 전에 시작되지 못했습니다.")
+
+    @contextmanager
+    def _slot(self, service, priority, deadline):
+        sem = self._slots[(service, priority)]
+        while not sem.acquire(timeout=0.05):
+            self._check_deadline(service, priority, deadline)
+        try:
+            yield
+        finally:
+            sem.release()
+
+    def _acquire_token(self, service, priority, deadline):
+        bucket = self._buckets[service]
+        reserve = self.reserve.get(priority, 0.0) * bucket.capacity
+        with self._cond:
+            self._waiting[(service, priority)] += 1
+        try:
+            while True:
+                with self._cond:
+                    if not self._higher_waiting(service, priority) and bucket.try_acquire(reserve=reserve):
+                        return
+                self._check_deadline(service, priority, deadline)
+                with self._cond:
+                    self._cond.wait(timeout=min(0.05, max(0.005, 1.0 / bucket.rate)))
+        finally:
+            with self._cond:
+                self._waiting[(service, priority)] -= 1
+                self._cond.notify_all()
+
+    def call(self, service, fn, *args, priority=INTERACTIVE, deadline=None, **kwargs):
+        """
+        fn(*args, **kwargs)를 service의 속도 제한/우선순위 규칙에 따라 호출자 스레드에서 실행합니다.
+        deadline(time.monotonic 기준)까지 시작하지 못하면 DeadlineExceeded를 발생시킵니다.
+        """
+        if priority not in PRIORITIES:
+            raise ValueError(f"priority는 {PRIORITIES} 중 하나여야 합니다. (입력값: {priority})")
+        started = time.perf_counter()
+        with self._slot(service, priority, deadline):
+            self._acquire_token(service, priority, deadline)
+            waited = (time.perf_counter() - started) * 1000
+            stats = self._stats[(service, priority)]
+            with self._cond:
+                stats["calls"] += 1
+                stats["wait_ms"] += waited
+            try:
+                return fn(*args, **kwargs)
+            except Exception:
+                with self._cond:
+                    stats["errors"] += 1
+                raise
+
+    def stats(self):
+        with self._cond:
+            return {
+                f"{s}/{p}": dict(v, avg_wait_ms=round(v["wait_ms"] / v["calls"], 1) if v["calls"] else 0.0)
+                for (s, p), v in self._stats.items() if v["calls"] or v["cancelled"]
+            }
+
+
+# 프로세스 전체에서 공유하는 스케줄러
+scheduler = RequestScheduler()
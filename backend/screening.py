@@ -0,0 +1,199 @@
+"""
+로컬 웨어하우스 기반 기업 스크리닝/순위 엔진.
+
+웨어하우스의 (기업, 기간, 계정) 행을 표준 계정으로 맞춘 뒤 기업별 한 행의 표(universe)로 만들고,
+'영업이익률 >= 10 and 매출액 >= 1e12' 같은 필터식과 '매출액' 같은 정렬식을
+numpy 배열 연산으로 전체 기업에 한 번에 평가합니다.
+
+식은 ast로 파싱해 허용된 노드(비교, 사칙연산, and/or/not, 지표 이름, 숫자, 일부 함수)만 평가하므로
+eval()을 쓰지 않습니다. 값이 없는 기업(NaN)은 비교식에서 항상 False가 됩니다.
+"""
+import ast
+import operator
+
+import numpy as np
+import pandas as pd
+
+from backend.accounts import ACCOUNT_LABELS, standardize
+from backend.ratios import compute_ratios, safe_divide, RATIO_NAMES, DERIVED_AMOUNTS
+from backend.warehouse import warehouse
+
+# 금액 지표(원)와 비율 지표(%)의 표시명
+AMOUNT_METRICS = list(ACCOUNT_LABELS.values()) + list(DERIVED_AMOUNTS)
+RATIO_METRICS = RATIO_NAMES
+# 식에서 영문 이름도 쓸 수 있도록 한 별칭
+METRIC_ALIASES = dict(ACCOUNT_LABELS, **{
+    "operating_margin": "영업이익률", "net_margin": "순이익률", "debt_ratio": "부채비율",
+    "current_ratio": "유동비율", "roe": "ROE", "roa": "ROA",
+    "revenue_growth": "매출성장률", "operating_income_growth": "영업이익성장률",
+})
+
+_BIN_OPS = {
+    ast.Add: operator.add, ast.Sub: operator.sub, ast.Mult: operator.mul,
+    ast.Div: operator.truediv, ast.Pow: operator.pow, ast.Mod: operator.mod,
+}
+_CMP_OPS = {
+    ast.Gt: operator.gt, ast.GtE: operator.ge, ast.Lt: operator.lt,
+    ast.LtE: operator.le, ast.Eq: operator.eq, ast.NotEq: operator.ne,
+}
+# 거듭제곱 지수 상한 ('9**9**9'처럼 끝나지 않는 계산 방지)
+MAX_EXPONENT = 64
+# 식 길이 상한 ('-' * 5000처럼 깊게 중첩된 식이 파서/평가기의 재귀 한도를 넘지 않도록)
+MAX_EXPRESSION_LENGTH = 500
+_FUNCS = {"abs": np.abs, "log": np.log, "sqrt": np.sqrt, "isnull": pd.isna, "notnull": pd.notna}
+
+
+def evaluate_expression(expr, columns):
+    """
+    필터/정렬식을 columns(이름 -> numpy 배열)에 대해 평가해 배열(또는 스칼라)을 반환합니다.
+    허용되지 않은 문법이나 모르는 지표 이름이면 ValueError를 발생시킵니다.
+    """
+    expr = expr.strip()
+    if len(expr) > MAX_EXPRESSION_LENGTH:
+        raise ValueError(f"식이 너무 깁니다 (최대 {MAX_EXPRESSION_LENGTH}자)")
+    try:
+        tree = ast.parse(expr, mode="eval")
+    except SyntaxError as e:
+        raise ValueError(f"식을 해석할 수 없습니다: {expr} ({e.msg})")
+    except (RecursionError, MemoryError):
+        raise ValueError(f"식이 너무 깊게 중첩되어 있습니다: {expr[:50]}...")
+
+    def ev(node):
+        if isinstance(node, ast.Expression):
+            return ev(node.body)
+        if isinstance(node, ast.Constant) and isinstance(node.value, (int, float)) and not isinstance(node.value, bool):
+            # 정수도 float로 계산 (임의 정밀도 정수 연산이 끝나지 않는 것을 막음)
+            try:
+                return float(node.value)
+            except OverflowError:
+                raise ValueError(f"숫자가 너무 큽니다: {ast.unparse(node)}")
+        if isinstance(node, ast.Name):
+            name = METRIC_ALIASES.get(node.id, node.id)
+            if name not in columns:
+                raise ValueError(f"알 수 없는 지표: {node.id} (사용 가능: {', '.join(columns)})")
+            return columns[name]
+        if isinstance(node, ast.BoolOp):
+            values = [np.asarray(ev(v), dtype=bool) for v in node.values]
+            combine = np.logical_and if isinstance(node.op, ast.And) else np.logical_or
+            result = values[0]
+            for v in values[1:]:
+                result = combine(result, v)
+            return result
+        if isinstance(node, ast.UnaryOp):
+            value = ev(node.operand)
+            if isinstance(node.op, ast.Not):
+                return np.logical_not(np.asarray(value, dtype=bool))
+            if isinstance(node.op, ast.USub):
+                return -value
+            if isinstance(node.op, ast.UAdd):
+                return value
+        if isinstance(node, ast.BinOp) and type(node.op) in _BIN_OPS:
+            left, right = ev(node.left), ev(node.right)
+            if isinstance(node.op, ast.Div):
+                return safe_divide(left, right)
+            if isinstance(node.op, ast.Pow) and np.nanmax(np.abs(np.asarray(right, dtype=float)), initial=0) > MAX_EXPONENT:
+                raise ValueError(f"지수가 너무 큽니다 (최대 {MAX_EXPONENT}): {ast.unparse(node)}")
+            with np.errstate(all="ignore"):
+                try:
+                    return _BIN_OPS[type(node.op)](np.float64(left) if np.isscalar(left) else left, right)
+                except (OverflowError, ZeroDivisionError) as e:
+                    raise ValueError(f"계산할 수 없는 식입니다: {ast.unparse(node)} ({e})")
+        if isinstance(node, ast.Compare):
+            left = ev(node.left)
+            result = None
+            for op, comparator in zip(node.ops, node.comparators):
+                if type(op) not in _CMP_OPS:
+                    break
+                right = ev(comparator)
+                with np.errstate(invalid="ignore"):
+                    part = _CMP_OPS[type(op)](left, right)
+                result = part if result is None else np.logical_and(result, part)
+                left = right
+            else:
+                return result
+        if isinstance(node, ast.Call) and isinstance(node.func, ast.Name) and node.func.id in _FUNCS and not node.keywords:
+            with np.errstate(all="ignore"):
+                return _FUNCS[node.func.id](*[ev(a) for a in node.args])
+        raise ValueError(f"허용되지 않은 식입니다: {ast.unparse(node)}")
+
+    try:
+        return ev(tree)
+    except (RecursionError, MemoryError):
+        raise ValueError(f"식이 너무 깊게 중첩되어 있습니다: {expr[:50]}...")
+
+
+def derive_metrics(current, previous=None):
+    """
+    표준 계정 넓은 표(기업별 한 행) -> 금액 지표(표시명 열) + ratios 엔진의 비율/파생 지표 열을 가진 표.
+    previous(전년도 같은 형식의 표)를 주면 성장률도 계산합니다.
+    """
+    return current.rename(columns=ACCOUNT_LABELS).join(compute_ratios(current, previous))
+
+
+class Screener:
+    """웨어하우스 데이터로 기업별 지표 표를 만들고 필터/순위식을 평가합니다."""
+
+    def __init__(self, store=warehouse):
+        self.store = store
+        self._universe_cache = {}
+
+    def universe(self, year, reprt_code="11011"):
+        """
+        해당 연도/보고서의 기업별 지표 표 (index: corp_code, 열: corp_name, stock_code, 지표들).
+        웨어하우스 데이터가 바뀌지 않았으면 메모리 캐시를 그대로 반환합니다.
+        """
+        year = int(year)
+        key = (self.store.stamp(), year, str(reprt_code))
+        cached = self._universe_cache.get(key)
+        if cached is not None:
+            return cached
+        rows = self.store.load(years=[year, year - 1], reprt_codes=[str(reprt_code)])
+        if rows.empty:
+            return pd.DataFrame()
+        wide = standardize(rows)
+        if year not in wide.index.get_level_values("bsns_year"):
+            return pd.DataFrame()
+        current = wide.xs(year, level="bsns_year").droplevel("reprt_code")
+        previous = None
+        if (year - 1) in wide.index.get_level_values("bsns_year"):
+            previous = wide.xs(year - 1, level="bsns_year").droplevel("reprt_code")
+        metrics = derive_metrics(current, previous)
+        names = rows.drop_duplicates("corp_code").set_index("corp_code")[["corp_name", "stock_code"]]
+        table = names.reindex(metrics.index).join(metrics)
+        self._universe_cache = {key: table}  # 최신 버전 하나만 유지
+        return table
+
+    def screen(self, year, where=None, rank_by=None, ascending=False, limit=20, reprt_code="11011"):
+        """
+        where(필터식)를 만족하는 기업을 rank_by(정렬식) 순으로 limit개 반환합니다.
+        rank_by를 주면 '순위'와 '정렬값' 열이 추가되고, 정렬값이 없는(NaN) 기업은 제외됩니다.
+        """
+        table = self.universe(year, reprt_code)
+        if table.empty:
+            return table
+        columns = {c: table[c].to_numpy(dtype=float) for c in table.columns if c not in ("corp_name", "stock_code")}
+        mask = np.ones(len(table), dtype=bool)
+        if where:
+            mask = np.broadcast_to(np.asarray(evaluate_expression(where, columns), dtype=bool), mask.shape)
+        result = table[mask]
+        if rank_by:
+            score = np.broadcast_to(np.asarray(evaluate_expression(rank_by, columns), dtype=float), mask.shape)[mask]
+            result = result.assign(정렬값=score)
+            result = result[~np.isnan(score)].sort_values("정렬값", ascending=ascending, kind="stable")
+            result.insert(0, "순위", np.arange(1, len(result) + 1))
+        return result.head(limit) if limit else result
+
+
+# 프로세스 전체에서 공유하는 스크리너
+screener = Screener()
+
+
+def format_metric(name, value):
+    """지표 값을 화면/에이전트 출력용 문자열로 변환 (금액은 억원, 비율은 %)"""
+    if value is None or pd.isna(value):
+        return "N/A"
+    if name in RATIO_METRICS:
+        return f"{value:.1f}%"
+    if name in AMOUNT_METRICS:
+        return f"{value / 1e8:,.0f}억원"
+    return f"{value:,.2f}"
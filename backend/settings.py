@@ -0,0 +1,31 @@
+import os
+
+# 오프라인 모드: 1이면 DART/OpenAI/SerpAPI 대신 로컬 대체 서비스(fake_services)를 사용합니다.
+OFFLINE_ENV = "LANGCHAIN_DART_OFFLINE"
+DART_PUBLIC_URL = "https://opendart.fss.or.kr/api"
+
+
+def offline_mode():
+    return os.getenv(OFFLINE_ENV, "").strip().lower() in ("1", "true", "yes", "on")
+
+
+def fake_latency_ms(service, default=0.0):
+    """대체 서비스별 응답 지연(ms). 예: FAKE_OPENAI_LATENCY_MS=1500"""
+    try:
+        return float(os.getenv(f"FAKE_{service.upper()}_LATENCY_MS", default))
+    except ValueError:
+        return default
+
+
+def dart_base_url():
+    """
+    DART API 기본 URL.
+    DART_BASE_URL이 지정되면 그 값을, 오프라인 모드면 로컬 가짜 DART 서버를 (필요시 띄우고) 사용합니다.
+    """
+    if os.getenv("DART_BASE_URL"):
+        return os.getenv("DART_BASE_URL").rstrip("/")
+    if offline_mode():
+        from fake_services.dart_server import ensure_running
+        host, port = ensure_running()
+        return f"http://{host}:{port}/api"
+    return DART_PUBLIC_URL
@@ -0,0 +1,127 @@
+"""
+LangChain 툴 결과 메모이제이션.
+
+에이전트가 파싱 재시도 등으로 같은 툴을 같은 인자로 여러 번 부르는 경우,
+정규화한 입력(앞뒤 공백/따옴표/'input=' 제거, 연속 공백 정리)을 키로 결과를 캐시해 바로 돌려줍니다.
+툴마다 TTL과 최대 크기를 따로 두고, 툴별 적중률은 tool_cache_stats()로 확인합니다.
+툴 본문에서 tag_result()로 (corp_code, 연도) 같은 태그를 달아 두면, 원본 데이터가 바뀌었을 때
+invalidate_tool_cache_tags()로 해당 결과만 지웁니다. (예: 신규 공시 동기화)
+
+@tool 아래에 붙이며, functools.wraps로 이름/설명(docstring)/시그니처를 그대로 유지합니다.
+
+    @tool
+    @memoize_tool(ttl=60 * 60)
+    def get_company_info_tool(corp_code: str) -> str:
+        ...
+"""
+import contextvars
+import functools
+import os
+import re
+import threading
+
+from backend.cache_utils import TTLCache
+
+TOOL_CACHE_TTL = int(os.getenv("TOOL_CACHE_TTL", 60 * 60))
+TOOL_CACHE_SIZE = int(os.getenv("TOOL_CACHE_SIZE", "256"))
+TOOL_CACHE_ENABLED = os.getenv("TOOL_CACHE", "1") != "0"
+
+# 툴 이름 -> TTLCache
+_caches = {}
+# 태그 -> {(툴 이름, 캐시 키)}
+_tagged = {}
+_tagged_lock = threading.Lock()
+# 실행 중인 툴 호출이 tag_result()로 모은 태그 (메모이즈된 호출 밖에서는 None)
+_call_tags = contextvars.ContextVar("tool_call_tags", default=None)
+
+
+def normalize_tool_input(value):
+    """"input='삼성전자  2023 '" -> '삼성전자 2023'"""
+    text = str(value).strip()
+    text = re.sub(r"^(input|corp_code|query)\s*=\s*", "", text)
+    text = text.strip().strip("'\"").strip()
+    return re.sub(r"\s+", " ", text)
+
+
+def is_cacheable_result(result):
+    """오류 응답은 캐시하지 않음 (일시적인 네트워크/한도 오류가 TTL 동안 남지 않도록)"""
+    return isinstance(result, str) and not result.startswith("[ERROR]")
+
+
+def memoize_tool(ttl=TOOL_CACHE_TTL, maxsize=TOOL_CACHE_SIZE, normalize=normalize_tool_input, version=None,
+                 cacheable=is_cacheable_result, prepare=None):
+    """
+    단일 문자열 입력 툴 함수용 메모이제이션 데코레이터.
+    normalize: 입력 -> 캐시 키 문자열 (툴마다 더 강한 정규화를 줄 수 있음)
+    prepare: 키 계산과 실행 전에 입력을 한 번 변환하는 함수 (예: 세션 문맥의 '그 회사', '작년' 풀기)
+    version: 인자 없는 함수. 반환값이 키에 포함되므로 원본 데이터가 바뀌면(예: 웨어하우스 stamp) 자동으로 새로 계산
+    cacheable: 결과를 캐시할지 판단하는 함수
+    툴 본문이 tag_result()로 단 태그는 결과를 캐시할 때 함께 기록됩니다.
+    """
+    def decorator(fn):
+        cache = _caches.setdefault(fn.__name__, TTLCache(maxsize=maxsize, ttl=ttl))
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            # LangChain은 툴 인자를 이름(예: corp_code=...)으로 넘기므로 유일한 인자 값을 키로 사용
+            if len(args) + len(kwargs) != 1:
+                return fn(*args, **kwargs)
+            value = args[0] if args else next(iter(kwargs.values()))
+            if prepare is not None:  # 입력 변환은 캐시를 끈 경우에도 적용
+                value = prepare(value)
+                args, kwargs = ((value,), {}) if args else ({}, {next(iter(kwargs)): value})
+            if not TOOL_CACHE_ENABLED:
+                return fn(*args, **kwargs)
+            key = (normalize(value), version() if version else None)
+            result = cache.get(key)
+            if result is not None:
+                return result
+            token = _call_tags.set([])
+            try:
+                result = fn(*args, **kwargs)
+                tags = _call_tags.get()
+            finally:
+                _call_tags.reset(token)
+            if cacheable(result):
+                cache.set(key, result)
+                with _tagged_lock:
+                    for tag in tags:
+                        _tagged.setdefault(tag, set()).add((fn.__name__, key))
+            return result
+
+        wrapper.cache = cache
+        return wrapper
+
+    return decorator
+
+
+def tool_cache_stats():
+    """툴별 캐시 크기/적중/미적중/적중률"""
+    return {name: cache.stats() for name, cache in _caches.items()}
+
+
+def tag_result(*tags):
+    """
+    실행 중인 메모이즈 툴 호출의 결과에 태그를 답니다. (툴 본문에서 이미 풀어 둔 corp_code 등을 그대로 사용)
+    결과가 캐시되지 않거나 메모이즈된 호출 밖이면 아무 일도 하지 않습니다.
+    """
+    current = _call_tags.get()
+    if current is not None:
+        current.extend(tags)
+
+
+def invalidate_tool_cache_tags(tags):
+    """태그가 달린 툴 캐시 항목을 지우고 지운 개수를 반환합니다."""
+    with _tagged_lock:
+        entries = set().union(*(_tagged.pop(tag, set()) for tag in tags))
+    removed = 0
+    for name, key in entries:
+        if name in _caches:
+            removed += _caches[name].pop_where(lambda k: k == key)
+    return removed
+
+
+def clear_tool_cache(name=None):
+    for tool_name, cache in _caches.items():
+        if name is None or tool_name == name:
+            cache.clear()
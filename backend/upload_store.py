@@ -0,0 +1,185 @@
+"""
+업로드 파일 저장소 (내용 해시 기준).
+
+업로드 파일을 청크 단위로 해시하며 .cache/uploads/<sha>/에 한 번만 저장하고,
+같은 내용이 다시 올라오면(rerun, 다른 세션) 저장된 파일과 파생 결과(CSV 통계 등)를 그대로 재사용합니다.
+PDF 페이지 텍스트/검색 인덱스/표처럼 다른 캐시 디렉터리에 sha 이름으로 저장되는 파생 결과도 함께 관리합니다.
+
+전체 크기가 UPLOAD_MAX_MB를 넘거나 UPLOAD_MAX_AGE_DAYS 동안 쓰이지 않은 항목은
+마지막 사용 시각이 오래된 순(LRU)으로 지웁니다.
+
+    upload = upload_store.put(uploaded_file, uploaded_file.name)
+    upload.path                                        # 저장된 파일 경로
+    upload_store.artifact(upload.sha, "csv_stats.pkl", lambda: analyze_csv(upload.path))
+"""
+import hashlib
+import json
+import os
+import pickle
+import shutil
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+
+from backend.pdf_extract import PDF_TEXT_DIR, forget_document
+from backend.pdf_index import forget_pdf_index
+from backend.pdf_tables import forget_tables
+
+UPLOAD_DIR = os.getenv("UPLOAD_STORE_DIR", os.path.join(".cache", "uploads"))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_MB", "2048")) * 1024 * 1024
+UPLOAD_MAX_AGE = int(os.getenv("UPLOAD_MAX_AGE_DAYS", "30")) * 24 * 60 * 60
+# 업로드와 같은 sha 이름으로 파생 결과를 저장하는 캐시 디렉터리 (삭제 시 함께 지움)
+DERIVED_DIRS = (PDF_TEXT_DIR,)
+COPY_CHUNK = 1 << 20
+
+
+@dataclass
+class StoredUpload:
+    sha: str
+    path: str
+    name: str
+    size: int
+
+
+def _dir_size(path):
+    total = 0
+    for root, _dirs, files in os.walk(path):
+        for f in files:
+            try:
+                total += os.path.getsize(os.path.join(root, f))
+            except OSError:
+                pass
+    return total
+
+
+class UploadStore:
+    def __init__(self, root=UPLOAD_DIR, max_bytes=UPLOAD_MAX_BYTES, max_age=UPLOAD_MAX_AGE, derived_dirs=DERIVED_DIRS):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.derived_dirs = derived_dirs
+        self._lock = threading.Lock()
+
+    def _entry_dir(self, sha):
+        return os.path.join(self.root, sha)
+
+    def _meta_path(self, sha):
+        return os.path.join(self._entry_dir(sha), "meta.json")
+
+    def touch(self, sha):
+        """마지막 사용 시각 갱신 (meta.json의 수정 시각)"""
+        try:
+            os.utime(self._meta_path(sha))
+        except OSError:
+            pass
+
+    def put(self, fileobj, name):
+        """
+        파일 객체(Streamlit UploadedFile 등)를 읽으며 sha256을 계산해 저장하고 StoredUpload를 반환합니다.
+        같은 내용이 이미 있으면 새로 쓰지 않습니다.
+        """
+        os.makedirs(self.root, exist_ok=True)
+        tmp = os.path.join(self.root, f".incoming-{uuid.uuid4().hex}")
+        h = hashlib.sha256()
+        size = 0
+        if hasattr(fileobj, "seek"):
+            fileobj.seek(0)
+        with open(tmp, "wb") as out:
+            for chunk in iter(lambda: fileobj.read(COPY_CHUNK), b""):
+                h.update(chunk)
+                out.write(chunk)
+                size += len(chunk)
+        sha = h.hexdigest()
+        ext = os.path.splitext(name)[1].lower()
+        path = os.path.join(self._entry_dir(sha), f"source{ext}")
+        with self._lock:
+            if os.path.exists(path):
+                os.remove(tmp)
+            else:
+                os.makedirs(self._entry_dir(sha), exist_ok=True)
+                os.replace(tmp, path)
+                with open(self._meta_path(sha), "w", encoding="utf-8") as f:
+                    json.dump({"name": name, "size": size, "created": time.time()}, f, ensure_ascii=False)
+        self.touch(sha)
+        self.evict(keep=sha)
+        return StoredUpload(sha, path, name, size)
+
+    def get(self, sha):
+        """sha -> StoredUpload (없으면 None)"""
+        meta_path = self._meta_path(sha)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path, encoding="utf-8") as f:
+            meta = json.load(f)
+        ext = os.path.splitext(meta["name"])[1].lower()
+        self.touch(sha)
+        return StoredUpload(sha, os.path.join(self._entry_dir(sha), f"source{ext}"), meta["name"], meta["size"])
+
+    def artifact(self, sha, name, build):
+        """
+        업로드별 파생 결과를 <sha>/artifacts/<name>(pickle)에서 읽고, 없으면 build()로 만들어 저장합니다.
+        다른 세션/프로세스 재시작 후에도 같은 파일이면 다시 계산하지 않습니다.
+        """
+        path = os.path.join(self._entry_dir(sha), "artifacts", name)
+        if os.path.exists(path):
+            try:
+                with open(path, "rb") as f:
+                    return pickle.load(f)
+            except Exception as e:  # 버전이 바뀌어 읽을 수 없으면 다시 만듦
+                print(f"[ERROR] 업로드 파생 결과 로드 실패 ({name}): {e}")
+        value = build()
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{uuid.uuid4().hex}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(value, f)
+        os.replace(tmp, path)
+        self.touch(sha)
+        return value
+
+    def entries(self):
+        """[(sha, 마지막 사용 시각, 크기(파생 결과 포함))]"""
+        if not os.path.isdir(self.root):
+            return []
+        out = []
+        for sha in os.listdir(self.root):
+            meta_path = self._meta_path(sha)
+            if not os.path.exists(meta_path):
+                continue
+            size = _dir_size(self._entry_dir(sha)) + sum(
+                _dir_size(os.path.join(d, sha)) for d in self.derived_dirs)
+            out.append((sha, os.path.getmtime(meta_path), size))
+        return out
+
+    def remove(self, sha):
+        shutil.rmtree(self._entry_dir(sha), ignore_errors=True)
+        for d in self.derived_dirs:
+            shutil.rmtree(os.path.join(d, sha), ignore_errors=True)
+        # 지운 디렉터리를 가리키는 메모리 캐시 객체도 함께 제거
+        forget_document(sha)
+        forget_pdf_index(sha)
+        forget_tables(sha)
+
+    def evict(self, keep=None):
+        """오래 쓰지 않은 항목과, 전체 크기가 한도를 넘는 만큼 LRU 순으로 지우고 지운 sha 목록을 반환합니다."""
+        with self._lock:
+            now = time.time()
+            entries = sorted(self.entries(), key=lambda e: e[1])
+            total = sum(size for _, _, size in entries)
+            removed = []
+            for sha, last_used, size in entries:
+                if sha == keep:
+                    continue
+                if now - last_used > self.max_age or total > self.max_bytes:
+                    self.remove(sha)
+                    removed.append(sha)
+                    total -= size
+            return removed
+
+    def stats(self):
+        entries = self.entries()
+        return {"entries": len(entries), "bytes": sum(size for _, _, size in entries), "max_bytes": self.max_bytes}
+
+
+# 프로세스 전체에서 공유하는 업로드 저장소
+upload_store = UploadStore()
@@ -0,0 +1,392 @@
+"""
+로컬 재무 데이터 웨어하우스 (parquet).
+
+상장사 전체의 사업/반기/분기보고서 재무제표를 (기업, 기간, 계정) 한 행 단위의 숫자 금액으로
+.cache/warehouse/statements/bsns_year=YYYY/*.parquet에 쌓아 두고, 업계 순위/스크리닝 같은
+여러 기업 질의를 DART 호출 없이 로컬에서 처리합니다.
+
+- 수집 작업 단위는 (corp_code, bsns_year, reprt_code)이며 결과는 checkpoint.json에 기록됩니다.
+  중간에 멈춰도 다시 실행하면 끝난 작업은 건너뛰고 이어서 수집합니다.
+- DART 호출은 request_scheduler의 batch 우선순위로 보내므로 사용자 요청을 막지 않고,
+  max_requests(일일 한도)나 DART 한도 초과 응답(020)을 만나면 체크포인트를 남기고 멈춥니다.
+- 같은 작업을 다시 수집하면 새 행이 추가되고, 읽을 때 가장 최근 수집분만 남깁니다. (compact()로 정리)
+
+예시:
+    python -m backend.warehouse ingest --years 2024 2023 --reprt-codes 11011 11014 --max-requests 5000
+    python -m backend.warehouse status
+    python -m backend.warehouse compact
+"""
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from backend import dart_cache
+from backend.accounts import parse_amounts
+from backend.company_catalog import DEFAULT_YEARS
+from backend.request_scheduler import scheduler, BATCH
+
+WAREHOUSE_DIR = os.getenv("FIN_WAREHOUSE_DIR", os.path.join(".cache", "warehouse"))
+REPORT_CODES = ("11011", "11012", "11013", "11014")  # 사업, 반기, 1분기, 3분기
+FS_DIVS = ("CFS", "OFS")  # 연결 재무제표가 없으면 별도 재무제표로 대체
+INGEST_WORKERS = int(os.getenv("WAREHOUSE_INGEST_WORKERS", "4"))
+DAILY_QUOTA = int(os.getenv("DART_DAILY_QUOTA", "20000"))
+# '데이터 없음'(013) 작업은 아직 공시 전일 수 있으므로 이 기간(초)이 지나면 다시 확인
+NO_DATA_RETRY = 7 * 24 * 60 * 60
+
+SCHEMA = pa.schema([
+    ("corp_code", pa.string()),
+    ("corp_name", pa.string()),
+    ("stock_code", pa.string()),
+    ("bsns_year", pa.int16()),
+    ("reprt_code", pa.string()),
+    ("fs_div", pa.string()),
+    ("sj_div", pa.string()),
+    ("account_id", pa.string()),
+    ("account_nm", pa.string()),
+    ("amount", pa.float64()),      # 당기 금액 (thstrm_amount)
+    ("add_amount", pa.float64()),  # 당기 누적 금액 (thstrm_add_amount, 분기/반기 손익계산서)
+    ("currency", pa.string()),
+    ("rcept_no", pa.string()),
+    ("ingested_at", pa.float64()),
+])
+# 파일에는 bsns_year를 디렉터리(bsns_year=YYYY) 이름으로만 저장
+PART_SCHEMA = SCHEMA.remove(SCHEMA.get_field_index("bsns_year"))
+ROW_KEY = ["corp_code", "bsns_year", "reprt_code", "sj_div", "account_id", "account_nm"]
+
+
+class QuotaExceeded(Exception):
+    """DART 일일 요청 한도 초과 (020 응답 또는 max_requests 소진)"""
+
+
+def task_key(corp_code, bsns_year, reprt_code):
+    return f"{corp_code}|{bsns_year}|{reprt_code}"
+
+
+def statements_to_rows(fs_data, corp_code, corp_name, stock_code, bsns_year, reprt_code, fs_div):
+    """fnlttSinglAcntAll.json 응답 -> SCHEMA 형식 DataFrame (당기 금액만)"""
+    df = pd.DataFrame(fs_data.get("list", []))
+    if df.empty:
+        return df
+    for col in ("sj_div", "account_id", "account_nm", "thstrm_amount", "thstrm_add_amount", "currency", "rcept_no"):
+        if col not in df.columns:
+            df[col] = None
+    rows = pd.DataFrame({
+        "corp_code": str(corp_code),
+        "corp_name": corp_name,
+        "stock_code": stock_code,
+        "bsns_year": int(bsns_year),
+        "reprt_code": str(reprt_code),
+        "fs_div": fs_div,
+        "sj_div": df["sj_div"].astype(str),
+        "account_id": df["account_id"].fillna("").astype(str),
+        "account_nm": df["account_nm"].fillna("").astype(str).str.strip(),
+        "amount": parse_amounts(df["thstrm_amount"]),
+        "add_amount": parse_amounts(df["thstrm_add_amount"]),
+        "currency": df["currency"].fillna("KRW").astype(str),
+        "rcept_no": df["rcept_no"].fillna("").astype(str),
+        "ingested_at": time.time(),
+    })
+    return rows.drop_duplicates(subset=ROW_KEY, keep="first")
+
+
+def listed_companies():
+    """기업 코드 테이블에서 상장사(stock_code 있음)만 corp_code/corp_name/stock_code DataFrame으로 반환"""
+    df = dart_cache.get_dart_api().corp_code_df
+    stock = df["stock_code"].fillna("").astype(str).str.strip()
+    return df.loc[stock != "", ["corp_code", "corp_name", "stock_code"]].reset_index(drop=True)
+
+
+class FinancialWarehouse:
+    """parquet 재무 웨어하우스. ingest()로 수집하고 load()로 조회합니다."""
+
+    def __init__(self, root=WAREHOUSE_DIR):
+        self.root = root
+        self.data_dir = os.path.join(root, "statements")
+        self.checkpoint_path = os.path.join(root, "checkpoint.json")
+        self._lock = threading.Lock()
+        self._load_cache = {}
+
+    # --- 체크포인트 ---
+    def _read_checkpoint(self):
+        if not os.path.exists(self.checkpoint_path):
+            return {"version": 0, "tasks": {}}
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def _write_checkpoint(self, checkpoint):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.checkpoint_path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(checkpoint, f, ensure_ascii=False)
+        os.replace(tmp, self.checkpoint_path)
+
+    def version(self):
+        """데이터가 바뀔 때마다 증가하는 버전"""
+        return self._read_checkpoint().get("version", 0)
+
+    def stamp(self):
+        """조회 캐시 무효화용 표식. 데이터를 쓸 때마다 체크포인트도 다시 쓰므로 그 수정 시각을 사용합니다."""
+        try:
+            return os.stat(self.checkpoint_path).st_mtime_ns
+        except FileNotFoundError:
+            return 0
+
+    def mark_stale(self, corp_code, bsns_year=None, reprt_code=None):
+        """새 공시 등으로 다시 수집해야 하는 작업을 표시하고, 표시한 개수를 반환합니다."""
+        return self.mark_stale_many([(corp_code, bsns_year, reprt_code)])
+
+    def mark_stale_many(self, targets):
+        """
+        [(corp_code, bsns_year|None, reprt_code|None), ...]에 해당하는 작업을 한 번에 표시하고, 표시한 작업 수를 반환합니다.
+        체크포인트는 호출당 한 번만 읽고 씁니다. (공시 동기화가 수백 건을 한꺼번에 넘겨도 파일을 건마다 다시 쓰지 않도록)
+        """
+        by_corp = {}
+        for corp_code, bsns_year, reprt_code in targets:
+            by_corp.setdefault(str(corp_code), []).append(
+                (None if bsns_year is None else str(bsns_year), None if reprt_code is None else str(reprt_code)))
+        if not by_corp:
+            return 0
+        with self._lock:
+            checkpoint = self._read_checkpoint()
+            count = 0
+            for key, task in checkpoint["tasks"].items():
+                c, y, r = key.split("|")
+                if any((year is None or y == year) and (reprt is None or r == reprt) for year, reprt in by_corp.get(c, ())):
+                    task["stale"] = True
+                    count += 1
+            if count:
+                self._write_checkpoint(checkpoint)
+            return count
+
+    @staticmethod
+    def _needs_fetch(task, now):
+        if task is None or task.get("stale"):
+            return True
+        if task["status"] == "000":
+            return False
+        if task["status"] == "013":
+            return now - task.get("at", 0) > NO_DATA_RETRY
+        return True  # 오류/한도 초과 등은 다시 시도
+
+    # --- 수집 ---
+    def _fetch(self, corp_code, bsns_year, reprt_code, budget):
+        """CFS -> OFS 순으로 조회해 (status, fs_div, 응답)을 반환합니다. 호출마다 budget을 하나씩 씁니다."""
+        dart = dart_cache.get_dart_api()
+        fs_data, fs_div = {}, FS_DIVS[0]
+        for fs_div in FS_DIVS:
+            with budget["lock"]:
+                if budget["left"] <= 0:
+                    raise QuotaExceeded("max_requests 소진")
+                budget["left"] -= 1
+            fs_data = scheduler.call("dart", dart.get_financial_statements, corp_code,
+                                     bsns_year=str(bsns_year), reprt_code=reprt_code, fs_div=fs_div,
+                                     priority=BATCH)
+            status = fs_data.get("status") if isinstance(fs_data, dict) else None
+            if status == "020":
+                raise QuotaExceeded(fs_data.get("message", "DART 요청 한도 초과"))
+            if status != "013":
+                return status, fs_div, fs_data
+        return "013", fs_div, fs_data
+
+    def _flush(self, frames, done):
+        """버퍼의 행을 parquet 파일로 쓰고 나서 체크포인트를 갱신합니다. (쓰기 도중 중단돼도 중복만 생김)"""
+        if frames:
+            df = pd.concat(frames, ignore_index=True)
+            for year, part in df.groupby("bsns_year"):
+                part_dir = os.path.join(self.data_dir, f"bsns_year={year}")
+                os.makedirs(part_dir, exist_ok=True)
+                table = pa.Table.from_pandas(part.drop(columns=["bsns_year"]), schema=PART_SCHEMA, preserve_index=False)
+                pq.write_table(table, os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet"))
+        with self._lock:
+            checkpoint = self._read_checkpoint()  # 수집 중 mark_stale()된 다른 작업 표시를 유지
+            checkpoint["tasks"].update(done)
+            checkpoint["version"] = checkpoint.get("version", 0) + 1
+            self._write_checkpoint(checkpoint)
+        frames.clear()
+        done.clear()
+        self._load_cache.clear()
+
+    def ingest(self, years=None, reprt_codes=("11011",), corp_codes=None, max_workers=INGEST_WORKERS,
+               max_requests=DAILY_QUOTA, flush_every=200, progress=None):
+        """
+        (기업 × 연도 × 보고서) 작업 중 아직 수집하지 않았거나 다시 수집해야 하는 것만 동시에 수집합니다.
+        corp_codes를 주지 않으면 상장사 전체를 대상으로 합니다. 수집 결과 리포트(dict)를 반환합니다.
+        """
+        years = [int(y) for y in (years or DEFAULT_YEARS)]
+        companies = listed_companies()
+        if corp_codes is not None:
+            companies = companies[companies["corp_code"].isin([str(c) for c in corp_codes])]
+        checkpoint = self._read_checkpoint()
+        now = time.time()
+        tasks = [
+            (row.corp_code, row.corp_name, row.stock_code, y, r)
+            for row in companies.itertuples(index=False) for y in years for r in reprt_codes
+            if self._needs_fetch(checkpoint["tasks"].get(task_key(row.corp_code, y, r)), now)
+        ]
+        report = {"planned": len(tasks), "fetched": 0, "no_data": 0, "failed": 0, "rows": 0,
+                  "requests": 0, "stopped": None}
+        budget = {"left": max_requests, "lock": threading.Lock()}
+        frames, done = [], {}
+        started = time.perf_counter()
+
+        def work(task):
+            corp_code, corp_name, stock_code, year, reprt_code = task
+            status, fs_div, fs_data = self._fetch(corp_code, year, reprt_code, budget)
+            rows = None
+            if status == "000":
+                rows = statements_to_rows(fs_data, corp_code, corp_name, stock_code, year, reprt_code, fs_div)
+            return task, status, fs_div, rows
+
+        pool = ThreadPoolExecutor(max_workers=max_workers)
+        futures = [pool.submit(work, t) for t in tasks]
+        try:
+            for i, future in enumerate(as_completed(futures), start=1):
+                if future.cancelled():
+                    continue
+                try:
+                    (corp_code, _, _, year, reprt_code), status, fs_div, rows = future.result()
+                except QuotaExceeded as e:
+                    report["stopped"] = str(e)
+                    for f in futures:
+                        f.cancel()
+                    continue
+                except Exception as e:
+                    report["failed"] += 1
+                    print(f"[ERROR] warehouse ingest: {e}")
+                    continue
+                done[task_key(corp_code, year, reprt_code)] = {"status": status, "fs_div": fs_div, "at": time.time()}
+                if status == "000":
+                    report["fetched"] += 1
+                    if rows is not None and not rows.empty:
+                        frames.append(rows)
+                        report["rows"] += len(rows)
+                else:
+                    report["no_data" if status == "013" else "failed"] += 1
+                if len(done) >= flush_every:
+                    self._flush(frames, done)
+                if progress:
+                    progress(i, len(tasks))
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+            if done:
+                self._flush(frames, done)
+        report["requests"] = max_requests - budget["left"]
+        report["duration_s"] = round(time.perf_counter() - started, 2)
+        print(f"[LOG] [warehouse] {report}")
+        return report
+
+    # --- 조회 ---
+    def _files(self):
+        return sorted(glob.glob(os.path.join(self.data_dir, "bsns_year=*", "*.parquet")))
+
+    def load(self, years=None, reprt_codes=None, corp_codes=None, sj_divs=None, account_ids=None, columns=None):
+        """
+        조건에 맞는 행을 DataFrame으로 반환합니다. (같은 키는 가장 최근 수집분만 유지)
+        결과는 데이터 버전별로 메모리에 캐시되므로 반복 조회는 즉시 반환됩니다.
+        """
+        if not self._files():
+            return pd.DataFrame(columns=SCHEMA.names)
+        key = (self.stamp(), tuple(sorted(map(int, years))) if years else None,
+               tuple(reprt_codes or ()), tuple(corp_codes or ()), tuple(sj_divs or ()),
+               tuple(account_ids or ()), tuple(columns or ()))
+        cached = self._load_cache.get(key)
+        if cached is not None:
+            return cached
+        dataset = ds.dataset(self.data_dir, format="parquet", partitioning="hive")
+        expr = None
+        for field, values in (("bsns_year", [int(y) for y in years] if years else None),
+                              ("reprt_code", reprt_codes), ("corp_code", corp_codes),
+                              ("sj_div", sj_divs), ("account_id", account_ids)):
+            if values:
+                cond = ds.field(field).isin([v if field == "bsns_year" else str(v) for v in values])
+                expr = cond if expr is None else expr & cond
+        table = dataset.to_table(filter=expr)
+        df = table.to_pandas()
+        df["bsns_year"] = df["bsns_year"].astype(int)
+        # 다시 수집된 작업은 이전 수집분 전체를 대체 (새 응답에서 빠진 계정이 남지 않도록 최신 회차만 유지)
+        latest = df.groupby(["corp_code", "bsns_year", "reprt_code"])["ingested_at"].transform("max")
+        df = df[df["ingested_at"] == latest]
+        df = df[list(columns) if columns else SCHEMA.names].reset_index(drop=True)
+        if len(self._load_cache) > 32:
+            self._load_cache.clear()
+        self._load_cache[key] = df
+        return df
+
+    def compact(self):
+        """연도 파티션별로 파일을 하나로 합치고 중복(이전 수집분)을 제거합니다."""
+        for part_dir in sorted(glob.glob(os.path.join(self.data_dir, "bsns_year=*"))):
+            files = glob.glob(os.path.join(part_dir, "*.parquet"))
+            if len(files) <= 1:
+                continue
+            year = int(part_dir.rsplit("=", 1)[1])
+            df = self.load(years=[year]).drop(columns=["bsns_year"])
+            table = pa.Table.from_pandas(df, schema=PART_SCHEMA, preserve_index=False)
+            pq.write_table(table, os.path.join(part_dir, f"part-{uuid.uuid4().hex}.parquet"))
+            for path in files:
+                os.remove(path)
+            print(f"[LOG] [warehouse] compact {part_dir}: {len(files)} -> 1 files")
+        with self._lock:
+            checkpoint = self._read_checkpoint()
+            checkpoint["version"] = checkpoint.get("version", 0) + 1
+            self._write_checkpoint(checkpoint)
+        self._load_cache.clear()
+
+    def status(self):
+        checkpoint = self._read_checkpoint()
+        counts = {}
+        for task in checkpoint["tasks"].values():
+            label = "stale" if task.get("stale") else task["status"]
+            counts[label] = counts.get(label, 0) + 1
+        files = self._files()
+        return {
+            "root": self.root,
+            "version": checkpoint.get("version", 0),
+            "tasks": counts,
+            "files": len(files),
+            "bytes": sum(os.path.getsize(p) for p in files),
+        }
+
+
+# 프로세스 전체에서 공유하는 웨어하우스
+warehouse = FinancialWarehouse()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 재무 데이터 웨어하우스")
+    sub = parser.add_subparsers(dest="command", required=True)
+    p_ingest = sub.add_parser("ingest", help="상장사 재무제표 수집 (중단 후 재실행 시 이어서 수집)")
+    p_ingest.add_argument("--years", nargs="*")
+    p_ingest.add_argument("--reprt-codes", nargs="*", default=["11011"], choices=REPORT_CODES)
+    p_ingest.add_argument("--corp-codes", nargs="*")
+    p_ingest.add_argument("--workers", type=int, default=INGEST_WORKERS)
+    p_ingest.add_argument("--max-requests", type=int, default=DAILY_QUOTA)
+    sub.add_parser("status", help="수집 현황")
+    sub.add_parser("compact", help="파티션별 파일 합치기/중복 제거")
+    args = parser.parse_args(argv)
+
+    if args.command == "ingest":
+        def progress(i, total):
+            if i % 100 == 0 or i == total:
+                print(f"[LOG] [warehouse] {i}/{total}")
+        result = warehouse.ingest(args.years, tuple(args.reprt_codes), args.corp_codes,
+                                  max_workers=args.workers, max_requests=args.max_requests, progress=progress)
+    elif args.command == "compact":
+        warehouse.compact()
+        result = warehouse.status()
+    else:
+        result = warehouse.status()
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+대표 기업 캐시 워밍업.
+
+프로세스 시작 시(또는 주기적으로) TOP_COMPANIES의 기업 코드를 확인하고,
+company.json과 최근 사업보고서 재무제표를 dart_cache에 미리 채워 둡니다.
+
+dart_cache는 프로세스 메모리 캐시이므로 앱에서는 start_background_warmup()으로 같은 프로세스 안에서 실행하고,
+CLI는 워밍업 소요 시간과 커버리지를 측정할 때 사용합니다.
+
+예시:
+    python -m backend.warmup
+    python -m backend.warmup --years 2024 2023 --fs-divs CFS OFS
+"""
+import argparse
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from backend import dart_cache
+from backend.company_catalog import TOP_COMPANIES, DEFAULT_YEARS
+from backend.request_scheduler import BATCH
+
+# 워밍업 동시 작업 수. DART 요청 속도는 request_scheduler의 batch 우선순위(공유 속도 제한)를 따릅니다.
+WARMUP_WORKERS = int(os.getenv("DART_WARMUP_WORKERS", "4"))
+# 반복 주기(초, 0이면 시작 시 한 번만)와 비활성화 스위치(DART_WARMUP=0)
+WARMUP_INTERVAL = int(os.getenv("DART_WARMUP_INTERVAL", "0"))
+WARMUP_ENABLED = os.getenv("DART_WARMUP", "1") != "0"
+
+_last_report = None
+_background_started = False
+_background_lock = threading.Lock()
+
+
+def run_warmup(companies=None, years=None, fs_divs=("CFS",), reprt_code="11011",
+               max_workers=WARMUP_WORKERS):
+    """
+    기업 코드 확인 -> (기업개황, 연도 × fs_div 재무제표) 조회를 동시에 수행하고 결과 리포트(dict)를 반환합니다.
+    이미 캐시에 있는 항목은 다시 요청하지 않고, DART 호출은 사용자/프리페치 요청에 양보하는 batch 우선순위로 보냅니다.
+    """
+    global _last_report
+    companies = list(companies or TOP_COMPANIES)
+    years = [str(y) for y in (years or DEFAULT_YEARS)]
+    started = time.perf_counter()
+    report = {
+        "started_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+        "companies": len(companies),
+        "years": years,
+        "resolved": 0,
+        "unresolved": [],
+        "company_info": {"ok": 0, "failed": 0},
+        "statements": {"cached": 0, "fetched": 0, "no_data": 0, "failed": 0},
+    }
+    lock = threading.Lock()
+
+    def count(section, key):
+        with lock:
+            report[section][key] += 1
+
+    # 1. 기업 코드 확인 (로컬 기업 테이블 매칭, 동시 수행. 후보 중 고르는 LLM 호출도 batch 우선순위)
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        resolved = list(pool.map(lambda name: dart_cache.resolve_corp_code(name, priority=BATCH), companies))
+    corp_codes = []
+    for name, info in zip(companies, resolved):
+        corp_code = info.get("corp_code") if isinstance(info, dict) else None
+        if corp_code:
+            corp_codes.append(corp_code)
+        else:
+            report["unresolved"].append(name)
+    report["resolved"] = len(corp_codes)
+
+    # 2. 기업개황 + 재무제표 (공유 속도 제한 안에서 동시 수행)
+    def warm_company_info(corp_code):
+        info = dart_cache.get_company_info(corp_code, priority=BATCH)
+        count("company_info", "ok" if info.get("status") == "000" else "failed")
+
+    def warm_statements(job):
+        corp_code, year, fs_div = job
+        if dart_cache.is_statement_cached(corp_code, year, reprt_code, fs_div):
+            count("statements", "cached")
+            return
+        fs = dart_cache.get_statements(corp_code, year, reprt_code=reprt_code, fs_div=fs_div, priority=BATCH)
+        status = fs.get("status") if isinstance(fs, dict) else None
+        count("statements", "fetched" if status == "000" else "no_data" if status == "013" else "failed")
+
+    jobs = [(c, y, fs) for c in corp_codes for y in years for fs in fs_divs]
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        list(pool.map(warm_company_info, corp_codes))
+        list(pool.map(warm_statements, jobs))
+
+    report["duration_s"] = round(time.perf_counter() - started, 2)
+    _last_report = report
+    print(f"[LOG] [warmup] {report['resolved']}/{report['companies']}개 기업, "
+          f"재무제표 {report['statements']}, {report['duration_s']}초")
+    return report
+
+
+def last_warmup_report():
+    """가장 최근 워밍업 결과 (아직 실행 전이면 None)"""
+    return _last_report
+
+
+def start_background_warmup(interval=WARMUP_INTERVAL, **kwargs):
+    """
+    워밍업을 백그라운드 스레드에서 한 번 실행합니다. interval(초)을 주면 그 주기로 반복합니다.
+    프로세스당 한 번만 시작되므로 Streamlit rerun마다 호출해도 안전합니다.
+    """
+    global _background_started
+    if not WARMUP_ENABLED:
+        return False
+    with _background_lock:
+        if _background_started:
+            return False
+        _background_started = True
+
+    def loop():
+        while True:
+            try:
+                run_warmup(**kwargs)
+            except Exception as e:
+                print(f"[ERROR] warmup: {e}")
+            if not interval:
+                break
+            time.sleep(interval)
+
+    threading.Thread(target=loop, name="cache-warmup", daemon=True).start()
+    return True
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="대표 기업 DART 캐시 워밍업")
+    parser.add_argument("--companies", nargs="*")
+    parser.add_argument("--years", nargs="*")
+    parser.add_argument("--fs-divs", nargs="*", default=["CFS"])
+    parser.add_argument("--workers", type=int, default=WARMUP_WORKERS)
+    args = parser.parse_args(argv)
+    report = run_warmup(args.companies, args.years, tuple(args.fs_divs),
+                        max_workers=args.workers)
+    print(json.dumps(report, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
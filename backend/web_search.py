@@ -0,0 +1,38 @@
+import os
+from backend.settings import offline_mode, fake_latency_ms
+
+
+def _google_search(params):
+    if offline_mode():
+        from fake_services.search import FakeGoogleSearch
+        return FakeGoogleSearch(params, latency_ms=fake_latency_ms("serpapi"))
+    from serpapi import GoogleSearch
+    return GoogleSearch(params)
+
+
+def web_search(query, num_results=3):
+    """
+    SerpAPI(Google) 검색 결과 상위 num_results개를 [{'title', 'snippet', 'link'}] 형태로 반환합니다.
+    오프라인 모드에서는 가짜 검색 백엔드를 사용합니다.
+    """
+    api_key = os.getenv("SERPAPI_API_KEY")
+    if not api_key and not offline_mode():
+        return []
+    params = {
+        "q": query,
+        "hl": "ko",
+        "gl": "kr",
+        "api_key": api_key,
+        "num": num_results
+    }
+    search = _google_search(params)
+    results = search.get_dict()
+    organic_results = results.get("organic_results", [])
+    return [
+        {
+            "title": item.get("title"),
+            "snippet": item.get("snippet"),
+            "link": item.get("link")
+        }
+        for item in organic_results[:num_results]
+    ]
@@ -0,0 +1,81 @@
+import glob
+import json
+import os
+import re
+
+# 기존 텍스트 로그(logs/*.log)의 필드 키
+LEGACY_KEYS = ("INPUT", "OUTPUT", "COMPANY", "YEAR", "SJ_DIV")
+_TS_RE = re.compile(r"^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2}:\d{2})\]$")
+_FIELD_RE = re.compile(rf"^({'|'.join(LEGACY_KEYS)}):\s?(.*)$")
+
+
+def stream_name(path):
+    """logs/page2_qa.log, logs/page2_qa.jsonl.1 -> 'page2_qa'"""
+    name = os.path.basename(path)
+    return re.sub(r"\.(log|jsonl)(\.\d+)?$", "", name)
+
+
+def parse_legacy_log(path):
+    """
+    '[시각]\\nINPUT: ...\\nOUTPUT: ...\\n---' 형식의 텍스트 로그를 레코드 리스트로 변환합니다.
+    OUTPUT처럼 여러 줄에 걸친 값은 다음 키가 나올 때까지 이어 붙입니다.
+    """
+    stream = stream_name(path)
+    records = []
+    record, key = None, None
+    with open(path, encoding="utf-8") as f:
+        for raw in f:
+            line = raw.rstrip("\n")
+            ts = _TS_RE.match(line.strip())
+            if ts:
+                if record:
+                    records.append(record)
+                record, key = {"stream": stream, "ts": ts.group(1)}, None
+                continue
+            if record is None:
+                continue
+            if line.strip() == "---":
+                records.append(record)
+                record, key = None, None
+                continue
+            field = _FIELD_RE.match(line)
+            if field:
+                key = field.group(1).lower()
+                record[key] = field.group(2)
+            elif key:
+                record[key] += "\n" + line
+    if record:
+        records.append(record)
+    return records
+
+
+def parse_jsonl_log(path):
+    records = []
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    return records
+
+
+def load_query_logs(log_dir="logs", streams=None):
+    """
+    logs/ 아래의 텍스트 로그와 JSONL 로그를 모두 읽어 시간순 레코드 리스트로 반환합니다.
+    streams를 주면 해당 스트림(page1_qa 등)만 반환합니다.
+    """
+    records = []
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.log"))):
+        records.extend(parse_legacy_log(path))
+    for path in sorted(glob.glob(os.path.join(log_dir, "*.jsonl*"))):
+        records.extend(parse_jsonl_log(path))
+    if streams:
+        records = [r for r in records if r.get("stream") in streams]
+    # 입력값이 없는 레코드는 재생할 수 없으므로 제외
+    records = [r for r in records if r.get("input") or r.get("company")]
+    records.sort(key=lambda r: str(r.get("ts", "")).replace("T", " "))
+    return records
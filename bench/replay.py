@@ -0,0 +1,281 @@
+"""
+실사용 로그(logs/*.log, logs/*.jsonl) 재생 부하 테스트.
+
+예시:
+    python -m bench.replay --concurrency 8 --repeat 5 --latency-scale 0.1
+    python -m bench.replay --output bench_result.json
+    python -m bench.replay --baseline bench_result.json --max-regression 0.2
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+
+from bench.log_replay import load_query_logs
+from bench.standins import LatencyModel, StandInDartAPI, StandInChatModel, standin_web_search
+from fake_services.dart_fixtures import synthetic_statements
+from backend.company_analysis_tools import parse_financial_query, answer_from_page_context
+from backend.qa_cache import SemanticQACache
+from backend import dart_cache
+from frontend.financial_analysis_display import (
+    pretty_financial_table,
+    financial_df_to_context_text,
+    generate_income_statement_summary,
+    generate_balance_sheet_summary,
+    generate_cash_flow_summary,
+)
+
+SUMMARY_BUILDERS = {
+    "IS": generate_income_statement_summary,
+    "BS": generate_balance_sheet_summary,
+    "CF": generate_cash_flow_summary,
+}
+
+
+def percentile(sorted_values, q):
+    """정렬된 값에서 q(0~100) 백분위수 (최근접 순위 방식)"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(q / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class StageRecorder:
+    """(스트림, 단계)별 소요 시간(ms)을 스레드 안전하게 모읍니다."""
+
+    def __init__(self):
+        self._timings = defaultdict(list)
+        self._errors = defaultdict(int)
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, stream, name):
+        started = time.perf_counter()
+        try:
+            yield
+        except Exception:
+            with self._lock:
+                self._errors[(stream, name)] += 1
+            raise
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            with self._lock:
+                self._timings[(stream, name)].append(elapsed)
+
+    def summary(self):
+        rows = []
+        with self._lock:
+            for (stream, name), values in sorted(self._timings.items()):
+                values = sorted(values)
+                rows.append({
+                    "stream": stream,
+                    "stage": name,
+                    "count": len(values),
+                    "errors": self._errors.get((stream, name), 0),
+                    "mean_ms": round(sum(values) / len(values), 2),
+                    "p50_ms": round(percentile(values, 50), 2),
+                    "p95_ms": round(percentile(values, 95), 2),
+                    "p99_ms": round(percentile(values, 99), 2),
+                })
+        return rows
+
+
+class Replayer:
+    """로그 레코드 하나를 해당 페이지의 백엔드 호출 흐름으로 재생합니다."""
+
+    def __init__(self, latency, use_embeddings=False, dart=None):
+        self.recorder = StageRecorder()
+        self.dart = dart or StandInDartAPI(latency)
+        dart_cache.set_dart_api(self.dart)  # 페이지 2 캐시 경로도 같은 대체 구현을 사용
+        self.llm = StandInChatModel(latency)
+        self.latency = latency
+        self.qa_cache = SemanticQACache(use_embeddings=use_embeddings)
+        # Q&A 재생용 페이지 컨텍스트 (재무제표 요약 텍스트)
+        fs = synthetic_statements("00126380", "2023")
+        self.page_context = financial_df_to_context_text(
+            pretty_financial_table(fs, sj_div="IS"), company="삼성전자", year="2023", sj_div="IS"
+        )
+
+    def stage(self, stream, name):
+        return self.recorder.stage(stream, name)
+
+    def _fetch_and_render(self, stream, corp_name, year, sj_div):
+        with self.stage(stream, "find_corp_code"):
+            info = self.dart.find_corp_code(corp_name)
+        corp_code = info.get("corp_code") if isinstance(info, dict) else None
+        if not corp_code:
+            return None
+        with self.stage(stream, "dart.company_info"):
+            self.dart.get_company_info(corp_code)
+        with self.stage(stream, "dart.financial_statements"):
+            fs = self.dart.get_financial_statements(corp_code, bsns_year=year)
+        with self.stage(stream, "render"):
+            df = pretty_financial_table(fs, sj_div=sj_div)
+            SUMMARY_BUILDERS.get(sj_div, SUMMARY_BUILDERS["IS"])(fs)
+            return financial_df_to_context_text(df, company=corp_name, year=year, sj_div=sj_div)
+
+    def page1_nl_search(self, record):
+        stream = "page1_nl_search"
+        with self.stage(stream, "llm.plan"):
+            self.llm.invoke(record["input"])
+        parsed = parse_financial_query(record["input"])
+        self._fetch_and_render(stream, parsed["corp_name"], parsed["year"], "IS")
+        with self.stage(stream, "llm.answer"):
+            self.llm.invoke(record["input"])
+
+    def page2_search(self, record):
+        # 페이지 2는 dart_cache를 통해 (기업, 연도, CFS) 단위로 한 번만 조회
+        stream = "page2_search"
+        year = record.get("year") or "2023"
+        sj_div = record.get("sj_div") or "IS"
+        with self.stage(stream, "find_corp_code"):
+            info = dart_cache.resolve_corp_code(record["company"])
+        corp_code = info.get("corp_code") if isinstance(info, dict) else None
+        if not corp_code:
+            return
+        with self.stage(stream, "dart.company_info"):
+            dart_cache.get_company_info(corp_code)
+        with self.stage(stream, "dart.financial_statements"):
+            fs = dart_cache.get_statements(corp_code, year)
+        with self.stage(stream, "render"):
+            df = pretty_financial_table(fs, sj_div=sj_div)
+            SUMMARY_BUILDERS.get(sj_div, SUMMARY_BUILDERS["IS"])(fs)
+            financial_df_to_context_text(df, company=record["company"], year=year, sj_div=sj_div)
+
+    def _qa(self, stream, record, use_web):
+        question = record["input"]
+        with self.stage(stream, "page_context"):
+            if answer_from_page_context(question, self.page_context):
+                return
+        with self.stage(stream, "qa_cache"):
+            if self.qa_cache.get(question, self.page_context, namespace=stream):
+                return
+        prompt = question
+        if use_web:
+            with self.stage(stream, "web_search"):
+                results = standin_web_search(self.latency, question)
+            prompt = "\n".join(r["snippet"] for r in results)
+        with self.stage(stream, "llm"):
+            answer = self.llm.invoke(prompt).content
+        self.qa_cache.set(question, self.page_context, answer, namespace=stream)
+
+    def page1_qa(self, record):
+        self._qa("page1_qa", record, use_web=False)
+
+    def page2_qa(self, record):
+        self._qa("page2_qa", record, use_web=True)
+
+    def page3_qa(self, record):
+        self._qa("page3_qa", record, use_web=False)
+
+    def page3_category_search(self, record):
+        stream = "page3_category_search"
+        with self.stage(stream, "web_search"):
+            standin_web_search(self.latency, record["input"], num_results=5)
+        with self.stage(stream, "llm"):
+            self.llm.invoke(record["input"])
+
+    def replay(self, record):
+        stream = record["stream"]
+        handler = getattr(self, stream, None)
+        if handler is None:
+            return
+        try:
+            with self.stage(stream, "total"):
+                handler(record)
+        except Exception as e:
+            print(f"[ERROR] replay {stream}: {e}")
+
+
+def run(records, concurrency=4, repeat=1, latency=None, use_embeddings=False, dart=None):
+    replayer = Replayer(latency or LatencyModel(), use_embeddings=use_embeddings, dart=dart)
+    workload = records * repeat
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(replayer.replay, workload))
+    wall = time.perf_counter() - started
+    return {
+        "requests": len(workload),
+        "concurrency": concurrency,
+        "wall_s": round(wall, 3),
+        "throughput_rps": round(len(workload) / wall, 2) if wall else None,
+        "stages": replayer.recorder.summary(),
+    }
+
+
+def compare_to_baseline(result, baseline, max_regression=0.2, metric="p95_ms"):
+    """baseline 대비 metric이 max_regression 비율 이상 느려진 단계 목록"""
+    base = {(r["stream"], r["stage"]): r for r in baseline.get("stages", [])}
+    regressions = []
+    for row in result["stages"]:
+        old = base.get((row["stream"], row["stage"]))
+        if not old or not old.get(metric):
+            continue
+        if row[metric] > old[metric] * (1 + max_regression):
+            regressions.append({"stream": row["stream"], "stage": row["stage"],
+                                "baseline": old[metric], "current": row[metric]})
+    return regressions
+
+
+def print_report(result):
+    print(f"requests={result['requests']} concurrency={result['concurrency']} "
+          f"wall={result['wall_s']}s throughput={result['throughput_rps']} req/s")
+    header = f"{'stream':<24}{'stage':<28}{'count':>7}{'err':>5}{'p50':>10}{'p95':>10}{'p99':>10}"
+    print(header)
+    print("-" * len(header))
+    for r in result["stages"]:
+        print(f"{r['stream']:<24}{r['stage']:<28}{r['count']:>7}{r['errors']:>5}"
+              f"{r['p50_ms']:>10.1f}{r['p95_ms']:>10.1f}{r['p99_ms']:>10.1f}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로그 재생 부하 테스트")
+    parser.add_argument("--log-dir", default="logs")
+    parser.add_argument("--streams", nargs="*", help="재생할 스트림 (예: page2_search page2_qa)")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--repeat", type=int, default=1)
+    parser.add_argument("--latency-profile", help="서비스별 기록 지연(ms) 샘플 JSON")
+    parser.add_argument("--latency-scale", type=float, default=1.0, help="지연 배율 (0이면 지연 없음)")
+    parser.add_argument("--embeddings", action="store_true", help="Q&A 캐시 임베딩 유사도 조회 사용")
+    parser.add_argument("--http", action="store_true",
+                        help="DART 호출을 인프로세스 대체 구현 대신 실제 DartAPI -> 로컬 가짜 DART 서버(HTTP)로 수행")
+    parser.add_argument("--output", help="결과 JSON 저장 경로")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--max-regression", type=float, default=0.2)
+    args = parser.parse_args(argv)
+
+    records = load_query_logs(args.log_dir, streams=args.streams)
+    if not records:
+        print("재생할 로그가 없습니다.")
+        return 1
+    latency = LatencyModel(profile_path=args.latency_profile, scale=args.latency_scale)
+    dart = None
+    if args.http:
+        from backend.settings import OFFLINE_ENV
+        from dart_api import DartAPI
+        os.environ[OFFLINE_ENV] = "1"
+        dart = DartAPI()
+    result = run(records, concurrency=args.concurrency, repeat=args.repeat,
+                 latency=latency, use_embeddings=args.embeddings, dart=dart)
+    print_report(result)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, ensure_ascii=False, indent=2)
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare_to_baseline(result, json.load(f), args.max_regression)
+        for r in regressions:
+            print(f"[REGRESSION] {r['stream']}/{r['stage']}: p95 {r['baseline']}ms -> {r['current']}ms")
+        if regressions:
+            return 2
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
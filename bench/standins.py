@@ -0,0 +1,133 @@
+import hashlib
+import json
+import random
+import threading
+import time
+
+from backend.request_scheduler import scheduler, INTERACTIVE
+from dart_api import DartAPI, parse_corp_code_zip
+from fake_services.dart_fixtures import synthetic_company, synthetic_notices, synthetic_statements
+from fake_services.dart_server import MARKET_SAMPLE_SIZE
+
+# 서비스별 기본 합성 지연 (평균 ms, 표준편차 ms)
+DEFAULT_LATENCY_MS = {
+    "dart": (180.0, 60.0),
+    "openai": (1800.0, 600.0),
+    "serpapi": (900.0, 300.0),
+}
+
+
+class LatencyModel:
+    """
+    외부 서비스 응답 지연을 흉내 냅니다.
+    - 기록 기반: profile 파일({"dart": [ms, ...], ...})의 샘플에서 무작위 추출
+    - 합성: 정규분포(평균, 표준편차)에서 추출 (음수는 0으로)
+    scale로 전체 지연을 배율 조정할 수 있습니다. (scale=0이면 지연 없음)
+    """
+
+    def __init__(self, profile_path=None, scale=1.0, seed=0):
+        self.scale = scale
+        self.samples = {}
+        if profile_path:
+            with open(profile_path, encoding="utf-8") as f:
+                self.samples = json.load(f)
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def sample_ms(self, service):
+        with self._lock:
+            if self.samples.get(service):
+                value = self._rng.choice(self.samples[service])
+            else:
+                mean, std = DEFAULT_LATENCY_MS.get(service, (100.0, 30.0))
+                value = max(0.0, self._rng.gauss(mean, std))
+        return value * self.scale
+
+    def sleep(self, service):
+        ms = self.sample_ms(service)
+        if ms > 0:
+            time.sleep(ms / 1000)
+
+
+class StandInDartAPI(DartAPI):
+    """
+    네트워크 없이 동작하는 DartAPI 대체 구현.
+    기업 고유번호 매핑(find_corp_code)은 저장소의 corpCode.xml로 실제 로직을 그대로 수행하고,
+    OpenDART 호출은 지연만 흉내 낸 합성 응답을 돌려줍니다.
+    """
+
+    _corp_df = None
+    _corp_lock = threading.Lock()
+
+    def __init__(self, latency, corp_code_path="corpCode.xml"):
+        self.api_key = "bench"
+        self.latency = latency
+        self.corp_code_path = corp_code_path
+        self.corp_code_df = self._load_corp_code_df()
+
+    def _load_corp_code_df(self):
+        # 파싱 비용은 벤치마크 대상이 아니므로 프로세스당 한 번만 수행
+        with StandInDartAPI._corp_lock:
+            if StandInDartAPI._corp_df is None:
+                with open(self.corp_code_path, "rb") as f:
+                    StandInDartAPI._corp_df = parse_corp_code_zip(f.read())
+        return StandInDartAPI._corp_df
+
+    def ask_llm_for_corp_name(self, raw_input, candidates, priority=INTERACTIVE):
+        scheduler.call("llm", self.latency.sleep, "openai", priority=priority)
+        return candidates[0] if candidates else None
+
+    def get_company_info(self, corp_code):
+        self.latency.sleep("dart")
+        row = self.corp_code_df[self.corp_code_df["corp_code"] == corp_code]
+        if row.empty:
+            return {"status": "013", "message": "조회된 데이타가 없습니다."}
+        r = row.iloc[0]
+        return synthetic_company(corp_code, r["corp_name"], r["stock_code"] or "")
+
+    def get_financial_statements(self, corp_code, bsns_year, reprt_code="11011", fs_div="CFS"):
+        self.latency.sleep("dart")
+        return synthetic_statements(corp_code, bsns_year, reprt_code, fs_div)
+
+    def get_notice_list(self, corp_code=None, bgn_de=None, end_de=None, page_no=1, page_count=100, pblntf_ty=None):
+        """가짜 DART 서버와 같은 합성 정기공시 목록 (page_no/page_count/total_page 포함)"""
+        self.latency.sleep("dart")
+        no_data = {"status": "013", "message": "조회된 데이타가 없습니다.", "list": []}
+        if pblntf_ty not in (None, "A"):
+            return no_data
+        df = self.corp_code_df
+        if corp_code:
+            df = df[df["corp_code"] == corp_code]
+        else:  # 시장 전체: 가짜 DART 서버와 같은 상장사 표본
+            df = df[df["stock_code"].fillna("").str.strip() != ""].sort_values("corp_code").head(MARKET_SAMPLE_SIZE)
+        corps = [(r.corp_code, r.corp_name, r.stock_code or "") for r in df.itertuples(index=False)]
+        end_de = end_de or time.strftime("%Y%m%d")
+        data = synthetic_notices(corps, bgn_de or end_de, end_de, page_no, page_count)
+        return data if data.get("list") is not None else no_data
+
+
+class _StandInMessage:
+    def __init__(self, content):
+        self.content = content
+
+
+class StandInChatModel:
+    """ChatOpenAI.invoke()와 같은 모양의 결과(.content)를 돌려주는 결정적 대체 모델"""
+
+    def __init__(self, latency):
+        self.latency = latency
+
+    def invoke(self, prompt, *args, **kwargs):
+        self.latency.sleep("openai")
+        digest = hashlib.sha1(str(prompt).encode("utf-8")).hexdigest()[:8]
+        return _StandInMessage(f"[bench 답변 {digest}] 요청하신 내용을 요약했습니다.")
+
+
+def standin_web_search(latency, query, num_results=3):
+    """SerpAPI GoogleSearch 결과 형식의 합성 검색 결과"""
+    latency.sleep("serpapi")
+    return [
+        {"title": f"{query} 관련 기사 {i + 1}", "snippet": f"{query}에 대한 요약 {i + 1}",
+         "link": f"https://example.com/{i + 1}"}
+        for i in range(num_results)
+    ]
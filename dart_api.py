@@ -9,6 +9,22 @@ import streamlit as st
 from sentence_transformers import SentenceTransformer, util
 import openai
 from fuzzywuzzy import process
+from backend.settings import dart_base_url, offline_mode
+from backend.request_scheduler import scheduler, INTERACTIVE
+
+def parse_corp_code_zip(content):
+    """corpCode.xml API 응답(zip 바이트)을 corp_code/corp_name/stock_code/modify_date DataFrame으로 변환"""
+    zipfile_obj = ZipFile(BytesIO(content))
+    xml_str = zipfile_obj.read('CORPCODE.xml').decode('utf-8')
+    xroot = et.fromstring(xml_str)
+    df_cols = ["corp_code", "corp_name", "stock_code", "modify_date"]
+    rows = []
+    for node in xroot:
+        res = []
+        for el in df_cols:
+            res.append(node.find(el).text if node.find(el) is not None else None)
+        rows.append({df_cols[i]: res[i] for i in range(len(df_cols))})
+    return pd.DataFrame(rows, columns=df_cols)
 
 class DartAPI:
     BASE_URL = "https://opendart.fss.or.kr/api"
@@ -40,7 +56,9 @@ class DartAPI:
     }
     """
     def __init__(self, api_key=None):
-        self.api_key = api_key or os.getenv("DART_API_KEY")
+        # 오프라인 모드/DART_BASE_URL 설정 시 로컬 가짜 DART 서버로 요청
+        self.BASE_URL = dart_base_url()
+        self.api_key = api_key or os.getenv("DART_API_KEY") or ("offline" if offline_mode() else None)
         if not self.api_key:
             raise ValueError("DART API Key가 설정되어 있지 않습니다.")
         self.corp_code_df = self._load_corp_code_df()
@@ -51,17 +69,7 @@ class DartAPI:
             df = pd.read_csv(cache_path, dtype=str)
         else:
             u = requests.get(f'{self.BASE_URL}/corpCode.xml', params={'crtfc_key': self.api_key})
-            zipfile_obj = ZipFile(BytesIO(u.content))
-            xml_str = zipfile_obj.read('CORPCODE.xml').decode('utf-8')
-            xroot = et.fromstring(xml_str)
-            df_cols = ["corp_code", "corp_name", "stock_code", "modify_date"]
-            rows = []
-            for node in xroot:
-                res = []
-                for el in df_cols:
-                    res.append(node.find(el).text if node.find(el) is not None else None)
-                rows.append({df_cols[i]: res[i] for i in range(len(df_cols))})
-            df = pd.DataFrame(rows, columns=df_cols)
+            df = parse_corp_code_zip(u.content)
             df.to_csv(cache_path, index=False)
         def clean(name):
             return re.sub(r"[\s\(\)\'\"\.,주식회사]", "", str(name)).strip().lower()
@@ -74,7 +82,10 @@ class DartAPI:
         candidates = [m[0] for m in matches]
         return candidates
 
-    def ask_llm_for_corp_name(self, raw_input, candidates):
+    def ask_llm_for_corp_name(self, raw_input, candidates, priority=INTERACTIVE):
+        if offline_mode():
+            # 오프라인 모드에서는 가장 유사한 후보를 그대로 사용
+            return candidates[0] if candidates else None
         api_key = os.getenv("OPENAI_API_KEY")
         if not api_key or not candidates:
             return None
@@ -83,7 +94,9 @@ class DartAPI:
         다음 입력에서 '공식 기업명(corp_name)'을 아래 후보 중 하나로 골라주세요.\n입력: "{raw_input}"\n후보: {candidates}\n출력: 정확한 후보 하나만
         """
         try:
-            resp = openai.ChatCompletion.create(
+            # 다른 LLM 호출과 같은 공유 요청 스케줄러('llm' 서비스)를 거침
+            resp = scheduler.call(
+                "llm", openai.ChatCompletion.create, priority=priority,
                 model="gpt-4o",
                 messages=[{"role":"system","content":"기업명 매핑 어시스턴트입니다."},
                           {"role":"user","content":prompt}],
@@ -102,14 +115,34 @@ class DartAPI:
             name = name.replace(s, "")
         return name.strip().lower()
 
-    def find_corp_code(self, corp_name):
+    def _clean_name_index(self):
+        """정제된 기업명 리스트와 {공백을 뺀 정제된 기업명: 행 번호 목록} (처음 한 번만 계산해 재사용)"""
+        if getattr(self, "_clean_names", None) is None:
+            clean_names = [self.clean_corp_name(n) for n in self.corp_code_df['corp_name'].tolist()]
+            index = {}
+            for i, cname in enumerate(clean_names):
+                index.setdefault(cname.replace(" ", ""), []).append(i)
+            self._clean_index = index
+            self._clean_names = clean_names
+        return self._clean_names, self._clean_index
+
+    def find_corp_code(self, corp_name, priority=INTERACTIVE):
         clean_input = self.clean_corp_name(corp_name)
         names = self.corp_code_df['corp_name'].tolist()
-        clean_names = [self.clean_corp_name(n) for n in names]
+        clean_names, clean_index = self._clean_name_index()
         stock_codes = self.corp_code_df['stock_code'].tolist()
         corp_code = None
         candidates = []
         llm_result = None
+        # 0. 정제된 이름이 정확히 일치하면 퍼지 매칭 없이 바로 반환 (상장사 우선)
+        exact = clean_index.get(clean_input.replace(" ", ""))
+        if exact:
+            listed = [i for i in exact if isinstance(stock_codes[i], str) and stock_codes[i].strip()]
+            return {
+                "corp_code": self.corp_code_df.iloc[(listed or exact)[0]]['corp_code'],
+                "candidates": candidates,
+                "llm_result": llm_result
+            }
         # 1. fuzzywuzzy로 clean된 이름끼리 매칭 (상장사 우선)
         match, score = process.extractOne(clean_input, clean_names)
         if score >= 90:
@@ -128,7 +161,7 @@ class DartAPI:
             sorted_matches = sorted(matches, key=lambda m: (not (stock_codes[clean_names.index(m[0])] and str(stock_codes[clean_names.index(m[0])]).strip() != ''), -m[1]))
             top_matches = sorted_matches[:5]
             candidates = [names[clean_names.index(m[0])] for m in top_matches]
-            llm_result = self.ask_llm_for_corp_name(corp_name, candidates)
+            llm_result = self.ask_llm_for_corp_name(corp_name, candidates, priority=priority)
             if llm_result:
                 llm_clean = self.clean_corp_name(llm_result)
                 for i, cname in enumerate(clean_names):
@@ -170,15 +203,25 @@ class DartAPI:
         except Exception as e:
             return {"status": "error", "message": f"DART API 요청 실패: {e}"}
 
-    def get_notice_list(self, corp_code, bgn_de, end_de):
-        """공시목록 조회"""
+    def get_notice_list(self, corp_code=None, bgn_de=None, end_de=None, page_no=1, page_count=100, pblntf_ty=None):
+        """
+        공시목록 조회
+        corp_code를 생략하면 전체 시장 공시를 조회합니다. (DART 제한: 이때 검색 기간은 3개월 이내)
+        결과는 page_no/page_count 단위로 나뉘며 응답의 total_page로 전체 페이지 수를 알 수 있습니다.
+        pblntf_ty: 공시유형 (예: 'A' 정기공시)
+        """
         url = f"{self.BASE_URL}/list.json"
         params = {
             "crtfc_key": self.api_key,
-            "corp_code": corp_code,
             "bgn_de": bgn_de,  # YYYYMMDD
             "end_de": end_de,
+            "page_no": page_no,
+            "page_count": page_count,  # 최대 100
         }
+        if corp_code:
+            params["corp_code"] = corp_code
+        if pblntf_ty:
+            params["pblntf_ty"] = pblntf_ty
         try:
             res = requests.get(url, params=params, timeout=10)
             return res.json()
@@ -0,0 +1,92 @@
+import hashlib
+import json
+import re
+import time
+from typing import Any, List, Optional
+
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, BaseMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+from backend.company_catalog import COMPANY_TO_INDUSTRY, TOP_COMPANIES
+
+
+# 오프라인 응답에서 알아보는 기업명 (긴 이름부터 찾아 'LG화학' 안의 'LG' 같은 부분 일치를 피함)
+KNOWN_COMPANIES = sorted(set(TOP_COMPANIES) | set(COMPANY_TO_INDUSTRY), key=len, reverse=True)
+KNOWN_ITEMS = ["매출액", "영업이익", "당기순이익", "순이익", "매출"]
+
+
+def _mentioned_companies(text):
+    found = []
+    for name in KNOWN_COMPANIES:
+        if name in text and not any(name in other for other in found):
+            found.append(name)
+    return sorted(found, key=text.index)
+
+
+def _fake_comparison_query(prompt):
+    """페이지 2 비교 질문 파싱 프롬프트 -> {"companies", "year", "item"(, "peers_of")}"""
+    inputs = re.findall(r'입력: "(.*?)"', prompt)  # 마지막이 실제 질문 (앞쪽은 예시)
+    text = inputs[-1] if inputs else ""
+    companies = _mentioned_companies(text)
+    year = re.search(r"(\d{4})", text)
+    result = {
+        "companies": companies,
+        "year": year.group(1) if year else "없음",
+        "item": next((item for item in KNOWN_ITEMS if item in text), ""),
+    }
+    if companies and any(word in text for word in ("경쟁사", "동종업계", "업계")):
+        result["peers_of"] = companies[0]
+    return json.dumps(result, ensure_ascii=False)
+
+
+def _fake_peers(prompt):
+    """페이지 2 경쟁사 프롬프트 -> {"peers": [...]} (대표 기업 사전에서 같은 산업, 없으면 앞쪽 대표 기업)"""
+    match = re.search(r"'(.+?)'의 국내 상장 경쟁사", prompt)
+    company = match.group(1) if match else ""
+    industry = COMPANY_TO_INDUSTRY.get(company)
+    peers = [name for name in TOP_COMPANIES if name != company and COMPANY_TO_INDUSTRY.get(name) == industry]
+    if not peers:
+        peers = [name for name in TOP_COMPANIES if name != company][:3]
+    return json.dumps({"peers": peers[:5]}, ensure_ascii=False)
+
+
+def fake_completion(prompt):
+    """
+    프롬프트 종류에 맞춰 형식만 맞춘 결정적 응답을 만듭니다.
+    같은 프롬프트에는 항상 같은 응답을 돌려주므로 벤치마크 결과가 재현됩니다.
+    """
+    digest = hashlib.sha1(prompt.encode("utf-8")).hexdigest()[:8]
+    if '"peers"' in prompt:
+        return _fake_peers(prompt)
+    if '"companies"' in prompt:
+        return _fake_comparison_query(prompt)
+    if "산업명만 반환" in prompt:
+        return "기타"
+    if "공식 기업명" in prompt:
+        return ""
+    return f"[오프라인 응답 {digest}] 요청하신 내용을 요약했습니다."
+
+
+class FakeChatModel(BaseChatModel):
+    """ChatOpenAI 대신 쓰는 결정적 가짜 채팅 모델 (지연 시간 설정 가능)"""
+
+    model_name: str = "fake-gpt-4o"
+    latency_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def _generate(
+        self,
+        messages: List[BaseMessage],
+        stop: Optional[List[str]] = None,
+        run_manager: Any = None,
+        **kwargs: Any,
+    ) -> ChatResult:
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        prompt = "\n".join(str(m.content) for m in messages)
+        message = AIMessage(content=fake_completion(prompt))
+        return ChatResult(generations=[ChatGeneration(message=message)])
@@ -0,0 +1,154 @@
+import datetime
+import hashlib
+import json
+import os
+
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+# 합성 재무제표에 포함할 대표 계정 (sj_div, account_id, account_nm)
+SYNTHETIC_ACCOUNTS = [
+    ("IS", "ifrs-full_Revenue", "매출액"),
+    ("IS", "dart_OperatingIncomeLoss", "영업이익"),
+    ("IS", "ifrs-full_ProfitLoss", "당기순이익"),
+    ("BS", "ifrs-full_CurrentAssets", "유동자산"),
+    ("BS", "ifrs-full_Assets", "자산총계"),
+    ("BS", "ifrs-full_CurrentLiabilities", "유동부채"),
+    ("BS", "ifrs-full_Liabilities", "부채총계"),
+    ("BS", "ifrs-full_Equity", "자본총계"),
+    ("CF", "ifrs-full_CashFlowsFromUsedInOperatingActivities", "영업활동으로 인한 현금흐름"),
+    ("CF", "ifrs-full_CashFlowsFromUsedInInvestingActivities", "투자활동으로 인한 현금흐름"),
+    ("CF", "ifrs-full_CashFlowsFromUsedInFinancingActivities", "재무활동으로 인한 현금흐름"),
+]
+
+
+def stable_amount(*parts):
+    """입력값에 대해 항상 같은 금액을 돌려주는 결정적 난수 (원 단위)"""
+    digest = hashlib.sha1("|".join(map(str, parts)).encode("utf-8")).hexdigest()
+    return int(digest[:10], 16) % 300_000_000_000_000
+
+
+# reprt_code -> 누적 개월 수 (1분기/반기/3분기/사업보고서)
+REPORT_MONTHS = {"11013": 3, "11012": 6, "11014": 9, "11011": 12}
+
+
+def synthetic_statements(corp_code, bsns_year, reprt_code="11011", fs_div="CFS"):
+    """
+    fnlttSinglAcntAll.json 형식의 합성 재무제표 응답.
+    분기/반기보고서의 손익·현금흐름 계정은 연간 금액을 누적 개월 수에 비례해 나눠,
+    실제 공시처럼 손익계산서는 3개월치(thstrm_amount)와 누적(thstrm_add_amount), 현금흐름표는 누적 금액을 돌려줍니다.
+    """
+    months = REPORT_MONTHS.get(str(reprt_code), 12)
+
+    def amount(year, account_id, sj_div, period_months):
+        if sj_div == "BS" or months == 12:
+            return stable_amount(corp_code, year, reprt_code, fs_div, account_id)
+        return stable_amount(corp_code, year, "11011", fs_div, account_id) * period_months // 12
+
+    rows = []
+    for ord_, (sj_div, account_id, account_nm) in enumerate(SYNTHETIC_ACCOUNTS, start=1):
+        # 분기 손익계산서의 당기 금액은 해당 3개월치, 현금흐름표는 누적
+        period = 3 if sj_div == "IS" else months
+        row = {
+            "rcept_no": f"{bsns_year}0314000{ord_:03d}",
+            "reprt_code": reprt_code,
+            "bsns_year": str(bsns_year),
+            "corp_code": corp_code,
+            "sj_div": sj_div,
+            "sj_nm": sj_div,
+            "account_id": account_id,
+            "account_nm": account_nm,
+            "thstrm_amount": f"{amount(bsns_year, account_id, sj_div, period):,}",
+            "frmtrm_amount": f"{amount(int(bsns_year) - 1, account_id, sj_div, period):,}",
+            "bfefrmtrm_amount": f"{amount(int(bsns_year) - 2, account_id, sj_div, period):,}",
+            "ord": str(ord_),
+            "currency": "KRW",
+        }
+        if sj_div == "IS" and months not in (3, 12):
+            row["thstrm_add_amount"] = f"{amount(bsns_year, account_id, sj_div, months):,}"
+        rows.append(row)
+    return {"status": "000", "message": "정상", "list": rows}
+
+
+# 합성 기업개황의 업종코드(KSIC) 후보 (기업마다 결정적으로 하나 선택)
+SYNTHETIC_INDUTY_CODES = ["264", "261", "28202", "30121", "58211", "21210", "63120", "64992", "47111", "31111", "51100", "204"]
+
+
+def synthetic_company(corp_code, corp_name="", stock_code=""):
+    """company.json 형식의 합성 기업개황 응답"""
+    induty_code = SYNTHETIC_INDUTY_CODES[stable_amount(corp_code, "induty") % len(SYNTHETIC_INDUTY_CODES)]
+    return {
+        "status": "000", "message": "정상", "corp_code": corp_code, "corp_name": corp_name,
+        "stock_code": stock_code or "", "ceo_nm": "홍길동", "corp_cls": "Y" if stock_code else "E",
+        "adres": "서울특별시", "induty_code": induty_code, "est_dt": "19690113", "acc_mt": "12",
+    }
+
+
+# 정기보고서 제출 기한 (월, 일, 보고서명, 대상 기간 월, 전년도 보고서 여부)
+PERIODIC_FILINGS = [
+    (3, 14, "사업보고서", 12, True),
+    (5, 15, "분기보고서", 3, False),
+    (8, 14, "반기보고서", 6, False),
+    (11, 14, "분기보고서", 9, False),
+]
+
+
+def synthetic_notices(corps, bgn_de, end_de, page_no=1, page_count=100):
+    """
+    list.json 형식의 합성 공시목록 응답 (정기공시만).
+    corps: [(corp_code, corp_name, stock_code)]. 각 기업이 제출 기한일에 정기보고서를 낸 것으로 보고,
+    실제 응답처럼 접수번호 내림차순으로 정렬해 page_no/page_count 단위로 잘라 돌려줍니다.
+    """
+    bgn = datetime.datetime.strptime(bgn_de, "%Y%m%d").date()
+    end = datetime.datetime.strptime(end_de, "%Y%m%d").date()
+    rows = []
+    for year in range(bgn.year, end.year + 1):
+        for month, day, name, period_month, prior_year in PERIODIC_FILINGS:
+            filed = datetime.date(year, month, day)
+            if not bgn <= filed <= end:
+                continue
+            period_year = year - 1 if prior_year else year
+            for corp_code, corp_name, stock_code in corps:
+                seq = stable_amount(corp_code, filed) % 900_000 + 100_000
+                rows.append({
+                    "corp_code": corp_code, "corp_name": corp_name, "stock_code": stock_code or "",
+                    "corp_cls": "Y" if stock_code else "E",
+                    "report_nm": f"{name} ({period_year}.{period_month:02d})",
+                    "rcept_no": f"{filed:%Y%m%d}{seq:06d}",
+                    "flr_nm": corp_name, "rcept_dt": f"{filed:%Y%m%d}", "rm": "",
+                })
+    if not rows:
+        return {"status": "013", "message": "조회된 데이타가 없습니다."}
+    rows.sort(key=lambda r: r["rcept_no"], reverse=True)
+    page_no, page_count = max(int(page_no), 1), min(max(int(page_count), 1), 100)
+    total_page = (len(rows) + page_count - 1) // page_count
+    return {
+        "status": "000", "message": "정상", "page_no": page_no, "page_count": page_count,
+        "total_count": len(rows), "total_page": total_page,
+        "list": rows[(page_no - 1) * page_count:page_no * page_count],
+    }
+
+
+def fixture_key(endpoint, params):
+    """요청 파라미터(API 키 제외)로 만든 고정 파일명"""
+    items = sorted((k, v) for k, v in params.items() if k != "crtfc_key")
+    raw = "&".join(f"{k}={v}" for k, v in items)
+    return hashlib.sha1(raw.encode("utf-8")).hexdigest()[:20]
+
+
+def fixture_path(endpoint, params, fixtures_dir=FIXTURES_DIR):
+    return os.path.join(fixtures_dir, "dart", endpoint, f"{fixture_key(endpoint, params)}.json")
+
+
+def load_fixture(endpoint, params, fixtures_dir=FIXTURES_DIR):
+    path = fixture_path(endpoint, params, fixtures_dir)
+    if not os.path.exists(path):
+        return None
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_fixture(endpoint, params, data, fixtures_dir=FIXTURES_DIR):
+    path = fixture_path(endpoint, params, fixtures_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(data, f, ensure_ascii=False)
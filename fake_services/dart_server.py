@@ -0,0 +1,172 @@
+"""
+OpenDART API를 흉내 내는 로컬 HTTP 서버.
+
+- 기록된 fixture(fake_services/fixtures/dart/...)가 있으면 그대로 응답하고, 없으면 결정적 합성 데이터로 응답합니다.
+- corpCode.xml은 저장소의 corpCode.xml(zip)을 그대로 돌려줍니다.
+- --record 모드에서는 실제 OpenDART로 요청을 전달하고 응답을 fixture로 저장합니다.
+
+예시:
+    python -m fake_services.dart_server --port 8765
+    DART_API_KEY=... python -m fake_services.dart_server --record
+"""
+import argparse
+import json
+import os
+import socket
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qsl
+
+from fake_services.dart_fixtures import (
+    FIXTURES_DIR, load_fixture, save_fixture, synthetic_company, synthetic_notices, synthetic_statements,
+)
+
+DEFAULT_HOST = os.getenv("FAKE_DART_HOST", "127.0.0.1")
+DEFAULT_PORT = int(os.getenv("FAKE_DART_PORT", "8765"))
+CORP_CODE_ZIP = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "corpCode.xml")
+NO_DATA = {"status": "013", "message": "조회된 데이타가 없습니다."}
+# corp_code 없이 조회한 시장 전체 공시목록에 포함할 상장사 수
+MARKET_SAMPLE_SIZE = 20
+
+
+class FakeDartHandler(BaseHTTPRequestHandler):
+    server_version = "FakeDART/1.0"
+
+    def log_message(self, format, *args):
+        # 요청마다 stderr에 출력하지 않음
+        pass
+
+    def _send(self, body, content_type="application/json; charset=utf-8"):
+        if isinstance(body, (dict, list)):
+            body = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        endpoint = url.path.rsplit("/", 1)[-1]
+        params = dict(parse_qsl(url.query))
+        if self.server.latency_ms:
+            time.sleep(self.server.latency_ms / 1000)
+
+        if endpoint == "corpCode.xml":
+            with open(CORP_CODE_ZIP, "rb") as f:
+                return self._send(f.read(), content_type="application/zip")
+        if endpoint not in ("company.json", "fnlttSinglAcntAll.json", "list.json"):
+            self.send_error(404, f"지원하지 않는 엔드포인트: {endpoint}")
+            return
+
+        if self.server.record:
+            data = self.server.fetch_upstream(endpoint, params)
+            save_fixture(endpoint, params, data, self.server.fixtures_dir)
+            return self._send(data)
+        data = load_fixture(endpoint, params, self.server.fixtures_dir)
+        if data is None:
+            data = self.server.synthesize(endpoint, params)
+        self._send(data)
+
+
+class FakeDartServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, address, fixtures_dir=FIXTURES_DIR, latency_ms=0.0, record=False, api_key=None):
+        super().__init__(address, FakeDartHandler)
+        self.fixtures_dir = fixtures_dir
+        self.latency_ms = latency_ms
+        self.record = record
+        self.api_key = api_key or os.getenv("DART_API_KEY")
+        self._corp_names = None
+        self._corp_lock = threading.Lock()
+
+    def _corp_lookup(self, corp_code):
+        with self._corp_lock:
+            if self._corp_names is None:
+                from dart_api import parse_corp_code_zip
+                with open(CORP_CODE_ZIP, "rb") as f:
+                    df = parse_corp_code_zip(f.read())
+                self._corp_names = {
+                    r.corp_code: (r.corp_name, r.stock_code or "") for r in df.itertuples(index=False)
+                }
+        return self._corp_names.get(corp_code)
+
+    def _market_sample(self):
+        """시장 전체 공시목록용 상장사 표본 (corp_code 순 앞쪽 MARKET_SAMPLE_SIZE개)"""
+        self._corp_lookup("")
+        listed = sorted((c, n, s) for c, (n, s) in self._corp_names.items() if s.strip())
+        return listed[:MARKET_SAMPLE_SIZE]
+
+    def synthesize(self, endpoint, params):
+        corp_code = params.get("corp_code", "")
+        corp = self._corp_lookup(corp_code) if corp_code else None
+        if endpoint == "company.json":
+            return synthetic_company(corp_code, *corp) if corp else NO_DATA
+        if endpoint == "fnlttSinglAcntAll.json":
+            if not corp:
+                return NO_DATA
+            return synthetic_statements(corp_code, params.get("bsns_year", "2023"),
+                                        params.get("reprt_code", "11011"), params.get("fs_div", "CFS"))
+        if endpoint == "list.json":
+            if params.get("pblntf_ty", "A") != "A":
+                return NO_DATA
+            corps = [(corp_code, *corp)] if corp else [] if corp_code else self._market_sample()
+            end_de = params.get("end_de") or time.strftime("%Y%m%d")
+            return synthetic_notices(corps, params.get("bgn_de") or end_de, end_de,
+                                     params.get("page_no", 1), params.get("page_count", 10))
+        return dict(NO_DATA, list=[])
+
+    def fetch_upstream(self, endpoint, params):
+        import requests
+        from backend.settings import DART_PUBLIC_URL
+        upstream = dict(params, crtfc_key=self.api_key)
+        return requests.get(f"{DART_PUBLIC_URL}/{endpoint}", params=upstream, timeout=10).json()
+
+
+_server = None
+_server_lock = threading.Lock()
+
+
+def _port_in_use(host, port):
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.settimeout(0.2)
+        return s.connect_ex((host, port)) == 0
+
+
+def ensure_running(host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    프로세스 안에서 가짜 DART 서버를 (아직 없으면) 백그라운드 스레드로 띄우고 (host, port)를 반환합니다.
+    이미 다른 프로세스가 해당 포트에서 서버를 띄워 두었다면 그 서버를 그대로 사용합니다.
+    """
+    global _server
+    with _server_lock:
+        if _server is None and not _port_in_use(host, port):
+            from backend.settings import fake_latency_ms
+            _server = FakeDartServer((host, port), latency_ms=fake_latency_ms("dart"))
+            threading.Thread(target=_server.serve_forever, name="fake-dart-server", daemon=True).start()
+    return host, port
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="로컬 가짜 OpenDART 서버")
+    parser.add_argument("--host", default=DEFAULT_HOST)
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--fixtures", default=FIXTURES_DIR)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--record", action="store_true", help="실제 OpenDART 응답을 fixture로 기록")
+    args = parser.parse_args(argv)
+    server = FakeDartServer((args.host, args.port), fixtures_dir=args.fixtures,
+                            latency_ms=args.latency_ms, record=args.record)
+    print(f"[LOG] fake DART server: http://{args.host}:{args.port}/api (record={args.record})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
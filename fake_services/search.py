@@ -0,0 +1,43 @@
+import hashlib
+import json
+import os
+import time
+
+from fake_services.dart_fixtures import FIXTURES_DIR
+
+
+class FakeGoogleSearch:
+    """
+    serpapi.GoogleSearch와 같은 인터페이스(get_dict)의 가짜 검색 백엔드.
+    fixtures/serpapi/<쿼리 해시>.json이 있으면 그 결과를, 없으면 결정적 합성 결과를 돌려줍니다.
+    """
+
+    def __init__(self, params, latency_ms=0.0, fixtures_dir=FIXTURES_DIR):
+        self.params = params
+        self.latency_ms = latency_ms
+        self.fixtures_dir = fixtures_dir
+
+    def _fixture_path(self):
+        key = hashlib.sha1(str(self.params.get("q", "")).encode("utf-8")).hexdigest()[:20]
+        return os.path.join(self.fixtures_dir, "serpapi", f"{key}.json")
+
+    def get_dict(self):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+        path = self._fixture_path()
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                return json.load(f)
+        query = self.params.get("q", "")
+        num = int(self.params.get("num", 3))
+        return {
+            "organic_results": [
+                {
+                    "position": i + 1,
+                    "title": f"{query} 관련 자료 {i + 1}",
+                    "snippet": f"{query}에 대한 오프라인 검색 결과 {i + 1}입니다.",
+                    "link": f"https://example.com/search/{i + 1}",
+                }
+                for i in range(num)
+            ]
+        }
@@ -4,6 +4,8 @@ import matplotlib.pyplot as plt
 import matplotlib.font_manager as fm
 import platform
 import matplotlib.ticker as ticker
+from backend.accounts import standardize_statement
+from backend.ratios import RATIO_NAMES, compute_ratios, format_ratio
 
 # 한글 폰트 설정
 if platform.system() == 'Darwin': # Mac OS
@@ -19,9 +21,6 @@ else: # Linux or others
 
 plt.rcParams['axes.unicode_minus'] = False # 마이너스 폰트 깨짐 방지
 
-# 매출액 유사 항목 리스트 (전역)
-sales_keywords = ["매출액", "수익", "영업수익", "매출", "총수익"]
-
 def format_amount_to_kr_unit(value):
     if pd.isna(value) or not isinstance(value, (int, float)):
         return 'N/A'
@@ -60,87 +59,34 @@ def get_sj_div_label(sj_div_code):
     }
     return labels.get(sj_div_code, sj_div_code)
 
-def generate_income_statement_chart(fs_data, company, year):
+def _render_amount_chart(amounts, items, title, colors, year, empty_message):
     """
-    손익계산서 주요 항목에 대한 바 차트를 생성합니다.
-    fs_data: DART API에서 받아온 재무제표 dict (list of dict)
+    표준 계정 표(index: 당기/전기/전전기)의 items [(표시명, 계정 key)]를 3개년 묶음 막대 차트(억 단위)로 그립니다.
+    요약표와 같은 standardize_statement 결과를 쓰므로 차트와 표의 금액이 항상 같습니다.
     """
-    df = pd.DataFrame(fs_data['list'])
-    # IS(손익계산서), CIS(포괄손익계산서) 모두 포함
-    df_is = df[df['sj_div'].isin(['IS', 'CIS'])]
-
-    def to_float(val):
-        try:
-            return float(str(val).replace(',', ''))
-        except (ValueError, AttributeError):
-            return None
-
-    def get_max_amount_for_keywords(df_filtered, keywords, col):
-        max_val = None
-        for kw in keywords:
-            rows = df_filtered[df_filtered['account_nm'].str.contains(kw, na=False)]
-            for val in rows[col]:
-                try:
-                    num = float(str(val).replace(",", ""))
-                    if (max_val is None) or (num > max_val):
-                        max_val = num
-                except Exception:
-                    continue
-        return max_val
-
-    def get_single_account_amounts(df_filtered, account_nm_str):
-        row = df_filtered[df_filtered['account_nm'].str.contains(account_nm_str, na=False)]
-        if not row.empty:
-            return {
-                'thstrm_amount': to_float(row['thstrm_amount'].iloc[0]),
-                'frmtrm_amount': to_float(row['frmtrm_amount'].iloc[0]),
-                'bfefrmtrm_amount': to_float(row['bfefrmtrm_amount'].iloc[0])
-            }
-        return {'thstrm_amount': None, 'frmtrm_amount': None, 'bfefrmtrm_amount': None}
-
-    # 매출액, 영업이익, 당기순이익 데이터 추출
-    매출액_data = {
-        'thstrm_amount': get_max_amount_for_keywords(df_is, sales_keywords, 'thstrm_amount'),
-        'frmtrm_amount': get_max_amount_for_keywords(df_is, sales_keywords, 'frmtrm_amount'),
-        'bfefrmtrm_amount': get_max_amount_for_keywords(df_is, sales_keywords, 'bfefrmtrm_amount')
-    }
-    영업이익_data = get_single_account_amounts(df_is, '영업이익')
-    당기순이익_data = get_single_account_amounts(df_is, '당기순이익')
-
-    def to_eok(val):
-        try:
-            return float(val) / 100_000_000 if val is not None else None
-        except Exception:
-            return None
-
-    # Prepare data for grouped bar chart
-    chart_data = {
-        '항목': ['매출액', '영업이익', '순이익'],
-        '당기': [to_eok(매출액_data['thstrm_amount']), to_eok(영업이익_data['thstrm_amount']), to_eok(당기순이익_data['thstrm_amount'])],
-        '전기': [to_eok(매출액_data['frmtrm_amount']), to_eok(영업이익_data['frmtrm_amount']), to_eok(당기순이익_data['frmtrm_amount'])],
-        '전전기': [to_eok(매출액_data['bfefrmtrm_amount']), to_eok(영업이익_data['bfefrmtrm_amount']), to_eok(당기순이익_data['bfefrmtrm_amount'])]
-    }
-    chart_df = pd.DataFrame(chart_data)
+    chart_df = pd.DataFrame({
+        '항목': [label for label, _ in items],
+        **{period: [amounts.at[period, key] / 100_000_000 for _, key in items] for period in ('당기', '전기', '전전기')},
+    })
 
     # Filter out rows where all values are None
-    chart_df = chart_df.dropna(how='all', subset=['당기', '전기', '전전기'])
+    chart_df = chart_df.dropna(how='all', subset=['당기', '전기', '전전기']).reset_index(drop=True)
 
     if chart_df.empty:
-        st.warning("시각화할 손익계산서 데이터가 부족합니다.")
+        st.warning(empty_message)
         return
 
-    # 변환 없이 원본 chart_df 사용
     fig, ax = plt.subplots(figsize=(10, 6))
     bar_width = 0.25
     index = range(len(chart_df['항목']))
 
-    bar1 = ax.bar([i - bar_width for i in index], chart_df['당기'], bar_width, label=f'{year}년 (당기)', color='skyblue')
-    bar2 = ax.bar(index, chart_df['전기'], bar_width, label=f'{int(year)-1}년 (전기)', color='lightcoral')
-    bar3 = ax.bar([i + bar_width for i in index], chart_df['전전기'], bar_width, label=f'{int(year)-2}년 (전전기)', color='lightgreen')
+    ax.bar([i - bar_width for i in index], chart_df['당기'], bar_width, label=f'{year}년 (당기)', color=colors[0])
+    ax.bar(index, chart_df['전기'], bar_width, label=f'{int(year)-1}년 (전기)', color=colors[1])
+    ax.bar([i + bar_width for i in index], chart_df['전전기'], bar_width, label=f'{int(year)-2}년 (전전기)', color=colors[2])
 
     ax.set_xlabel('주요 항목')
     ax.set_ylabel('금액 (단위: 억)')
-    ax.set_title(f'{company} 3개년 주요 손익 항목')
+    ax.set_title(title)
     ax.set_xticks(index)
     ax.set_xticklabels(chart_df['항목'], rotation=0)
     ax.legend()
@@ -149,94 +95,42 @@ def generate_income_statement_chart(fs_data, company, year):
     st.pyplot(fig)
     plt.close(fig)
 
+def generate_income_statement_chart(fs_data, company, year):
+    """
+    손익계산서 주요 항목에 대한 바 차트를 생성합니다.
+    fs_data: DART API에서 받아온 재무제표 dict (list of dict)
+    """
+    _render_amount_chart(
+        standardize_statement(fs_data),
+        [('매출액', 'revenue'), ('영업이익', 'operating_income'), ('순이익', 'net_income')],
+        f'{company} 3개년 주요 손익 항목', ('skyblue', 'lightcoral', 'lightgreen'), year,
+        "시각화할 손익계산서 데이터가 부족합니다.",
+    )
+
+def _amount_row(amounts, label, key, **extra):
+    """표준 계정 표(index: 당기/전기/전전기)에서 한 계정의 기간별 금액을 요약표 행으로 만듭니다."""
+    row = {"항목": label}
+    for period in ("당기", "전기", "전전기"):
+        row[period] = format_amount_to_kr_unit(amounts.at[period, key])
+    row.update(extra)
+    return row
+
 def generate_income_statement_summary(fs_data):
     """
     손익계산서 요약본 데이터를 DataFrame으로 생성합니다.
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
+    금액은 표준 계정(backend.accounts)으로 찾고, 비고의 비율은 비율 엔진(backend.ratios)으로 계산합니다.
     """
-    df = pd.DataFrame(fs_data['list'])
-    # IS(손익계산서), CIS(포괄손익계산서) 모두 포함
-    df_is = df[df['sj_div'].isin(['IS', 'CIS'])]
-    print("Debug IS account_nm unique values:", df_is['account_nm'].unique()) # Debugging print
-    print("Debug IS head (account_nm, thstrm_amount):") # Debugging print
-    print(df_is[['account_nm', 'thstrm_amount']].head().to_string()) # Debugging print
-
-    def get_max_amount_for_keywords(df_filtered, keywords, col):
-        max_val = None
-        for kw in keywords:
-            rows = df_filtered[df_filtered['account_nm'].str.contains(kw, na=False)]
-            for val in rows[col]:
-                try:
-                    num = float(str(val).replace(",", ""))
-                    if (max_val is None) or (num > max_val):
-                        max_val = num
-                except Exception:
-                    continue
-        return max_val
-
-    def get_raw_amount(account_nm_str, col):
-        row = df_is[df_is['account_nm'].str.contains(account_nm_str, na=False)]
-        if not row.empty:
-            val = row[col].iloc[0]
-            try:
-                return float(str(val).replace(",", ""))
-            except (ValueError, AttributeError):
-                return None
-        return None
-
-    def get_formatted_amount_max(account_nm_strs, col):
-        raw_val = get_max_amount_for_keywords(df_is, account_nm_strs, col)
-        return format_amount_to_kr_unit(raw_val)
-
-    def get_formatted_amount(account_nm_str, col):
-        raw_val = get_raw_amount(account_nm_str, col)
-        return format_amount_to_kr_unit(raw_val)
-
-    # '당기', '전기', '전전기' 데이터를 가져옴 (계산을 위해 raw 값 사용)
-    매출액_당기_raw = get_max_amount_for_keywords(df_is, sales_keywords, 'thstrm_amount')
-    매출액_전기_raw = get_max_amount_for_keywords(df_is, sales_keywords, 'frmtrm_amount')
-    매출액_전전기_raw = get_max_amount_for_keywords(df_is, sales_keywords, 'bfefrmtrm_amount')
-
-    영업이익_당기_raw = get_raw_amount("영업이익", 'thstrm_amount')
-    영업이익_전기_raw = get_raw_amount("영업이익", 'frmtrm_amount')
-    영업이익_전전기_raw = get_raw_amount("영업이익", 'bfefrmtrm_amount')
-
-    당기순이익_당기_raw = get_raw_amount("당기순이익", 'thstrm_amount')
-    당기순이익_전기_raw = get_raw_amount("당기순이익", 'frmtrm_amount')
-    당기순이익_전전기_raw = get_raw_amount("당기순이익", 'bfefrmtrm_amount')
-
-    # 표에 표시할 포맷팅된 값
-    매출액_당기 = format_amount_to_kr_unit(매출액_당기_raw)
-    매출액_전기 = format_amount_to_kr_unit(매출액_전기_raw)
-    매출액_전전기 = format_amount_to_kr_unit(매출액_전전기_raw)
-
-    영업이익_당기 = get_formatted_amount("영업이익", 'thstrm_amount')
-    영업이익_전기 = get_formatted_amount("영업이익", 'frmtrm_amount')
-    영업이익_전전기 = get_formatted_amount("영업이익", 'bfefrmtrm_amount')
-
-    당기순이익_당기 = get_formatted_amount("당기순이익", 'thstrm_amount')
-    당기순이익_전기 = get_formatted_amount("당기순이익", 'frmtrm_amount')
-    당기순이익_전전기 = get_formatted_amount("당기순이익", 'bfefrmtrm_amount')
-
-    영업이익률_pct = ""
-    if 매출액_당기_raw is not None and 영업이익_당기_raw is not None and 매출액_당기_raw != 0:
-        ratio = (영업이익_당기_raw / 매출액_당기_raw) * 100
-        영업이익률_pct = f"{'+' if ratio >= 0 else ''}{ratio:.1f}%"
-
-    순이익률_pct = ""
-    if 매출액_당기_raw is not None and 당기순이익_당기_raw is not None and 매출액_당기_raw != 0:
-        ratio = (당기순이익_당기_raw / 매출액_당기_raw) * 100
-        순이익률_pct = f"{'+' if ratio >= 0 else ''}{ratio:.1f}%"
-
-    전년대비매출_pct_str = ""
-    if 매출액_당기_raw is not None and 매출액_전기_raw is not None and 매출액_전기_raw != 0:
-        change_pct = ((매출액_당기_raw - 매출액_전기_raw) / 매출액_전기_raw) * 100
-        전년대비매출_pct_str = f"{'+' if change_pct >= 0 else ''}{change_pct:.1f}%"
+    amounts = standardize_statement(fs_data)
+    # 당기/전기 두 기간의 비율을 한 번에 계산 (직전 기간: 전기/전전기)
+    previous = amounts.loc[["전기", "전전기"]].set_axis(["당기", "전기"])
+    ratios = compute_ratios(amounts.loc[["당기", "전기"]], previous, groups=("margin", "growth"))
+    당기 = ratios.loc["당기"]
 
     data = [
-        {"항목": "매출액", "당기": 매출액_당기, "전기": 매출액_전기, "전전기": 매출액_전전기, "비고": 전년대비매출_pct_str},
-        {"항목": "영업이익", "당기": 영업이익_당기, "전기": 영업이익_전기, "전전기": 영업이익_전전기, "비고": 영업이익률_pct},
-        {"항목": "순이익", "당기": 당기순이익_당기, "전기": 당기순이익_전기, "전전기": 당기순이익_전전기, "비고": 순이익률_pct}
+        _amount_row(amounts, "매출액", "revenue", 비고=format_ratio(당기["매출성장률"], signed=True)),
+        _amount_row(amounts, "영업이익", "operating_income", 비고=format_ratio(당기["영업이익률"], signed=True)),
+        _amount_row(amounts, "순이익", "net_income", 비고=format_ratio(당기["순이익률"], signed=True)),
     ]
 
     summary_df = pd.DataFrame(data)
@@ -247,60 +141,15 @@ def generate_balance_sheet_summary(fs_data):
     재무상태표 요약본 데이터를 DataFrame으로 생성합니다.
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
     """
-    df = pd.DataFrame(fs_data['list'])
-    df_bs = df[df['sj_div'] == 'BS']
-
-    def get_raw_amount(account_nm_str, col):
-        val = df_bs[df_bs['account_nm'].str.contains(account_nm_str, na=False)][col].iloc[0] if not df_bs[df_bs['account_nm'].str.contains(account_nm_str, na=False)].empty else None
-        if val is None:
-            return None
-        try:
-            return float(str(val).replace(",", ""))
-        except (ValueError, AttributeError):
-            return None
-
-    def get_formatted_amount(account_nm_str, col):
-        raw_val = get_raw_amount(account_nm_str, col)
-        return format_amount_to_kr_unit(raw_val)
-
-    # '당기', '전기', '전전기' 데이터를 가져옴 (계산을 위해 raw 값 사용)
-    총자산_당기_raw = get_raw_amount("자산총계", 'thstrm_amount')
-    총자산_전기_raw = get_raw_amount("자산총계", 'frmtrm_amount')
-    총자산_전전기_raw = get_raw_amount("자산총계", 'bfefrmtrm_amount')
-
-    총부채_당기_raw = get_raw_amount("부채총계", 'thstrm_amount')
-    총부채_전기_raw = get_raw_amount("부채총계", 'frmtrm_amount')
-    총부채_전전기_raw = get_raw_amount("부채총계", 'bfefrmtrm_amount')
-
-    자기자본_당기_raw = get_raw_amount("자본총계", 'thstrm_amount')
-    자기자본_전기_raw = get_raw_amount("자본총계", 'frmtrm_amount')
-    자기자본_전전기_raw = get_raw_amount("자본총계", 'bfefrmtrm_amount')
-
-    # 표에 표시할 포맷팅된 값
-    총자산_당기 = get_formatted_amount("자산총계", 'thstrm_amount')
-    총자산_전기 = get_formatted_amount("자산총계", 'frmtrm_amount')
-    총자산_전전기 = get_formatted_amount("자산총계", 'bfefrmtrm_amount')
-
-    총부채_당기 = get_formatted_amount("부채총계", 'thstrm_amount')
-    총부채_전기 = get_formatted_amount("부채총계", 'frmtrm_amount')
-    총부채_전전기 = get_formatted_amount("부채총계", 'bfefrmtrm_amount')
-
-    자기자본_당기 = get_formatted_amount("자본총계", 'thstrm_amount')
-    자기자본_전기 = get_formatted_amount("자본총계", 'frmtrm_amount')
-    자기자본_전전기 = get_formatted_amount("자본총계", 'bfefrmtrm_amount')
-
-    부채비율_pct = ""
-    if 총부채_당기_raw is not None and 자기자본_당기_raw is not None and 자기자본_당기_raw != 0:
-        ratio = (총부채_당기_raw / 자기자본_당기_raw * 100)
-        부채비율_pct = f"{'+' if ratio >= 0 else ''}{ratio:.1f}%"
-    else:
-        부채비율_pct = "N/A"
+    amounts = standardize_statement(fs_data)
+    ratios = compute_ratios(amounts, groups=("leverage",))
 
     data = [
-        {"항목": "총 자산", "당기": 총자산_당기, "전기": 총자산_전기, "전전기": 총자산_전전기},
-        {"항목": "총 부채", "당기": 총부채_당기, "전기": 총부채_전기, "전전기": 총부채_전전기},
-        {"항목": "자기자본", "당기": 자기자본_당기, "전기": 자기자본_전기, "전전기": 자기자본_전전기},
-        {"항목": "부채비율", "당기": 부채비율_pct, "전기": "", "전전기": ""} # 부채비율은 당기만 표시
+        _amount_row(amounts, "총 자산", "total_assets"),
+        _amount_row(amounts, "총 부채", "total_liabilities"),
+        _amount_row(amounts, "자기자본", "total_equity"),
+        # 부채비율은 당기만 표시
+        {"항목": "부채비율", "당기": format_ratio(ratios.at["당기", "부채비율"], signed=True, missing="N/A"), "전기": "", "전전기": ""},
     ]
 
     summary_df = pd.DataFrame(data)
@@ -311,39 +160,12 @@ def generate_cash_flow_summary(fs_data):
     현금흐름표 요약본 데이터를 DataFrame으로 생성합니다.
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
     """
-    df = pd.DataFrame(fs_data['list'])
-    df_cf = df[df['sj_div'] == 'CF']
-
-    def get_raw_amount(account_nm_str, col):
-        val = df_cf[df_cf['account_nm'].str.contains(account_nm_str, na=False)][col].iloc[0] if not df_cf[df_cf['account_nm'].str.contains(account_nm_str, na=False)].empty else None
-        if val is None:
-            return None
-        try:
-            return float(str(val).replace(",", ""))
-        except (ValueError, AttributeError):
-            return None
-
-    def get_formatted_amount(account_nm_str, col):
-        raw_val = get_raw_amount(account_nm_str, col)
-        return format_amount_to_kr_unit(raw_val)
-
-    # '당기', '전기', '전전기' 데이터를 가져옴
-    영업활동_현금흐름_당기 = get_formatted_amount("영업활동으로 인한 현금흐름", 'thstrm_amount')
-    영업활동_현금흐름_전기 = get_formatted_amount("영업활동으로 인한 현금흐름", 'frmtrm_amount')
-    영업활동_현금흐름_전전기 = get_formatted_amount("영업활동으로 인한 현금흐름", 'bfefrmtrm_amount')
-
-    투자활동_현금흐름_당기 = get_formatted_amount("투자활동으로 인한 현금흐름", 'thstrm_amount')
-    투자활동_현금흐름_전기 = get_formatted_amount("투자활동으로 인한 현금흐름", 'frmtrm_amount')
-    투자활동_현금흐름_전전기 = get_formatted_amount("투자활동으로 인한 현금흐름", 'bfefrmtrm_amount')
-
-    재무활동_현금흐름_당기 = get_formatted_amount("재무활동으로 인한 현금흐름", 'thstrm_amount')
-    재무활동_현금흐름_전기 = get_formatted_amount("재무활동으로 인한 현금흐름", 'frmtrm_amount')
-    재무활동_현금흐름_전전기 = get_formatted_amount("재무활동으로 인한 현금흐름", 'bfefrmtrm_amount')
+    amounts = standardize_statement(fs_data)
 
     data = [
-        {"항목": "영업활동 현금흐름", "당기": 영업활동_현금흐름_당기, "전기": 영업활동_현금흐름_전기, "전전기": 영업활동_현금흐름_전전기},
-        {"항목": "투자활동 현금흐름", "당기": 투자활동_현금흐름_당기, "전기": 투자활동_현금흐름_전기, "전전기": 투자활동_현금흐름_전전기},
-        {"항목": "재무활동 현금흐름", "당기": 재무활동_현금흐름_당기, "전기": 재무활동_현금흐름_전기, "전전기": 재무활동_현금흐름_전전기}
+        _amount_row(amounts, "영업활동 현금흐름", "operating_cf"),
+        _amount_row(amounts, "투자활동 현금흐름", "investing_cf"),
+        _amount_row(amounts, "재무활동 현금흐름", "financing_cf"),
     ]
 
     summary_df = pd.DataFrame(data)
@@ -354,128 +176,24 @@ def generate_cash_flow_chart(fs_data, company, year):
     현금흐름표 주요 항목에 대한 바 차트를 생성합니다.
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
     """
-    df = pd.DataFrame(fs_data['list'])
-    df_cf = df[df['sj_div'] == 'CF']
-
-    def to_float(val):
-        try:
-            return float(str(val).replace(',', ''))
-        except (ValueError, AttributeError):
-            return None
-
-    def get_amounts_for_account(df_filtered, account_nm_str):
-        row = df_filtered[df_filtered['account_nm'].str.contains(account_nm_str, na=False)]
-        if not row.empty:
-            return {
-                'thstrm_amount': to_float(row['thstrm_amount'].iloc[0]),
-                'frmtrm_amount': to_float(row['frmtrm_amount'].iloc[0]),
-                'bfefrmtrm_amount': to_float(row['bfefrmtrm_amount'].iloc[0])
-            }
-        return {'thstrm_amount': None, 'frmtrm_amount': None, 'bfefrmtrm_amount': None}
-
-    영업활동_현금흐름_data = get_amounts_for_account(df_cf, '영업활동으로 인한 현금흐름')
-    투자활동_현금흐름_data = get_amounts_for_account(df_cf, '투자활동으로 인한 현금흐름')
-    재무활동_현금흐름_data = get_amounts_for_account(df_cf, '재무활동으로 인한 현금흐름')
-
-    # Prepare data for grouped bar chart
-    chart_data = {
-        '항목': ["영업활동 현금흐름", "투자활동 현금흐름", "재무활동 현금흐름"],
-        '당기': [영업활동_현금흐름_data['thstrm_amount'], 투자활동_현금흐름_data['thstrm_amount'], 재무활동_현금흐름_data['thstrm_amount']],
-        '전기': [영업활동_현금흐름_data['frmtrm_amount'], 투자활동_현금흐름_data['frmtrm_amount'], 재무활동_현금흐름_data['frmtrm_amount']],
-        '전전기': [영업활동_현금흐름_data['bfefrmtrm_amount'], 투자활동_현금흐름_data['bfefrmtrm_amount'], 재무활동_현금흐름_data['bfefrmtrm_amount']]
-    }
-    chart_df = pd.DataFrame(chart_data)
-
-    # Filter out rows where all values are None
-    chart_df = chart_df.dropna(how='all', subset=['당기', '전기', '전전기'])
-
-    if chart_df.empty:
-        st.warning("시각화할 현금흐름표 데이터가 부족합니다.")
-        return
-
-    # 변환 없이 원본 chart_df 사용
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bar_width = 0.25
-    index = range(len(chart_df['항목']))
-
-    bar1 = ax.bar([i - bar_width for i in index], chart_df['당기'], bar_width, label=f'{year}년 (당기)', color='purple')
-    bar2 = ax.bar(index, chart_df['전기'], bar_width, label=f'{int(year)-1}년 (전기)', color='orange')
-    bar3 = ax.bar([i + bar_width for i in index], chart_df['전전기'], bar_width, label=f'{int(year)-2}년 (전전기)', color='brown')
-
-    ax.set_xlabel('주요 항목')
-    ax.set_ylabel('금액 (단위: 억)')
-    ax.set_title(f'{company} 3개년 주요 현금흐름')
-    ax.set_xticks(index)
-    ax.set_xticklabels(chart_df['항목'], rotation=0)
-    ax.legend()
-    ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))  # 억 단위 숫자
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    _render_amount_chart(
+        standardize_statement(fs_data),
+        [("영업활동 현금흐름", "operating_cf"), ("투자활동 현금흐름", "investing_cf"), ("재무활동 현금흐름", "financing_cf")],
+        f'{company} 3개년 주요 현금흐름', ('purple', 'orange', 'brown'), year,
+        "시각화할 현금흐름표 데이터가 부족합니다.",
+    )
 
 def generate_balance_sheet_chart(fs_data, company, year):
     """
     재무상태표 주요 항목에 대한 바 차트를 생성합니다.
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
     """
-    df = pd.DataFrame(fs_data['list'])
-    df_bs = df[df['sj_div'] == 'BS']
-
-    def to_float(val):
-        try:
-            return float(str(val).replace(',', ''))
-        except (ValueError, AttributeError):
-            return None
-
-    def get_amounts_for_account(df_filtered, account_nm_str):
-        row = df_filtered[df_filtered['account_nm'].str.contains(account_nm_str, na=False)]
-        if not row.empty:
-            return {
-                'thstrm_amount': to_float(row['thstrm_amount'].iloc[0]),
-                'frmtrm_amount': to_float(row['frmtrm_amount'].iloc[0]),
-                'bfefrmtrm_amount': to_float(row['bfefrmtrm_amount'].iloc[0])
-            }
-        return {'thstrm_amount': None, 'frmtrm_amount': None, 'bfefrmtrm_amount': None}
-
-    총자산_data = get_amounts_for_account(df_bs, '자산총계')
-    총부채_data = get_amounts_for_account(df_bs, '부채총계')
-    자기자본_data = get_amounts_for_account(df_bs, '자본총계')
-
-    # Prepare data for grouped bar chart
-    chart_data = {
-        '항목': ['총 자산', '총 부채', '자기자본'],
-        '당기': [총자산_data['thstrm_amount'], 총부채_data['thstrm_amount'], 자기자본_data['thstrm_amount']],
-        '전기': [총자산_data['frmtrm_amount'], 총부채_data['frmtrm_amount'], 자기자본_data['frmtrm_amount']],
-        '전전기': [총자산_data['bfefrmtrm_amount'], 총부채_data['bfefrmtrm_amount'], 자기자본_data['bfefrmtrm_amount']]
-    }
-    chart_df = pd.DataFrame(chart_data)
-
-    # Filter out rows where all values are None
-    chart_df = chart_df.dropna(how='all', subset=['당기', '전기', '전전기'])
-
-    if chart_df.empty:
-        st.warning("시각화할 재무상태표 데이터가 부족합니다.")
-        return
-
-    # 변환 없이 원본 chart_df 사용
-    fig, ax = plt.subplots(figsize=(10, 6))
-    bar_width = 0.25
-    index = range(len(chart_df['항목']))
-
-    bar1 = ax.bar([i - bar_width for i in index], chart_df['당기'], bar_width, label=f'{year}년 (당기)', color='lightskyblue')
-    bar2 = ax.bar(index, chart_df['전기'], bar_width, label=f'{int(year)-1}년 (전기)', color='lightsalmon')
-    bar3 = ax.bar([i + bar_width for i in index], chart_df['전전기'], bar_width, label=f'{int(year)-2}년 (전전기)', color='lightgray')
-
-    ax.set_xlabel('주요 항목')
-    ax.set_ylabel('금액 (단위: 억)')
-    ax.set_title(f'{company} 3개년 주요 재무상태 항목')
-    ax.set_xticks(index)
-    ax.set_xticklabels(chart_df['항목'], rotation=0)
-    ax.legend()
-    ax.yaxis.set_major_formatter(ticker.StrMethodFormatter('{x:,.0f}'))  # 억 단위 숫자
-    plt.tight_layout()
-    st.pyplot(fig)
-    plt.close(fig)
+    _render_amount_chart(
+        standardize_statement(fs_data),
+        [('총 자산', 'total_assets'), ('총 부채', 'total_liabilities'), ('자기자본', 'total_equity')],
+        f'{company} 3개년 주요 재무상태 항목', ('lightskyblue', 'lightsalmon', 'lightgray'), year,
+        "시각화할 재무상태표 데이터가 부족합니다.",
+    )
 
 def render_financial_table(fs, company, year, sj_div='BS', display_mode='summary'):
     """특정 재무제표를 요약 또는 전체 표로 출력"""
@@ -498,6 +216,47 @@ def render_financial_table(fs, company, year, sj_div='BS', display_mode='summary
         df = pretty_financial_table(fs, sj_div=sj_div)
         st.dataframe(df)
 
+def render_quarterly_table(table, company, year):
+    """backend.quarterly.quarterly_summary() 결과를 분기 추이 표와 TTM 매출액 추이 차트로 출력"""
+    st.subheader(f"{company} {int(year) - 1}~{year}년 분기 추이")
+    if table.empty:
+        st.warning("분기 재무 데이터가 없습니다.")
+        return
+    display = table.copy()
+    for col in display.columns:
+        if col == "TTM 영업이익률":
+            display[col] = display[col].map(lambda v: format_ratio(v, missing="N/A"))
+        else:
+            display[col] = display[col].map(format_amount_to_kr_unit)
+    st.dataframe(display)
+    ttm_revenue = table["TTM 매출액"].dropna()
+    if not ttm_revenue.empty:
+        st.line_chart((ttm_revenue / 100_000_000).rename("TTM 매출액(억원)"))
+
+def render_comparison(result):
+    """backend.comparison.compare_companies() 결과를 기업별 비교표와 요청 지표 막대 차트로 출력"""
+    metric = result.metric or "매출액"
+    st.subheader(f"{result.year}년 기업 비교" + (f" ({result.metric})" if result.metric else ""))
+    if result.missing:
+        st.caption(f"정보 없음: {', '.join(result.missing)}")
+    if result.empty:
+        st.warning("비교할 재무 데이터가 없습니다.")
+        return
+    table = result.table
+    display = table.copy()
+    for col in display.columns:
+        if col in RATIO_NAMES:
+            display[col] = display[col].map(lambda v: format_ratio(v, missing="N/A"))
+        elif col != "corp_code":
+            display[col] = display[col].map(format_amount_to_kr_unit)
+    st.dataframe(display)
+    values = table[metric].dropna()
+    if not values.empty:
+        if metric in RATIO_NAMES:
+            st.bar_chart(values.rename(f"{metric}(%)"))
+        else:
+            st.bar_chart((values / 100_000_000).rename(f"{metric}(억원)"))
+
 def pretty_financial_table(fs_data, sj_div='BS'):
     """
     fs_data: DART API에서 받아온 재무제표 dict (list of dict)
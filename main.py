@@ -1,4 +1,10 @@
 import streamlit as st
+from backend.warmup import start_background_warmup
+from backend.filing_sync import start_background_sync
+
+# 대표 기업 DART 데이터를 백그라운드에서 미리 캐시하고, 신규 공시가 나오면 해당 캐시만 갱신 (프로세스당 한 번)
+start_background_warmup()
+start_background_sync()
 
 st.title("기업 분석 프로젝트")
 st.markdown(
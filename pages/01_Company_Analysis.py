@@ -4,15 +4,12 @@ os.environ["LANGCHAIN_TRACING_V2"] = "true"
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 import streamlit as st
 from dotenv import load_dotenv
-import pandas as pd
 import PyPDF2
-from langchain_openai import ChatOpenAI
-from langchain.agents import initialize_agent
 from dart_api import DartAPI
 import re
 from deep_translator import GoogleTranslator
 import openai
-import datetime
+import time
 
 # --- 분리된 프론트엔드/백엔드 함수 import ---
 from frontend.company_analysis_ui import render_info_message, render_search_box
@@ -22,9 +19,22 @@ from backend.company_analysis_tools import (
     get_financial_statements_tool,
     analyze_csv_tool,
     summarize_pdf_tool,
+    search_pdf_tool,
+    extract_pdf_tables_tool,
     plot_financials_tool,
-    answer_from_page_context
+    screen_companies_tool,
+    get_quarterly_trend_tool,
+    answer_from_page_context,
+    observe_tool_calls
 )
+from backend.qa_cache import qa_cache
+from backend.upload_store import upload_store
+from backend.csv_stats import analyze_csv
+from backend.llm import get_chat_model, invoke_llm
+from backend.parallel_agent import create_parallel_agent
+from backend.entity_memory import session_entity_memory, use_entity_memory
+from backend.interaction_logger import interaction_logger, elapsed_ms
+from backend.page_context_index import build_page_context_index, retrieve_page_context
 
 # .env에서 API 키 불러오기
 load_dotenv()
@@ -42,41 +52,45 @@ TOOLS = [
     get_financial_statements_tool,
     analyze_csv_tool,
     summarize_pdf_tool,
+    search_pdf_tool,
+    extract_pdf_tables_tool,
     plot_financials_tool,
+    screen_companies_tool,
+    get_quarterly_trend_tool,
 ]
-llm = ChatOpenAI(model="gpt-4o", temperature=0)
-agent = initialize_agent(
+llm = get_chat_model()
+# 한 단계에서 여러 툴을 요청하면(예: 두 기업의 재무제표) 동시에 실행하는 multi-functions 에이전트
+agent = create_parallel_agent(
     TOOLS,
     llm,
-    agent_type="openai-functions",
+    system_message=(
+        """
+        당신은 다양한 툴을 사용하여 1) 사용자의 자연어 input을 토대로 2) 기업 관련 정보를 찾는 '한국어' AI 에이전트입니다.
+        모든 답변, Thought, Observation은 **반드시 한국어로** 작성하세요. 영어로 작성하지 마세요.
+        각 툴의 설명과 예시를 참고하세요.
+        여러 기업이나 여러 항목이 필요하면 서로 독립적인 툴 호출을 한 번에 모두 요청하세요. (동시에 실행됩니다)\n
+        
+        툴을 사용하여 1) 사용자가 요청한 기업 {company_name}에 대한 정보를 파악하여 2) {corp_code}로 반환하도록 하세요.
+        만약 툴에서 완전히 일치하는 {company_name}이 없으면, 유사한 기업명 후보 {candidates}를 찾아서 2) {corp_code}로 매핑하세요.
+        {candidate}는 1) 사용자가 입력한 기업명과 같은 글자를 공유하거나 2) 사용자가 입력한 기업의 영어/한국어 번역을 포함합니다.
+        예를 들어, "기아차", "기아자동차", "KIA" 등은 모두 "기아"로 매핑되어야 합니다.\n
+
+        예시:
+        입력: "기아차"
+        후보: ["기아", "기아(주)", "기아자동차", "KIA", "기아차(주)"]
+
+        1) LLM이 공식 기업명 선택: "기아"
+        2) "기아"에 해당하는 corp_code: "00106641"
+        3) get_company_info("00106641") 호출
+
+        예시 질문: 기아차 {company_name} 기본 정보 알려줘.
+        예시 툴 호출: find_corp_code(query='기아차') get_company_info(corp_code='00106641')
+"""
+    ),
     verbose=True,
     handle_parsing_errors=True,  # 파싱 에러 발생 시 LLM 답변을 그대로 반환
     max_iterations=5,  # 반복 횟수 더 늘림
-    agent_kwargs={
-        "system_message": (
-            """
-            당신은 다양한 툴을 사용하여 1) 사용자의 자연어 input을 토대로 2) 기업 관련 정보를 찾는 '한국어' AI 에이전트입니다.
-            모든 답변, Thought, Observation은 **반드시 한국어로** 작성하세요. 영어로 작성하지 마세요.
-            각 툴의 설명과 예시를 참고하세요.\n
-            
-            툴을 사용하여 1) 사용자가 요청한 기업 {company_name}에 대한 정보를 파악하여 2) {corp_code}로 반환하도록 하세요.
-            만약 툴에서 완전히 일치하는 {company_name}이 없으면, 유사한 기업명 후보 {candidates}를 찾아서 2) {corp_code}로 매핑하세요.
-            {candidate}는 1) 사용자가 입력한 기업명과 같은 글자를 공유하거나 2) 사용자가 입력한 기업의 영어/한국어 번역을 포함합니다.
-            예를 들어, "기아차", "기아자동차", "KIA" 등은 모두 "기아"로 매핑되어야 합니다.\n
-
-            예시:
-            입력: "기아차"
-            후보: ["기아", "기아(주)", "기아자동차", "KIA", "기아차(주)"]
-
-            1) LLM이 공식 기업명 선택: "기아"
-            2) "기아"에 해당하는 corp_code: "00106641"
-            3) get_company_info("00106641") 호출
-
-            예시 질문: 기아차 {company_name} 기본 정보 알려줘.
-            예시 툴 호출: find_corp_code(query='기아차') get_company_info(corp_code='00106641')
-"""
-        )
-    }
+    return_intermediate_steps=True,
 )
 
 # Streamlit UI
@@ -84,41 +98,17 @@ st.title("AI 기업 분석")
 
 # 번역 함수 정의
 def translate_to_ko(text):
-    client = openai.OpenAI()  # openai.api_key는 환경변수로 자동 인식
-    response = client.chat.completions.create(
-        model="gpt-4o",
-        messages=[
-            {"role": "system", "content": "Translate the following text to Korean."},
-            {"role": "user", "content": text}
-        ]
-    )
-    return response.choices[0].message.content.strip()
-
-def log_page1_nl_search(user_input, output):
-    print("[DEBUG] log_page1_nl_search called", user_input, output)
-    log_path = "logs/page1_nl_search.log"
-    try:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\nINPUT: {user_input}\nOUTPUT: {output}\n---\n")
-            f.flush()
-            os.fsync(f.fileno())
-    except Exception as e:
-        print(f"[ERROR] log_page1_nl_search: {e}")
+    response = invoke_llm(get_chat_model(), [
+        ("system", "Translate the following text to Korean."),
+        ("user", text)
+    ])
+    return response.content.strip()
 
-def log_page1_qa(user_input, output):
-    log_path = "logs/page1_qa.log"  # 최상단에서 바로 선언
-    print("[DEBUG] log_page1_qa called", user_input, output)
-    print("[DEBUG] cwd:", os.getcwd())
-    print("[DEBUG] abs log_path:", os.path.abspath(log_path))
-    try:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\nINPUT: {user_input}\nOUTPUT: {output}\n---\n")
-            f.flush()
-            os.fsync(f.fileno())
-    except Exception as e:
-        print(f"[ERROR] log_page1_qa: {e}")
+def log_page1_nl_search(user_input, output, latency_ms=None):
+    interaction_logger.log("page1_nl_search", input=user_input, output=output, latency_ms=latency_ms)
+
+def log_page1_qa(user_input, output, latency_ms=None, source=None):
+    interaction_logger.log("page1_qa", input=user_input, output=output, latency_ms=latency_ms, source=source)
 
 
 def is_english(text):
@@ -142,30 +132,43 @@ uploaded_file = st.file_uploader("자료 업로드 (PDF, CSV)", type=["pdf", "cs
 pdf_path = None
 if uploaded_file:
     st.success("파일 업로드 완료!")
+    # 내용 해시 기준으로 한 번만 저장 (rerun마다 다시 쓰지 않고, 추출 텍스트/통계 등 파생 결과도 재사용)
+    upload_key = f"upload:{getattr(uploaded_file, 'file_id', None) or uploaded_file.name}:{uploaded_file.size}"
+    stored = st.session_state.get(upload_key)
+    if stored is None or not os.path.exists(stored.path):  # 처음 올렸거나 용량 정리로 지워진 경우
+        st.session_state[upload_key] = upload_store.put(uploaded_file, uploaded_file.name)
+    upload = st.session_state[upload_key]
     if uploaded_file.type == "application/pdf" or uploaded_file.name.endswith(".pdf"):
-        import tempfile
-        with tempfile.NamedTemporaryFile(delete=False, suffix=".pdf") as tmp_file:
-            tmp_file.write(uploaded_file.read())
-            pdf_path = tmp_file.name
+        pdf_path = upload.path
     elif uploaded_file.type == "text/csv" or uploaded_file.name.endswith(".csv"):
-        df = pd.read_csv(uploaded_file)
+        # 전체를 메모리에 올리지 않고 청크 단위로 통계를 내고, 미리보기는 표본으로 표시
+        csv_stats = upload_store.artifact(upload.sha, "csv_stats.pkl", lambda: analyze_csv(upload.path))
         st.subheader("CSV 데이터 미리보기")
-        st.dataframe(df)
-        st.write("컬럼 정보:", list(df.columns))
-        st.write("기초 통계:")
-        st.write(df.describe())
+        st.caption(f"전체 {csv_stats.rows:,}행 중 표본 {len(csv_stats.sample):,}행")
+        st.dataframe(csv_stats.sample)
+        st.write("컬럼 정보:", csv_stats.columns)
+        st.write("기초 통계 (분위수는 표본 기준 근사):")
+        st.write(csv_stats.describe())
 
 if st.session_state.get('ai_query', ''):
+    started_at = time.perf_counter()
     import traceback
     from langchain.schema import OutputParserException
+    # 세션 엔터티 메모리: 이전 질문에서 찾은 기업/연도로 '그 회사', '작년' 등을 풀고, 툴도 같은 메모리로 기업 매칭을 건너뜀
+    entity_memory = session_entity_memory(st.session_state)
     try:
-        agent_input = {"input": st.session_state['ai_query']}
+        agent_input = {"input": entity_memory.expand(st.session_state['ai_query'])}
         print(f"[DEBUG] agent.invoke 실행: {agent_input}")
         if pdf_path:
             agent_input["pdf_path"] = pdf_path
-        result = agent.invoke(agent_input, return_intermediate_steps=True)
+            # 에이전트가 PDF 요약/검색 툴에 경로를 넘길 수 있도록 질문에 함께 전달
+            agent_input["input"] += f"\n(업로드한 PDF 파일 경로: {pdf_path})"
+        with use_entity_memory(entity_memory):
+            result = agent.invoke(agent_input, return_intermediate_steps=True)
         answer = result.get("output", None)
         steps = result.get("intermediate_steps", [])
+        # 다음 질문의 '그 회사', '작년'이 가리킬 기업/연도는 툴 호출 순서대로 여기서 한 번에 기록
+        observe_tool_calls(entity_memory, steps)
         last_obs = None
         last_thought = None
         if steps:
@@ -177,27 +180,27 @@ if st.session_state.get('ai_query', ''):
             if is_english(answer):
                 answer_ko = translate_to_ko(answer)
                 st.write(answer_ko)
-                log_page1_nl_search(st.session_state['ai_query'], answer_ko)
+                log_page1_nl_search(st.session_state['ai_query'], answer_ko, latency_ms=elapsed_ms(started_at))
             else:
                 st.write(answer)
-                log_page1_nl_search(st.session_state['ai_query'], answer)
+                log_page1_nl_search(st.session_state['ai_query'], answer, latency_ms=elapsed_ms(started_at))
         elif last_obs:
             st.write(f"Observation(툴 반환값): {last_obs}")
-            log_page1_nl_search(st.session_state['ai_query'], str(last_obs))
+            log_page1_nl_search(st.session_state['ai_query'], str(last_obs), latency_ms=elapsed_ms(started_at))
         elif last_thought:
             if re.match(r"[A-Za-z]", last_thought.strip()):
                 last_thought_kr = translate_to_ko(last_thought)
             else:
                 last_thought_kr = last_thought
             st.info(f"AI의 참고 설명:\n{last_thought_kr}\n\n한글/영문으로 바꿔서 입력을 다시 시도해 보세요.")
-            log_page1_nl_search(st.session_state['ai_query'], str(last_thought_kr))
+            log_page1_nl_search(st.session_state['ai_query'], str(last_thought_kr), latency_ms=elapsed_ms(started_at))
         else:
             st.warning("결과가 없습니다. 입력값을 다시 확인해 주세요.")
-            log_page1_nl_search(st.session_state['ai_query'], "결과 없음")
+            log_page1_nl_search(st.session_state['ai_query'], "결과 없음", latency_ms=elapsed_ms(started_at))
     except OutputParserException:
         if 'last_obs' in locals() and last_obs:
             st.write(last_obs)
-            log_page1_nl_search(st.session_state['ai_query'], str(last_obs))
+            log_page1_nl_search(st.session_state['ai_query'], str(last_obs), latency_ms=elapsed_ms(started_at))
         if 'last_thought' in locals() and last_thought:
             if re.match(r"[A-Za-z]", last_thought.strip()):
                 try:
@@ -207,14 +210,14 @@ if st.session_state.get('ai_query', ''):
             else:
                 last_thought_kr = last_thought
             st.info(f"AI의 참고 설명:\n{last_thought_kr}\n\n한글/영문으로 바꿔서 입력을 다시 시도해 보세요.")
-            log_page1_nl_search(st.session_state['ai_query'], str(last_thought_kr))
+            log_page1_nl_search(st.session_state['ai_query'], str(last_thought_kr), latency_ms=elapsed_ms(started_at))
         else:
             st.error("에이전트가 반복 제한 또는 시간 제한에 걸렸습니다. 입력을 더 구체적으로 해보세요.")
-            log_page1_nl_search(st.session_state['ai_query'], "에이전트 반복/시간 제한")
+            log_page1_nl_search(st.session_state['ai_query'], "에이전트 반복/시간 제한", latency_ms=elapsed_ms(started_at))
     except Exception as e:
         st.error(f"에이전트 실행 중 오류 발생: {e}")
         st.text(traceback.format_exc())
-        log_page1_nl_search(st.session_state['ai_query'], f"[ERROR] {e}")
+        log_page1_nl_search(st.session_state['ai_query'], f"[ERROR] {e}", latency_ms=elapsed_ms(started_at))
     finally:
         st.session_state['ai_query'] = ''  # 반드시 마지막에 초기화
 
@@ -226,24 +229,32 @@ st.divider()
 # 분석 결과 생성 후
 company_analysis_result = "여기에 회사 분석 결과가 들어갑니다."
 st.session_state["company_analysis_result"] = company_analysis_result
+build_page_context_index(company_analysis_result)  # Q&A 챗봇용 검색 인덱스 미리 생성
 
 # --- 사이드바: Q&A 챗봇 ---
 st.sidebar.header("Q&A 챗봇")
 st.sidebar.info("회사 분석 결과에 대해 궁금한 점을 질문해 보세요!")
 chat_input = st.sidebar.text_input("질문을 입력하세요", key="company_chat_input")
 if st.sidebar.button("질문하기", key="company_qa_btn"):
+    started_at = time.perf_counter()
     page_context = st.session_state.get("company_analysis_result", "")
     answer = answer_from_page_context(chat_input, page_context)
     if answer:
         st.sidebar.success(f"페이지 내 답변: {answer}")
-        log_page1_qa(chat_input, answer)
+        log_page1_qa(chat_input, answer, latency_ms=elapsed_ms(started_at), source="page")
+    elif (cached := qa_cache.get(chat_input, page_context, namespace="page1")):
+        st.sidebar.success(f"외부 답변: {cached}")
+        log_page1_qa(chat_input, cached, latency_ms=elapsed_ms(started_at), source="cache")
     else:
-        llm = ChatOpenAI(model="gpt-4o", temperature=0)
-        prompt = f"다음 회사 분석 결과를 참고해서 질문에 답변해줘.\n\n분석 결과: {page_context}\n\n질문: {chat_input}"
+        llm = get_chat_model()
+        # 전체 결과 대신 질문과 관련된 상위 passage만 전달
+        relevant_context = retrieve_page_context(chat_input, page_context)
+        prompt = f"다음 회사 분석 결과를 참고해서 질문에 답변해줘.\n\n분석 결과: {relevant_context}\n\n질문: {chat_input}"
         try:
-            result = llm.invoke(prompt)
+            result = invoke_llm(llm, prompt)
             st.sidebar.success(f"외부 답변: {result.content.strip()}")
-            log_page1_qa(chat_input, result.content.strip())
+            log_page1_qa(chat_input, result.content.strip(), latency_ms=elapsed_ms(started_at), source="llm")
+            qa_cache.set(chat_input, page_context, result.content.strip(), namespace="page1")
         except Exception as e:
             st.sidebar.error(f"답변 실패: {e}")
-            log_page1_qa(chat_input, f"[ERROR] {e}")
\ No newline at end of file
+            log_page1_qa(chat_input, f"[ERROR] {e}", latency_ms=elapsed_ms(started_at), source="llm")
\ No newline at end of file
@@ -4,24 +4,37 @@ import os
 import sys
 import re
 import json
-import datetime
+import time
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from dart_api import DartAPI
-from frontend.financial_analysis_display import pretty_financial_table, financial_df_to_context_text, render_financial_table
-from backend.company_analysis_tools import answer_from_page_context
-from langchain_openai import ChatOpenAI
-from serpapi import GoogleSearch
+from frontend.financial_analysis_display import pretty_financial_table, financial_df_to_context_text, render_financial_table, render_quarterly_table, render_comparison
+from backend.company_analysis_tools import answer_from_page_context, resolve_corp_code
+from backend.entity_memory import session_entity_memory, use_entity_memory
+from backend.comparison import compare_companies, is_comparison_query
+from backend.industry_index import industry_index
+from backend.qa_cache import qa_cache
+from backend.llm import get_chat_model, invoke_llm
+from backend.web_search import web_search
+from backend import dart_cache
+from backend.prefetch import statement_prefetcher
+from backend.quarterly import quarterly_statements, quarterly_summary
+from backend.company_catalog import TOP_COMPANIES, DEFAULT_YEARS
+from backend.warmup import start_background_warmup
+from backend.filing_sync import start_background_sync
+from backend.interaction_logger import interaction_logger, elapsed_ms
+from backend.page_context_index import build_page_context_index
+
+# 페이지로 바로 접속한 경우에도 대표 기업 캐시 워밍업/공시 동기화 시작 (이미 시작됐으면 무시)
+start_background_warmup()
+start_background_sync()
 
 st.title("재무 분석")
 
 # 1. UI 기반 주요 기능
 st.header("빠른 재무 분석")
 # 우리나라 10대 기업 리스트 + 직접 입력 옵션
-company_list = [
-    "직접 입력", "삼성전자", "SK하이닉스", "LG화학", "삼성바이오로직스", "현대차", "기아", "POSCO홀딩스", "삼성SDI", "NAVER", "카카오"
-]
+company_list = ["직접 입력"] + TOP_COMPANIES
 selected_company = st.selectbox("기업 선택", company_list)
 
 # 직접 입력 선택 시 텍스트 입력창 노출
@@ -32,7 +45,7 @@ else:
     final_company = selected_company
 
 # 연도 선택 추가 (2024, 2023, 2022, 2021)
-year_list = ["2024", "2023", "2022", "2021"]
+year_list = DEFAULT_YEARS
 selected_year = st.selectbox("연도 선택", year_list, index=0)
 
 # 재무제표 종류 선택 추가
@@ -44,76 +57,86 @@ sj_div_map = {
 sj_div_label = st.selectbox("재무제표 종류", list(sj_div_map.keys()))
 sj_div = sj_div_map[sj_div_label]
 
+# 연결/별도 기준 선택 (DART fs_div)
+fs_div_map = {
+    "연결재무제표(CFS)": "CFS",
+    "별도재무제표(OFS)": "OFS"
+}
+fs_div_label = st.selectbox("재무제표 기준", list(fs_div_map.keys()))
+fs_div = fs_div_map[fs_div_label]
+
+# 목록에서 기업을 고르는 즉시 연도별 재무제표를 백그라운드로 미리 받아 둠 (재무제표 보기 클릭 시 캐시 적중)
+if selected_company != "직접 입력" and final_company:
+    statement_prefetcher.prefetch_company(final_company, year_list, fs_divs=(fs_div,))
+
+# 세션 엔터티 메모리: 한 번 찾은 기업은 다시 매칭하지 않고, Q&A의 '그 회사', '작년' 등을 현재 기업/연도로 풀 때 사용
+entity_memory = session_entity_memory(st.session_state)
+
 # Initialize display mode for each sj_div if not already present
 if f'display_mode_{sj_div}' not in st.session_state:
     st.session_state[f'display_mode_{sj_div}'] = 'summary'
 
-def log_page2_search(company, year, sj_div):
-    print("[DEBUG] log_page2_search called", company, year, sj_div)
-    log_path = "logs/page2_search.log"
-    try:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\nCOMPANY: {company}\nYEAR: {year}\nSJ_DIV: {sj_div}\n---\n")
-            f.flush()
-            os.fsync(f.fileno())
-    except Exception as e:
-        print(f"[ERROR] log_page2_search: {e}")
+def log_page2_search(company, year, sj_div, latency_ms=None):
+    interaction_logger.log("page2_search", company=company, year=year, sj_div=sj_div, latency_ms=latency_ms)
 
-def log_page2_qa(user_input, output):
-    print("[DEBUG] log_page2_qa called", user_input, output)
-    log_path = "logs/page2_qa.log"
-    try:
-        os.makedirs(os.path.dirname(log_path), exist_ok=True)
-        with open(log_path, "a", encoding="utf-8") as f:
-            f.write(f"[{datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')}]\nINPUT: {user_input}\nOUTPUT: {output}\n---\n")
-            f.flush()
-            os.fsync(f.fileno())
-    except Exception as e:
-        print(f"[ERROR] log_page2_qa: {e}")
+def log_page2_qa(user_input, output, latency_ms=None, source=None):
+    interaction_logger.log("page2_qa", input=user_input, output=output, latency_ms=latency_ms, source=source)
 
 if st.button("재무제표 보기"):
+    started_at = time.perf_counter()
     # Set initial display mode to summary when a new financial statement is viewed
     st.session_state[f'display_mode_{sj_div}'] = 'summary'
-    if final_company:
-        print(f"[LOG] [재무제표 보기] 입력 기업명: {final_company}")
-        corp_code_info = DartAPI().find_corp_code(final_company)
-        corp_code = corp_code_info.get('corp_code') if isinstance(corp_code_info, dict) else None
-        print(f"[LOG] [재무제표 보기] 반환 corp_code: {corp_code_info}")
-        if corp_code and isinstance(corp_code, str) and corp_code.isdigit() and len(corp_code) == 8:
-            # 1. 기업 기본 정보 먼저 보여주기 (재무 분석 페이지에서는 간단히 표시)
-            print(f"[LOG] [재무제표 보기] get_company_info({corp_code}) 호출")
-            info = DartAPI().get_company_info(corp_code)
-            if info.get('corp_name'):
-                st.info(f"기업명: {info.get('corp_name')}\n대표자명: {info.get('ceo_nm')}\n주소: {info.get('adres')}")
-            # 2. 재무제표 시도
-            print(f"[LOG] [재무제표 보기] get_financial_statements({corp_code}, bsns_year={selected_year}, fs_div={sj_div}) 호출")
-            fs = DartAPI().get_financial_statements(corp_code, bsns_year=selected_year, fs_div=sj_div)
-            if fs.get('list'):
-                df = pretty_financial_table(fs, sj_div=sj_div)
-                st.session_state['financial_analysis_result'] = financial_df_to_context_text(
-                    df, company=final_company, year=selected_year, sj_div=sj_div
-                )
-                # Store financial data and display mode in session state
-                st.session_state['current_fs_data'] = fs
-                st.session_state['current_company'] = final_company
-                st.session_state['current_year'] = selected_year
-                st.session_state['current_sj_div'] = sj_div
+    # 사용자 요청이 진행되는 동안 백그라운드 프리페치는 양보
+    with statement_prefetcher.interactive(), use_entity_memory(entity_memory):
+        if final_company:
+            print(f"[LOG] [재무제표 보기] 입력 기업명: {final_company}")
+            corp_code = resolve_corp_code(final_company)
+            print(f"[LOG] [재무제표 보기] 반환 corp_code: {corp_code}")
+            if corp_code and isinstance(corp_code, str) and corp_code.isdigit() and len(corp_code) == 8:
+                # 1. 기업 기본 정보 먼저 보여주기 (재무 분석 페이지에서는 간단히 표시)
+                print(f"[LOG] [재무제표 보기] get_company_info({corp_code}) 호출")
+                info = dart_cache.get_company_info(corp_code)
+                st.session_state['current_company_info'] = info
+                # 2. 재무제표 시도 (IS/BS/CF 전체를 한 번에 받아 캐시, 종류 전환 시에는 재요청하지 않음)
+                print(f"[LOG] [재무제표 보기] get_statements({corp_code}, bsns_year={selected_year}, fs_div={fs_div}) 호출")
+                fs = dart_cache.get_statements(corp_code, selected_year, fs_div=fs_div)
+                if not fs.get('list') and fs_div == "CFS":
+                    # 종속회사가 없는 기업은 연결재무제표가 없으므로 별도재무제표로 대체
+                    fs = dart_cache.get_statements(corp_code, selected_year, fs_div="OFS")
+                    if fs.get('list'):
+                        st.info("연결재무제표가 없어 별도재무제표를 표시합니다.")
+                if fs.get('list'):
+                    # Store financial data and display mode in session state
+                    st.session_state['current_fs_data'] = fs
+                    st.session_state['current_company'] = final_company
+                    st.session_state['current_year'] = selected_year
+                    st.session_state['current_sj_div'] = None  # 아래 렌더링 단계에서 컨텍스트 갱신
+                    entity_memory.observe(final_company, selected_year)
+                else:
+                    st.warning("재무 데이터가 없습니다.")
+                log_page2_search(final_company, selected_year, sj_div, latency_ms=elapsed_ms(started_at))
             else:
-                st.warning("재무 데이터가 없습니다.")
-            log_page2_search(final_company, selected_year, sj_div)
+                st.warning("기업명을 정확히 입력해 주세요.")
         else:
-            st.warning(f"기업명을 정확히 입력해 주세요.\n{corp_code if isinstance(corp_code, str) else ''}")
-    else:
-        st.warning("기업명을 입력하세요.")
+            st.warning("기업명을 입력하세요.")
 
 # Render financial table and buttons if data is available in session state
-if 'current_fs_data' in st.session_state and 'current_sj_div' in st.session_state:
+# 이미 받아 둔 전체 재무제표에서 선택된 종류(sj_div)만 걸러 보여주므로, 종류 전환/상세보기 토글/rerun 시 네트워크 호출이 없습니다.
+if 'current_fs_data' in st.session_state:
     fs = st.session_state['current_fs_data']
     final_company = st.session_state['current_company']
     selected_year = st.session_state['current_year']
-    sj_div = st.session_state['current_sj_div']
-    
+    info = st.session_state.get('current_company_info', {})
+    if info.get('corp_name'):
+        st.info(f"기업명: {info.get('corp_name')}\n대표자명: {info.get('ceo_nm')}\n주소: {info.get('adres')}")
+    if st.session_state.get('current_sj_div') != sj_div:
+        st.session_state['current_sj_div'] = sj_div
+        df = pretty_financial_table(fs, sj_div=sj_div)
+        st.session_state['financial_analysis_result'] = financial_df_to_context_text(
+            df, company=final_company, year=selected_year, sj_div=sj_div
+        )
+        build_page_context_index(st.session_state['financial_analysis_result'])  # Q&A 챗봇용 검색 인덱스
+
     # Render based on current display mode
     render_financial_table(fs, final_company, selected_year, sj_div=sj_div, display_mode=st.session_state[f'display_mode_{sj_div}'])
     
@@ -146,146 +169,159 @@ if 'current_fs_data' in st.session_state and 'current_sj_div' in st.session_stat
                 st.session_state[f'display_mode_{sj_div}'] = 'summary'
                 st.rerun()
 
+    # 분기 추이: 전년도~선택 연도의 1분기/반기/3분기/사업보고서를 동시에 받아 단일 분기와 TTM 계산 (결과는 캐시)
+    quarterly_key = (final_company, selected_year, fs_div)
+    if st.button("📈 분기 추이 보기", key=f"quarterly_{selected_year}"):
+        with statement_prefetcher.interactive(), use_entity_memory(entity_memory):
+            corp_code = resolve_corp_code(final_company)
+            if corp_code:
+                result = quarterly_statements(corp_code, [int(selected_year) - 1, int(selected_year)], fs_div=fs_div)
+                st.session_state['current_quarterly'] = (quarterly_key, quarterly_summary(result))
+                entity_memory.observe(final_company, selected_year)
+    if st.session_state.get('current_quarterly', (None,))[0] == quarterly_key:
+        render_quarterly_table(st.session_state['current_quarterly'][1], final_company, selected_year)
+
 # 예시: 분석 결과를 생성하는 부분(실제 결과 변수로 대체)
 financial_analysis_result = st.session_state.get("financial_analysis_result", "아직 분석 결과가 없습니다.")
 
 
 
-def get_financial_info_from_dart(company, year, item):
+def get_financial_info_from_dart(user_input):
+    """
+    비교 질문 -> LLM으로 기업 목록/연도/항목을 파싱하고, 기업 매칭과 재무제표 조회를 한 번에 동시에 처리한 비교 결과.
+    기업을 찾지 못하면 None. 연도가 없으면 직전 대화 연도(없으면 최근 연도)를 사용합니다.
+    """
     try:
-        print(f"[LOG] [Q&A] get_financial_info_from_dart 호출: company={company}, year={year}, item={item}")
-        corp_code_info = DartAPI().find_corp_code(company)
-        corp_code = corp_code_info.get('corp_code') if isinstance(corp_code_info, dict) else None
-        print(f"[LOG] [Q&A] 반환 corp_code: {corp_code}")
-        if not corp_code:
+        parsed = parse_financial_query_with_llm(user_input)
+        print(f"[LOG] [Q&A] 비교 질문 파싱 결과: {parsed}")
+        if not isinstance(parsed, dict):
             return None
-        print(f"[LOG] [Q&A] get_financial_statements({corp_code}, bsns_year={year}, fs_div='IS') 호출")
-        fs = DartAPI().get_financial_statements(corp_code, bsns_year=year, fs_div="IS")
-        if not fs or not fs.get('list'):
+        if not isinstance(parsed.get('companies'), list):
+            parsed['companies'] = []
+        # '경쟁사/동종업계'는 업종 색인으로 경쟁사를 채움 (색인에 없는 기업만 LLM에게 물어봄)
+        if isinstance(parsed.get('peers_of'), str) and parsed['peers_of'].strip():
+            parsed['companies'] += [parsed['peers_of']] + find_peer_companies(parsed['peers_of'])
+        if not parsed['companies']:
             return None
-        df = pretty_financial_table(fs, sj_div="IS")
-        print(f"[LOG] [Q&A] 반환 재무제표 DataFrame columns: {df.columns.tolist()}")
-        row = df[df['계정명'].str.contains(item, na=False)]
-        print(f"[LOG] [Q&A] 계정명 매칭 row: {row}")
-        if not row.empty:
-            return row.iloc[0].to_dict()
-        return None
+        year = str(parsed.get('year', ''))
+        if not year.isdigit():
+            year = entity_memory.year or year_list[0]
+        with use_entity_memory(entity_memory):
+            result = compare_companies(parsed['companies'], year, item=parsed.get('item'))
+        entity_memory.observe(year=year)
+        print(f"[LOG] [Q&A] 비교 결과: {len(parsed['companies'])}개 기업, 정보 없음 {result.missing}")
+        return result
     except Exception as e:
+        # LLM/DART 오류는 웹 검색 답변으로 넘어가도록 None 반환
         print(f"[LOG] [Q&A] 예외 발생: {e}")
         return None
 
-def web_search(query, num_results=3):
-    api_key = os.getenv("SERPAPI_API_KEY")
-    if not api_key:
-        return []
-    params = {
-        "q": query,
-        "hl": "ko",
-        "gl": "kr",
-        "api_key": api_key,
-        "num": num_results
-    }
-    search = GoogleSearch(params)
-    results = search.get_dict()
-    organic_results = results.get("organic_results", [])
-    return [
-        {
-            "title": item.get("title"),
-            "snippet": item.get("snippet"),
-            "link": item.get("link")
-        }
-        for item in organic_results[:num_results]
-    ]
-
 # --- 사이드바: Q&A 챗봇 ---
 st.sidebar.header("Q&A 챗봇")
 st.sidebar.info("재무 분석 결과에 대해 궁금한 점을 질문해 보세요!")
 chat_input = st.sidebar.text_input("질문을 입력하세요", key="financial_chat_input")
 
+def _parse_llm_json(content):
+    for line in content.strip().split('\n'):
+        try:
+            return json.loads(line)
+        except Exception:
+            continue
+    return None
+
 def parse_financial_query_with_llm(user_input):
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
+    llm = get_chat_model()
     prompt = f"""
-아래 사용자의 질문에서 비교하고자 하는 기업명(여러 개면 모두), 연도(없으면 '없음'), 항목(예: 매출, 영업이익 등)을 반드시 JSON만 반환해줘. 
-만약 '경쟁사', '동종업계', '업계 1위' 등 일반명칭이 나오면, 한국 대표 상장사 기준으로 실제 기업명 리스트로 변환해서 반환해줘. 설명은 하지 마.
+아래 사용자의 질문에서 비교하고자 하는 기업명(질문에 나온 것만, 여러 개면 모두), 연도(없으면 '없음'), 항목(예: 매출, 영업이익 등)을 반드시 JSON만 반환해줘. 
+만약 '경쟁사', '동종업계', '업계 1위' 등 일반명칭이 나오면, 경쟁사 이름을 만들지 말고 기준 기업명만 peers_of에 넣어줘. 설명은 하지 마.
 
 예시 입력: "2023년 삼성전자와 LG전자 매출 비교해줘"
 예시 출력: {{"companies": ["삼성전자", "LG전자"], "year": "2023", "item": "매출"}}
 
 예시 입력: "LG화학 경쟁사와 2023년 매출액 비교해줘"
-예시 출력: {{"companies": ["LG화학", "삼성SDI", "SK이노베이션"], "year": "2023", "item": "매출액"}}
+예시 출력: {{"companies": ["LG화학"], "year": "2023", "item": "매출액", "peers_of": "LG화학"}}
 
 예시 입력: "2022년 현대차 동종업계 영업이익 비교"
-예시 출력: {{"companies": ["현대차", "기아", "쌍용차"], "year": "2022", "item": "영업이익"}}
+예시 출력: {{"companies": ["현대차"], "year": "2022", "item": "영업이익", "peers_of": "현대차"}}
 
 입력: "{user_input}"
 출력:
 """
-    result = llm.invoke(prompt)
-    for line in result.content.strip().split('\n'):
-        try:
-            parsed = json.loads(line)
-            return parsed
-        except Exception:
-            continue
-    return None
+    result = invoke_llm(llm, prompt)
+    return _parse_llm_json(result.content)
+
+def find_peer_companies(company):
+    """
+    경쟁사 목록: DART 업종코드 색인의 같은 업종 기업(규모 순, LLM 호출 없음).
+    색인에 없는 기업만 LLM에게 한국 대표 상장사 기준으로 물어봅니다.
+    """
+    peers = industry_index.peers(company)
+    if peers:
+        return peers
+    prompt = f"""
+'{company}'의 국내 상장 경쟁사(동종업계 대표 기업) 최대 5개를 JSON만 반환해줘. 설명은 하지 마.
+예시 출력: {{"peers": ["삼성SDI", "SK이노베이션"]}}
+"""
+    parsed = _parse_llm_json(invoke_llm(get_chat_model(), prompt).content)
+    peers = parsed.get('peers') if isinstance(parsed, dict) else None
+    return [p for p in peers if isinstance(p, str)] if isinstance(peers, list) else []
 
 if st.sidebar.button("질문하기", key="financial_qa_btn"):
+    started_at = time.perf_counter()
     search_msg = st.sidebar.empty()
     search_msg.info("검색중 ...")
     # 1. page2 context에서 답변 시도
     context = st.session_state.get("financial_analysis_result", "")
     answer = answer_from_page_context(chat_input, context)
+    # 외부 조회/검색은 '그 회사 작년 매출'처럼 앞 대화에 기대는 질문을 현재 기업/연도로 풀어서 사용
+    external_query = entity_memory.expand(chat_input)
+    # 2. '경쟁사와 매출 비교' 등 비교 질문은 DART 재무제표로 직접 비교 (기업별 조회를 동시에 실행)
+    comparison = None
+    if not answer and is_comparison_query(external_query):
+        comparison = get_financial_info_from_dart(external_query)
     if answer:
         search_msg.empty()
         st.sidebar.success(f"페이지 내 답변: {answer}")
-        log_page2_qa(chat_input, answer)
+        log_page2_qa(chat_input, answer, latency_ms=elapsed_ms(started_at), source="page")
+    elif comparison is not None and not comparison.empty:
+        search_msg.empty()
+        st.session_state['current_comparison'] = comparison  # 본문에 비교표/차트 표시
+        st.sidebar.success(f"[DART 비교]\n{comparison.summary()}")
+        log_page2_qa(chat_input, comparison.summary(), latency_ms=elapsed_ms(started_at), source="dart")
+    elif (cached := qa_cache.get(external_query, namespace="page2")):
+        # 3. 캐시된 외부 답변 (SerpAPI/LLM 호출 생략)
+        # 외부 답변은 페이지 컨텍스트가 아닌 웹 검색 결과로 생성되므로 질문만으로 조회
+        search_msg.empty()
+        st.sidebar.success(f"[외부 답변] {cached}")
+        log_page2_qa(chat_input, f"[외부 답변] {cached}", latency_ms=elapsed_ms(started_at), source="cache")
     else:
-        # 2. 외부 검색 + LLM 답변
+        # 4. 외부 검색 + LLM 답변
         web_context = ""
-        serp_results = web_search(chat_input, num_results=3)
+        serp_results = web_search(external_query, num_results=3)
         if serp_results:
             web_context += "[웹 검색 결과]\n"
             for r in serp_results:
                 web_context += f"- {r['title']}\n  {r['snippet']}\n  {r['link']}\n"
         if web_context:
-            llm = ChatOpenAI(model="gpt-4o", temperature=0)
+            llm = get_chat_model()
             prompt = f"""
-아래는 '{chat_input}'에 대한 웹 검색 결과입니다. 이 정보를 참고하여 한국어로 간결하게 요약해줘.\n\n{web_context}\n\n답변:
+아래는 '{external_query}'에 대한 웹 검색 결과입니다. 이 정보를 참고하여 한국어로 간결하게 요약해줘.\n\n{web_context}\n\n답변:
 """
             try:
-                result = llm.invoke(prompt)
+                result = invoke_llm(llm, prompt)
                 search_msg.empty()
                 st.sidebar.success(f"[외부 답변] {result.content.strip()}")
-                log_page2_qa(chat_input, f"[외부 답변] {result.content.strip()}")
+                log_page2_qa(chat_input, f"[외부 답변] {result.content.strip()}", latency_ms=elapsed_ms(started_at), source="web")
+                qa_cache.set(external_query, "", result.content.strip(), namespace="page2")
             except Exception as e:
                 search_msg.empty()
                 st.sidebar.error(f"[외부 답변 실패] {e}")
-                log_page2_qa(chat_input, f"[외부 답변 실패] {e}")
+                log_page2_qa(chat_input, f"[외부 답변 실패] {e}", latency_ms=elapsed_ms(started_at), source="web")
         else:
             search_msg.empty()
             st.sidebar.info("외부 검색 결과 없음")
-            log_page2_qa(chat_input, "[외부 검색 결과 없음]")
-
-# --- get_market_summary 함수 추가 (03_Market_Analysis.py에서 복사) ---
-def get_market_summary(industry_name, web_results=None):
-    llm = ChatOpenAI(model="gpt-4o", temperature=0)
-    web_context = ""
-    if web_results:
-        web_context = "\n\n[웹 검색 결과]\n" + "\n".join([
-            f"- {item['title']}\n  {item['snippet']}\n  {item['link']}" for item in web_results if item.get('title')
-        ])
-    prompt = f"""
-    '{industry_name}' 산업(시장)에 대해 아래 항목별로 한국어로 간결하게 요약해줘.{web_context}
-
-    1. 시장 개념
-    2. 국내 산업 규모 및 현황\
-    3. Value Chain
-    4. Key Players
-    5. 산업 이슈
-    각 항목별로 소제목과 내용을 구분해서 5줄 이내로 요약해줘.
-    """
-    try:
-        result = llm.invoke(prompt)
-        return result.content.strip()
-    except Exception as e:
-        return f"[요약 실패] {e}"
+            log_page2_qa(chat_input, "[외부 검색 결과 없음]", latency_ms=elapsed_ms(started_at), source="web")
+
+# Q&A 비교 질문 결과 (rerun 후에도 유지)
+if st.session_state.get('current_comparison') is not None:
+    render_comparison(st.session_state['current_comparison'])
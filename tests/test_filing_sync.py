@@ -0,0 +1,20 @@
+import pytest
+
+from backend.filing_sync import parse_report_name
+
+
+@pytest.mark.parametrize("report_nm, expected", [
+    ("사업보고서 (2023.12)", ("2023", "11011")),
+    ("[기재정정]사업보고서 (2023.12)", ("2023", "11011")),
+    ("반기보고서 (2024.06)", ("2024", "11012")),
+    ("분기보고서 (2024.03)", ("2024", "11013")),
+    ("분기보고서 (2024.09)", ("2024", "11014")),
+    ("분기보고서 (2024.05)", ("2024", None)),  # 결산월이 12월이 아니면 분기를 특정하지 않음
+])
+def test_parse_report_name(report_nm, expected):
+    assert parse_report_name(report_nm) == expected
+
+
+@pytest.mark.parametrize("report_nm", [None, "", "주요사항보고서(자기주식취득결정)", "임원ㆍ주요주주특정증권등소유상황보고서"])
+def test_non_periodic_reports_are_ignored(report_nm):
+    assert parse_report_name(report_nm) is None
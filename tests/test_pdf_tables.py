@@ -0,0 +1,25 @@
+import math
+
+import pytest
+
+from backend.pdf_tables import parse_korean_amount
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("1,234", 1234),
+    ("(1,234)", -1234),
+    ("△1,234", -1234),
+    ("-1,234", -1234),
+    ("1조 2,345억", 1.2345e12),
+    ("3억5천만", 3.5e8),
+    ("1,234원", 1234),
+    ("12.5%", 12.5),
+    (5, 5.0),
+])
+def test_parse_korean_amount(text, expected):
+    assert parse_korean_amount(text) == pytest.approx(expected)
+
+
+@pytest.mark.parametrize("text", [None, "", "-", "—", "해당없음", "억"])
+def test_non_numeric_cells_are_nan(text):
+    assert math.isnan(parse_korean_amount(text))
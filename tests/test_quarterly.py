@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+
+from backend import quarterly
+from backend.quarterly import derive_quarters, quarterly_statements, ttm
+
+
+def statement(revenue, cumulative=None, assets=None):
+    """매출액(당기 3개월 또는 연간, 누적) + 자산총계 한 행씩 가진 재무제표 응답"""
+    rows = [{"sj_div": "IS", "account_id": "ifrs-full_Revenue", "account_nm": "매출액",
+             "thstrm_amount": f"{revenue:,}", "thstrm_add_amount": "" if cumulative is None else f"{cumulative:,}"}]
+    if assets is not None:
+        rows.append({"sj_div": "BS", "account_id": "ifrs-full_Assets", "account_nm": "자산총계",
+                     "thstrm_amount": f"{assets:,}"})
+    return {"status": "000", "message": "정상", "list": rows}
+
+
+def year_reports(year, q1, h1, q3, annual):
+    """누적 매출(1분기, 반기, 3분기, 연간) -> 한 연도의 네 보고서 (반기/3분기 당기 금액은 3개월치)"""
+    return {
+        (year, "11013"): statement(q1, assets=1000),
+        (year, "11012"): statement(h1 - q1, cumulative=h1, assets=1100),
+        (year, "11014"): statement(q3 - h1, cumulative=q3, assets=1200),
+        (year, "11011"): statement(annual, assets=1300),
+    }
+
+
+def test_cumulative_reports_are_differenced_into_single_quarters():
+    quarters = derive_quarters(year_reports("2023", 100, 250, 450, 700))
+    assert quarters.loc[2023, "revenue"].tolist() == [100, 150, 200, 250]  # Q4 = 연간 - 3분기 누적
+    assert quarters.loc[2023, "total_assets"].tolist() == [1000, 1100, 1200, 1300]  # 시점 계정은 그대로
+
+
+def test_missing_first_quarter_leaves_second_quarter_unknown():
+    reports = year_reports("2023", 100, 250, 450, 700)
+    del reports[("2023", "11013")]
+    quarters = derive_quarters(reports)
+    assert np.isnan(quarters.loc[(2023, 1), "revenue"])
+    assert np.isnan(quarters.loc[(2023, 2), "revenue"])
+    assert quarters.loc[(2023, 3), "revenue"] == 200
+
+
+def test_ttm_needs_four_consecutive_quarters():
+    reports = {**year_reports("2022", 10, 30, 60, 100), **year_reports("2023", 100, 250, 450, 700)}
+    trailing = ttm(derive_quarters(reports))
+    assert np.isnan(trailing.loc[(2022, 3), "revenue"])
+    assert trailing.loc[(2022, 4), "revenue"] == 100
+    assert trailing.loc[(2023, 1), "revenue"] == 100 - 10 + 100
+    assert trailing.loc[(2023, 4), "revenue"] == 700
+
+
+def test_ttm_does_not_sum_across_a_missing_year():
+    reports = {**year_reports("2021", 10, 30, 60, 100), **year_reports("2023", 100, 250, 450, 700)}
+    trailing = ttm(derive_quarters(reports))
+    assert trailing.loc[2022, "revenue"].isna().all()
+    assert np.isnan(trailing.loc[(2023, 3), "revenue"])
+    assert trailing.loc[(2023, 4), "revenue"] == 700
+
+
+def test_failed_reports_are_counted_and_not_cached(monkeypatch):
+    reports = year_reports("2023", 100, 250, 450, 700)
+    reports[("2023", "11014")] = {"status": "020", "message": "요청 제한 초과"}
+    monkeypatch.setattr(quarterly, "fetch_year_reports", lambda *a, **k: dict(reports))
+    monkeypatch.setattr(quarterly, "_quarterly_cache", quarterly.TTLCache(maxsize=4, ttl=60))
+    result = quarterly_statements("00000000", ["2023"])
+    assert result["failed"] == 1
+    assert quarterly._quarterly_cache.get(("00000000", ("2023",), "CFS")) is None
+
+
+@pytest.mark.parametrize("report_type, code", [
+    ("사업보고서", "11011"), ("반기보고서", "11012"), ("1분기보고서", "11013"), ("분기보고서", "11014"),
+])
+def test_report_code_for(report_type, code):
+    assert quarterly.report_code_for(report_type) == code
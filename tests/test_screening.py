@@ -0,0 +1,26 @@
+import numpy as np
+import pytest
+
+from backend.screening import evaluate_expression
+
+COLUMNS = {"ROE": np.array([5.0, 12.0, np.nan]), "매출액": np.array([1e12, 2e11, 5e11])}
+
+
+def test_filter_expression():
+    assert evaluate_expression("ROE > 10 and 매출액 >= 1e11", COLUMNS).tolist() == [False, True, False]
+
+
+def test_power_expression():
+    assert evaluate_expression("2 ** 3", COLUMNS) == 8.0
+
+
+@pytest.mark.parametrize("expr", ["ROE > 9**9**9", "ROE > 10**1000", "ROE ** 100 > 1"])
+def test_huge_power_is_rejected(expr):
+    with pytest.raises(ValueError):
+        evaluate_expression(expr, COLUMNS)
+
+
+@pytest.mark.parametrize("expr", ["-" * 5000 + "ROE > 1", "(" * 400 + "ROE" + ")" * 400 + " > 1", "not " * 150 + "ROE > 1"])
+def test_deeply_nested_expression_is_rejected(expr):
+    with pytest.raises(ValueError):
+        evaluate_expression(expr, COLUMNS)